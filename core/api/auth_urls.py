@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
 from users.views import (
@@ -6,10 +7,11 @@ from users.views import (
     UserRegistrationView,
     CompanyProfileView
 )
+from users import login
 
 urlpatterns = [
     # Custom auth endpoints that match frontend expectations
-    path('login/', UserLoginView.as_view(), name='user_login'),
+    path('login/', login.login if settings.ASYNC_LOGIN else UserLoginView.as_view(), name='user_login'),
     path('register/', UserRegistrationView.as_view(), name='user_register'),
     path('profile/', UserProfileView.as_view(), name='user_profile'),
     path('company/profile/', CompanyProfileView.as_view(), name='company_profile'),
@@ -0,0 +1,50 @@
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from users.tokens import USER_CLAIMS, COMPANY_CLAIM, VERSION_CLAIM, token_version
+
+User = get_user_model()
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that builds ``request.user`` from the token claims.
+
+    The user is a ``User`` instance holding only the claimed fields; other
+    fields are deferred and load on first access. The only per-request
+    lookup is the user's token version, which is cached, so role or password
+    changes and deactivation still revoke the token. Tokens issued before
+    claims were added fall back to loading the user row.
+    """
+
+    def get_user(self, validated_token):
+        if VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+
+        try:
+            # The claim is a string; the model field gives it its type back
+            user_id = User._meta.get_field(api_settings.USER_ID_FIELD).to_python(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError:
+            raise AuthenticationFailed('Token contained no recognizable user identification', code='token_not_valid')
+
+        version = token_version(user_id)
+        if version is None or version != validated_token[VERSION_CLAIM]:
+            raise AuthenticationFailed('Token has been revoked', code='token_revoked')
+
+        loaded = {claim: validated_token.get(claim) for claim in USER_CLAIMS}
+        loaded.update({api_settings.USER_ID_FIELD: user_id, 'is_active': True, 'token_version': version})
+        # from_db() expects the values in model field order
+        names = [field.attname for field in User._meta.concrete_fields if field.attname in loaded]
+        user = User.from_db(DEFAULT_DB_ALIAS, names, [loaded[name] for name in names])
+        # Fills the cached property so it does not query
+        user.__dict__['company_id'] = validated_token.get(COMPANY_CLAIM)
+        return user
+
+
+def full_user(user):
+    """Return ``user`` with every field loaded, reading the row if needed"""
+    if user.get_deferred_fields():
+        return User.objects.get(pk=user.pk)
+    return user
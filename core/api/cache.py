@@ -0,0 +1,34 @@
+import hashlib
+import json
+import time
+from django.core.cache import cache
+
+# Cached responses are keyed by a per-namespace generation number. Bumping the
+# generation invalidates every entry of the namespace at once without having
+# to know which keys were stored.
+
+
+def get_generation(namespace):
+    """Return the current generation number for a cache namespace."""
+    key = f'generation:{namespace}'
+    generation = cache.get(key)
+    if generation is None:
+        # Seed with a timestamp so a cache restart never reuses old keys
+        cache.add(key, int(time.time() * 1000), None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(namespace):
+    """Invalidate every cached entry of a namespace."""
+    key = f'generation:{namespace}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, int(time.time() * 1000), None)
+
+
+def make_cache_key(namespace, *parts):
+    """Build a cache key for the current generation of a namespace."""
+    digest = hashlib.md5(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+    return f'{namespace}:{get_generation(namespace)}:{digest}'
@@ -0,0 +1,134 @@
+"""
+Read replica routing.
+
+Every database alias other than ``default`` is treated as a read replica.
+``ReplicaRoutingMiddleware`` decides per request whether reads may go to a
+replica:
+
+* only GET/HEAD/OPTIONS requests read from replicas;
+* a view can opt out (or in) with a ``read_replica`` attribute, and
+  ``REPLICA_READS_DEFAULT`` applies to views that do not set one;
+* once a request writes, its remaining reads go to the primary, and so do
+  the reads of the same client (same Authorization header or session) for
+  the next ``REPLICA_PIN_SECONDS``, so clients read their own writes while
+  replicas catch up.
+
+``ReplicaRouter`` reads that decision from a context variable, so code that
+runs outside a request (management commands, background threads) always
+uses the primary.
+"""
+import contextvars
+import hashlib
+import random
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_state = contextvars.ContextVar('db_routing', default=None)
+
+
+class RoutingState:
+    def __init__(self, read_replica):
+        self.read_replica = read_replica
+        self.wrote = False
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias != DEFAULT_DB_ALIAS]
+
+
+def pin_seconds():
+    return getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+
+
+def client_key(request):
+    """Identify the client across requests without authenticating it"""
+    credentials = request.META.get('HTTP_AUTHORIZATION') or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not credentials:
+        return None
+    return 'db-pin:' + hashlib.md5(credentials.encode()).hexdigest()
+
+
+def view_reads_replica(view_func):
+    """The ``read_replica`` setting of a DRF, class-based or function view"""
+    view = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None) or view_func
+    return getattr(view, 'read_replica', getattr(settings, 'REPLICA_READS_DEFAULT', True))
+
+
+class ReplicaRouter:
+    """Sends reads to a replica when the current request allows it"""
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.read_replica or state.wrote:
+            return DEFAULT_DB_ALIAS
+        # Reads inside a transaction must see its writes
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        replicas = replica_aliases()
+        return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return True
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        state, token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        self.finish(request, state)
+        return response
+
+    async def __acall__(self, request):
+        state, token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        self.finish(request, state)
+        return response
+
+    def start(self, request):
+        read_replica = False
+        if request.method in SAFE_METHODS and replica_aliases():
+            key = client_key(request)
+            read_replica = not (key and cache.get(key))
+        state = RoutingState(read_replica)
+        return state, _state.set(state)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = _state.get()
+        if state is not None and state.read_replica:
+            state.read_replica = view_reads_replica(view_func)
+
+    def finish(self, request, state):
+        key = client_key(request)
+        if state.wrote and key and replica_aliases():
+            cache.set(key, True, pin_seconds())
@@ -0,0 +1,71 @@
+"""
+Compact, time-ordered UUID keys.
+
+``BinaryUUIDField`` stores a UUID in 16 bytes: ``BINARY(16)`` on MySQL and
+the native ``uuid`` type on PostgreSQL, instead of Django's ``CHAR(32)``.
+Python code and the API keep seeing ``uuid.UUID`` values and their usual
+string form.
+
+``uuid7`` generates keys that start with a millisecond timestamp, so rows
+inserted together land next to each other in the primary key index instead
+of at random pages the way ``uuid4`` keys do.
+"""
+import os
+import time
+import uuid
+from django.db import models
+
+
+def uuid7():
+    """Version 7 UUID (RFC 9562): 48-bit Unix time in ms, then 74 random bits"""
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    # Overwrite the version nibble and the variant bits
+    value = value & ~(0xF << 76) | 0x7 << 76
+    value = value & ~(0x3 << 62) | 0x2 << 62
+    return uuid.UUID(int=value)
+
+
+def parse_uuid(value):
+    """``value`` as a UUID, or None if it is not one; any UUID spelling is accepted"""
+    if isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value).strip())
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+class BinaryUUIDField(models.UUIDField):
+    """
+    UUIDField stored as ``BINARY(16)`` on MySQL and MariaDB. PostgreSQL keeps
+    its native ``uuid`` column and other backends Django's ``char(32)``.
+    """
+
+    def get_internal_type(self):
+        # Keeps MySQL from applying its char(32) UUID converter to raw bytes
+        return 'BinaryUUIDField'
+
+    def db_type(self, connection):
+        if connection.vendor == 'mysql':
+            return 'binary(16)'
+        if connection.features.has_native_uuid_field:
+            return 'uuid'
+        return 'char(32)'
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if value is None:
+            return None
+        if not isinstance(value, uuid.UUID):
+            value = self.to_python(value)
+        if connection.vendor == 'mysql':
+            return value.bytes
+        if connection.features.has_native_uuid_field:
+            return value
+        return value.hex
+
+    def from_db_value(self, value, expression, connection):
+        if value is None or isinstance(value, uuid.UUID):
+            return value
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return uuid.UUID(bytes=bytes(value))
+        return uuid.UUID(value)
@@ -0,0 +1,234 @@
+"""
+Index advice from the slow-request log.
+
+``read_shapes`` collects the statements ``api.metrics`` logged for slow
+requests and groups repeats of the same statement. ``suggest_index`` reads
+the filter and sort columns of a statement off the SQL the ORM generated
+and proposes a composite index: columns compared for equality first, then
+the ORDER BY (or GROUP BY) columns, or else the first range-filtered column.
+``redundant_indexes`` lists indexes whose columns lead another index.
+
+The SQL parsing only understands the flat queries Django writes. Treat the
+suggestions as a starting point for reading the EXPLAIN output, not as
+migrations to apply blindly.
+"""
+import json
+import re
+from django.apps import apps
+
+SLOW_LOGGER = 'api.metrics.slow'
+
+# Operators that pin a column to a single value or a set of values
+EQUALITY_OPERATORS = ('=', 'IN', 'IS')
+
+_TABLE = re.compile(r'\bFROM\s+[`"](\w+)[`"]', re.I)
+_COMPARISON = re.compile(
+    r'(?:[`"](\w+)[`"]\.)?[`"](\w+)[`"]\s*(=|<=|>=|<>|!=|<|>|\bIN\b|\bIS\b|\bLIKE\b|\bBETWEEN\b)', re.I)
+_ORDER_ITEM = re.compile(r'^(?:[`"](\w+)[`"]\.)?[`"](\w+)[`"](?:\s+(ASC|DESC))?$', re.I)
+_POSITION = re.compile(r'^(\d+)(?:\s+(ASC|DESC))?$', re.I)
+_ALIASED = re.compile(r'\s+AS\s+[`"]?\w+[`"]?$', re.I)
+_SELECTED = re.compile(r'(?:[`"](\w+)[`"]\.)?[`"](\w+)[`"]')
+_IN_LIST = re.compile(r'\bIN \((?:%s, )*%s\)')
+
+
+class Shape:
+    """One distinct statement and how often and how slowly it ran"""
+
+    def __init__(self, sql):
+        self.sql = sql
+        self.count = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.routes = set()
+        # First logged statement with its parameters, for EXPLAIN
+        self.sample = None
+
+    def add(self, statement, route):
+        duration = float(statement.get('duration') or 0)
+        self.count += 1
+        self.total += duration
+        self.slowest = max(self.slowest, duration)
+        if route:
+            self.routes.add(route)
+        if self.sample is None and 'params' in statement:
+            self.sample = (statement['sql'], statement['params'])
+
+
+def normalize_sql(sql):
+    """Collapse whitespace and IN lists so repeats of a query compare equal"""
+    return _IN_LIST.sub('IN (%s, ...)', ' '.join(sql.split()))
+
+
+def read_shapes(lines):
+    """``{normalized sql: Shape}`` for the slow-request records in JSON log lines"""
+    shapes = {}
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if not isinstance(entry, dict) or entry.get('logger') != SLOW_LOGGER:
+            continue
+        for statement in entry.get('slowest_sql') or ():
+            sql = normalize_sql(statement.get('sql') or '')
+            if not sql:
+                continue
+            shape = shapes.get(sql)
+            if shape is None:
+                shape = shapes[sql] = Shape(sql)
+            shape.add(statement, entry.get('route'))
+    return shapes
+
+
+def _clause(sql, keyword, ends):
+    """Text of the last top-level ``keyword`` clause, up to the first of ``ends``"""
+    start = sql.upper().rfind(f' {keyword} ')
+    if start == -1:
+        return ''
+    text = sql[start + len(keyword) + 2:]
+    upper = text.upper()
+    stops = [upper.find(f' {end} ') for end in ends if f' {end} ' in upper]
+    return text[:min(stops)] if stops else text
+
+
+def _split_top_level(text):
+    """Items of a comma separated list, ignoring commas inside parentheses"""
+    items, depth, start = [], 0, 0
+    for index, char in enumerate(text):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            items.append(text[start:index].strip())
+            start = index + 1
+    items.append(text[start:].strip())
+    return items
+
+
+def parse_query(sql):
+    """
+    ``(table, equality columns, range columns, order, grouped, selected)``
+    of a SELECT, keeping only columns of the table in its first FROM;
+    ``order`` is a list of ``(column, descending)``. None for other
+    statements.
+    """
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return None
+    match = _TABLE.search(sql)
+    if match is None:
+        return None
+    table = match.group(1)
+
+    def own(qualifier):
+        # Django qualifies every column; bare names are aliases such as "key"
+        return qualifier == table
+
+    where = _clause(sql, 'WHERE', ('GROUP BY', 'ORDER BY', 'LIMIT', 'OFFSET', 'HAVING'))
+    equality, ranged = [], []
+    for qualifier, column, operator in _COMPARISON.findall(where):
+        if not own(qualifier):
+            continue
+        target = equality if operator.upper() in EQUALITY_OPERATORS else ranged
+        if column not in target:
+            target.append(column)
+    # A keyset condition compares its column both ways; it is a range
+    equality = [column for column in equality if column not in ranged]
+
+    select = _split_top_level(sql[len('SELECT'):sql.upper().find(' FROM ')])
+
+    def columns_of(clause):
+        columns = []
+        for item in _split_top_level(clause):
+            position = _POSITION.match(item)
+            if position is not None:
+                # GROUP BY 1 / ORDER BY 1 refer to the select list
+                index = int(position.group(1)) - 1
+                expression = _ALIASED.sub('', select[index]) if index < len(select) else ''
+                item = f'{expression} {position.group(2) or ""}'.strip()
+            match = _ORDER_ITEM.match(item)
+            if match is None or not own(match.group(1)):
+                # An expression or another table: no index can serve it
+                return []
+            columns.append((match.group(2), (match.group(3) or '').upper() == 'DESC'))
+        return columns
+
+    order = columns_of(_clause(sql, 'ORDER BY', ('LIMIT', 'OFFSET')))
+    grouped = [column for column, _ in columns_of(_clause(sql, 'GROUP BY', ('HAVING', 'ORDER BY', 'LIMIT')))]
+
+    selected = [column for qualifier, column in _SELECTED.findall(', '.join(select)) if own(qualifier)]
+    return table, equality, ranged, order, grouped, selected
+
+
+def suggest_index(sql):
+    """
+    ``(table, columns, number of equality columns, selected columns)`` of
+    the index that would serve ``sql``, or None
+    """
+    parsed = parse_query(sql)
+    if parsed is None:
+        return None
+    table, equality, ranged, order, grouped, selected = parsed
+    columns = list(equality)
+    tail = [column for column in [column for column, _ in order] or grouped if column not in columns]
+    if tail:
+        columns += tail
+    elif ranged:
+        columns.append(ranged[0])
+    if not columns:
+        return None
+    return table, columns, len(equality), selected
+
+
+def existing_indexes(connection, table):
+    """``{name: (columns, unique)}`` of the indexes on ``table``, as introspected"""
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, table)
+    return {
+        name: (list(info['columns']), bool(info['unique'] or info['primary_key']))
+        for name, info in constraints.items()
+        if (info['index'] or info['unique'] or info['primary_key']) and info['columns'] and not info['foreign_key']
+    }
+
+
+def covering_index(indexes, columns, equality_count):
+    """Name of an existing index that already serves ``columns``, or None"""
+    head, tail = set(columns[:equality_count]), columns[equality_count:]
+    for name, (index_columns, _) in indexes.items():
+        # Equality columns may come in any order, the rest must follow
+        if set(index_columns[:equality_count]) == head and index_columns[equality_count:len(columns)] == tail:
+            return name
+    return None
+
+
+def redundant_indexes(indexes):
+    """``[(index, covered by)]`` for plain indexes whose columns lead another index"""
+    redundant = []
+    for name, (columns, unique) in sorted(indexes.items()):
+        if unique:
+            continue
+        for other, (other_columns, other_unique) in sorted(indexes.items()):
+            if other != name and len(other_columns) >= len(columns) and other_columns[:len(columns)] == columns:
+                # Of two identical plain indexes only report the second
+                if other_columns == columns and not other_unique and other > name:
+                    continue
+                redundant.append((name, other))
+                break
+    return redundant
+
+
+def model_index(table, columns):
+    """``models.Index`` declaration for ``columns`` of ``table``, or None if no model owns it"""
+    for model in apps.get_models():
+        if model._meta.db_table == table:
+            names = {field.column: field.name for field in model._meta.concrete_fields}
+            fields = ', '.join(repr(names.get(column, column)) for column in columns)
+            return f'{model._meta.label}: models.Index(fields=[{fields}])'
+    return None
+
+
+def explain(connection, sql, params):
+    """Plan lines of a SELECT on ``connection``"""
+    with connection.cursor() as cursor:
+        cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+        return [' '.join(str(value) for value in row) for row in cursor.fetchall()]
@@ -0,0 +1,100 @@
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from api.indexes import (
+    covering_index, existing_indexes, explain, model_index, read_shapes, redundant_indexes, suggest_index,
+)
+
+# Extra selected columns worth carrying in an index to skip the table lookup
+MAX_INCLUDED_COLUMNS = 3
+
+
+class Command(BaseCommand):
+    help = 'Suggest composite indexes for the slowest statements in the slow-request log'
+
+    def add_arguments(self, parser):
+        parser.add_argument('logfiles', nargs='*',
+                            help='JSON log files to read (default: the django.log file handler)')
+        parser.add_argument('--top', type=int, default=10,
+                            help='Number of statements to analyse, by total time spent')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS,
+                            help='Database to introspect and run EXPLAIN on')
+        parser.add_argument('--no-explain', action='store_true',
+                            help='Only suggest indexes, do not run EXPLAIN')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        logfiles = options['logfiles'] or [settings.LOGGING['handlers']['file']['filename']]
+
+        shapes = read_shapes(self.read_lines(logfiles))
+        if not shapes:
+            self.stdout.write('No slow requests logged; lower SLOW_REQUEST_SECONDS to capture more')
+            return
+
+        ranked = sorted(shapes.values(), key=lambda shape: shape.total, reverse=True)[:options['top']]
+        indexes = {}
+        suggestions = set()
+        for rank, shape in enumerate(ranked, 1):
+            routes = ', '.join(sorted(shape.routes)) or 'unknown route'
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'#{rank} {routes}: {shape.count} runs, {shape.total:.3f}s total, {shape.slowest:.3f}s slowest'))
+            self.stdout.write(f'  {shape.sql if options["verbosity"] > 1 else shape.sql[:300]}')
+
+            if not options['no_explain'] and shape.sql.upper().startswith('SELECT'):
+                self.explain(connection, shape)
+
+            suggestion = suggest_index(shape.sql)
+            if suggestion is None:
+                self.stdout.write('  No index suggestion for this statement')
+                continue
+            table, columns, equality_count, selected = suggestion
+            if table not in indexes:
+                indexes[table] = existing_indexes(connection, table)
+            served_by = covering_index(indexes[table], columns, equality_count)
+            if served_by:
+                self.stdout.write(f'  Served by existing index {served_by} on {table} ({", ".join(columns)})')
+                continue
+
+            suggestions.add((table, tuple(columns)))
+            self.stdout.write(self.style.SUCCESS(f'  Suggest index on {table} ({", ".join(columns)})'))
+            declaration = model_index(table, columns)
+            if declaration:
+                self.stdout.write(f'    {declaration}')
+            included = [column for column in selected if column not in columns]
+            if connection.features.supports_covering_indexes and 0 < len(included) <= MAX_INCLUDED_COLUMNS:
+                self.stdout.write(f'    include=[{", ".join(map(repr, included))}] would make it covering')
+
+        self.report_redundant(connection, indexes)
+        self.stdout.write(self.style.SUCCESS(
+            f'Analysed {len(ranked)} of {len(shapes)} statements, {len(suggestions)} new indexes suggested'))
+
+    def read_lines(self, logfiles):
+        for path in logfiles:
+            with open(path, encoding='utf-8', errors='replace') as lines:
+                yield from lines
+
+    def explain(self, connection, shape):
+        if shape.sample is None:
+            self.stdout.write('  No parameters logged; set SLOW_REQUEST_LOG_PARAMS to EXPLAIN it')
+            return
+        sql, params = shape.sample
+        try:
+            plan = explain(connection, sql, params)
+        except DatabaseError as e:
+            self.stdout.write(self.style.WARNING(f'  EXPLAIN failed: {e}'))
+            return
+        self.stdout.write('  Plan:')
+        for line in plan:
+            self.stdout.write(f'    {line}')
+
+    def report_redundant(self, connection, indexes):
+        """Indexes on the project's tables that another index makes unnecessary"""
+        tables = set(connection.introspection.table_names())
+        for model in apps.get_models():
+            table = model._meta.db_table
+            if table in tables and table not in indexes:
+                indexes[table] = existing_indexes(connection, table)
+        for table in sorted(indexes):
+            for name, covered_by in redundant_indexes(indexes[table]):
+                self.stdout.write(self.style.WARNING(f'Redundant index {name} on {table}: {covered_by} covers it'))
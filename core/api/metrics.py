@@ -0,0 +1,239 @@
+"""
+In-process request metrics in the Prometheus text format.
+
+``MetricsMiddleware`` times every request and records, per route (the URL
+name, e.g. ``farmer-sync``) and method, the latency, the number and total
+duration of DB queries and the response size. Queries are counted by an
+execute wrapper installed on every DB connection, which reports to the
+recorder of the request being served; it works for sync and async views.
+
+Requests slower than ``SLOW_REQUEST_SECONDS`` are logged to
+``api.metrics.slow`` with their slowest SQL statements, and with the query
+parameters if ``SLOW_REQUEST_LOG_PARAMS`` is on; ``manage.py
+advise_indexes`` reads that log.
+
+Metrics live in the memory of each process, so with several workers each
+one exposes its own counters at ``/metrics``.
+"""
+import bisect
+import contextvars
+import heapq
+import logging
+import threading
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+slow_logger = logging.getLogger('api.metrics.slow')
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250, 1000)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Statements kept per request for the slow-request log
+SQL_SAMPLE_SIZE = 50
+
+_current = contextvars.ContextVar('request_queries', default=None)
+
+
+class Histogram:
+    """Cumulative histogram with fixed upper bounds, as Prometheus expects"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f'{name}_sum{{{labels}}} {self.sum}'
+        yield f'{name}_count{{{labels}}} {self.count}'
+
+
+class RouteMetrics:
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.query_time = Histogram(LATENCY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.statuses = {}
+
+
+class MetricsRegistry:
+    HISTOGRAMS = (
+        ('http_request_duration_seconds', 'latency', 'Request latency in seconds'),
+        ('http_request_db_queries', 'queries', 'DB queries per request'),
+        ('http_request_db_duration_seconds', 'query_time', 'Time spent in DB queries per request'),
+        ('http_response_size_bytes', 'size', 'Response body size in bytes'),
+    )
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+
+    def observe(self, route, method, status, duration, queries, query_time, size):
+        with self.lock:
+            metrics = self.routes.get((route, method))
+            if metrics is None:
+                metrics = self.routes[(route, method)] = RouteMetrics()
+            metrics.latency.observe(duration)
+            metrics.queries.observe(queries)
+            metrics.query_time.observe(query_time)
+            if size is not None:
+                metrics.size.observe(size)
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+    def render(self):
+        """Current metrics in the Prometheus text exposition format"""
+        with self.lock:
+            routes = sorted(self.routes.items())
+            lines = [
+                '# HELP http_requests_total Requests served',
+                '# TYPE http_requests_total counter',
+            ]
+            for (route, method), metrics in routes:
+                for status, count in sorted(metrics.statuses.items()):
+                    lines.append(f'http_requests_total{{{_labels(route, method)},status="{status}"}} {count}')
+            for name, attribute, description in self.HISTOGRAMS:
+                lines.append(f'# HELP {name} {description}')
+                lines.append(f'# TYPE {name} histogram')
+                for (route, method), metrics in routes:
+                    lines.extend(getattr(metrics, attribute).samples(name, _labels(route, method)))
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self.lock:
+            self.routes = {}
+
+
+def _labels(route, method):
+    route = route.replace('\\', '\\\\').replace('"', '\\"')
+    return f'route="{route}",method="{method}"'
+
+
+registry = MetricsRegistry()
+
+
+class QueryRecorder:
+    """Counts and times the queries of one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        # Min-heap of the slowest (duration, sequence, sql, params) entries;
+        # the sequence number keeps params out of comparisons
+        self.statements = []
+
+    def add(self, sql, duration, params=None):
+        self.count += 1
+        self.duration += duration
+        entry = (duration, self.count, sql, params)
+        if len(self.statements) < SQL_SAMPLE_SIZE:
+            heapq.heappush(self.statements, entry)
+        else:
+            heapq.heappushpop(self.statements, entry)
+
+    def slowest(self, limit):
+        return heapq.nlargest(limit, self.statements)
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper installed on every connection by api.models"""
+    recorder = _current.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        # executemany() parameter lists are not worth keeping
+        logged = list(params) if params is not None and not many and log_params() else None
+        recorder.add(sql, time.perf_counter() - start, logged)
+
+
+def slow_request_seconds():
+    return getattr(settings, 'SLOW_REQUEST_SECONDS', 1.0)
+
+
+def log_params():
+    return getattr(settings, 'SLOW_REQUEST_LOG_PARAMS', False)
+
+
+class MetricsMiddleware:
+    """Records latency, queries and response size of every request"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        token = _current.set(recorder)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.record(request, response, time.perf_counter() - start, recorder)
+        return response
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        token = _current.set(recorder)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.record(request, response, time.perf_counter() - start, recorder)
+        return response
+
+    def record(self, request, response, duration, recorder):
+        match = request.resolver_match
+        route = (match.view_name or match.route) if match else 'unmatched'
+        if response.streaming:
+            size = int(response['Content-Length']) if response.has_header('Content-Length') else None
+        else:
+            size = len(response.content)
+        registry.observe(route, request.method, response.status_code, duration,
+                         recorder.count, recorder.duration, size)
+
+        if duration >= slow_request_seconds():
+            slow_logger.warning(
+                'Slow request %s %s took %.3fs with %d queries (%.3fs in DB)',
+                request.method, request.get_full_path(), duration, recorder.count, recorder.duration,
+                extra={
+                    'event': 'request.slow',
+                    'route': route,
+                    'status': response.status_code,
+                    'duration': duration,
+                    'queries': recorder.count,
+                    'db_duration': recorder.duration,
+                    'slowest_sql': [
+                        _statement(statement_duration, sql, params)
+                        for statement_duration, _, sql, params in recorder.slowest(10)
+                    ],
+                },
+            )
+
+
+def _statement(duration, sql, params):
+    statement = {'duration': round(duration, 6), 'sql': sql}
+    if params is not None:
+        statement['params'] = params
+    return statement
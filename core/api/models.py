@@ -1,3 +1,11 @@
 from django.db import models
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from .metrics import record_query
 
-# Create your models here.
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    """Signal to count the queries of each request on every new DB connection"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
@@ -0,0 +1,131 @@
+import base64
+import json
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward-only keyset pagination over a composite ordering such as
+    ``('-created_at', '-id')``.
+
+    Each page is fetched with a ``WHERE (a, b) < (x, y)`` style filter on the
+    last row of the previous page, so deep pages cost the same as the first
+    one. Pagination is opt-in: it only kicks in when the client sends
+    ``page_size`` or ``cursor``, so existing clients keep getting plain lists.
+    Set ``optional = False`` to always paginate. Views can override the
+    ordering with ``get_keyset_ordering()``.
+    """
+    ordering = ('-created_at', '-id')
+    optional = True
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.optional and self.page_size_query_param not in params and self.cursor_query_param not in params:
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(view)
+        self.fields = [name.lstrip('-') for name in self.ordering]
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(params.get(self.cursor_query_param))
+        if position is not None:
+            queryset = queryset.filter(self.position_filter(position))
+
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        page = rows[:self.page_size]
+        self.next_position = [self.field_value(page[-1], name) for name in self.fields] if page else None
+        return page
+
+    def get_ordering(self, view):
+        if view is not None and hasattr(view, 'get_keyset_ordering'):
+            return tuple(view.get_keyset_ordering())
+        return tuple(self.ordering)
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def position_filter(self, position):
+        """Rows strictly after ``position`` in the configured ordering"""
+        condition = Q()
+        for index, name in enumerate(self.ordering):
+            field = name.lstrip('-')
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            step = Q(**{f'{field}__{lookup}': position[index]})
+            for previous in range(index):
+                step &= Q(**{self.fields[previous]: position[previous]})
+            condition |= step
+        return condition
+
+    def field_value(self, obj, name):
+        value = getattr(obj, name)
+        return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+    def encode_cursor(self, position):
+        return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+    def decode_cursor(self, value):
+        if not value:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(value.encode()))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.page_size_query_param, self.page_size)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+
+class EnvelopePagination(PageNumberPagination):
+    """
+    Opt-in page-number pagination that keeps a view's existing
+    ``{<results_key>: [...], 'count': n}`` response envelope. Pages are only
+    cut when the client sends ``page`` or ``page_size``; ``count`` is then the
+    total number of rows and ``next``/``previous`` link the neighbouring pages.
+    """
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = 'page_size'
+    results_key = 'results'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.page_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return Response({
+            self.results_key: data,
+            'count': self.page.paginator.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+        })
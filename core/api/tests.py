@@ -1,3 +1,212 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from farmer_mappings.models import FarmerMapping
+from farmers.models import Farmer
+from .db_router import ReplicaRouter, ReplicaRoutingMiddleware
+from .indexes import covering_index, normalize_sql, parse_query, redundant_indexes, suggest_index
 
-# Create your tests here.
+
+@override_settings(METRICS_ALLOWED_IPS=['127.0.0.1', '10.0.0.5'], METRICS_TRUSTED_PROXIES=[], METRICS_TOKEN=None)
+class MetricsAccessTests(TestCase):
+    """/metrics answers allowed clients only, whatever the proxy in front"""
+
+    def scrape(self, remote_addr, **headers):
+        return self.client.get('/metrics', REMOTE_ADDR=remote_addr, **headers)
+
+    def test_allowed_client(self):
+        response = self.scrape('127.0.0.1')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+
+    def test_other_client_is_denied(self):
+        self.assertEqual(self.scrape('203.0.113.9').status_code, 404)
+
+    def test_request_forwarded_by_unknown_proxy_is_denied(self):
+        # A local proxy makes every public request look like localhost
+        response = self.scrape('127.0.0.1', HTTP_X_FORWARDED_FOR='203.0.113.9')
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(METRICS_TRUSTED_PROXIES=['127.0.0.1'])
+    def test_client_is_read_through_trusted_proxy(self):
+        self.assertEqual(self.scrape('127.0.0.1', HTTP_X_FORWARDED_FOR='203.0.113.9').status_code, 404)
+        # A client cannot prepend an allowed address to the header
+        self.assertEqual(self.scrape('127.0.0.1', HTTP_X_FORWARDED_FOR='10.0.0.5, 203.0.113.9').status_code, 404)
+        self.assertEqual(self.scrape('127.0.0.1', HTTP_X_FORWARDED_FOR='10.0.0.5').status_code, 200)
+        self.assertEqual(self.scrape('127.0.0.1').status_code, 404)
+
+    @override_settings(METRICS_TOKEN='s3cret')
+    def test_token_is_required_when_set(self):
+        self.assertEqual(self.scrape('127.0.0.1').status_code, 404)
+        self.assertEqual(self.scrape('127.0.0.1', HTTP_AUTHORIZATION='Bearer wrong').status_code, 404)
+        self.assertEqual(self.scrape('127.0.0.1', HTTP_AUTHORIZATION='Bearer s3cret').status_code, 200)
+
+
+def orm_sql(queryset):
+    return queryset.query.get_compiler('default').as_sql()[0]
+
+
+class IndexAdvisorTests(SimpleTestCase):
+    """Index suggestions read off the SQL Django generates"""
+
+    def test_join_keeps_columns_of_the_first_table(self):
+        sql = orm_sql(FarmerMapping.objects.filter(company_id=1, status='active')
+                      .select_related('farmer').order_by('-created_at')[:20])
+        table, columns, equality_count, selected = suggest_index(sql)
+        self.assertEqual(table, 'farmer_mappings')
+        self.assertEqual(columns, ['company_id', 'status', 'created_at'])
+        self.assertEqual(equality_count, 2)
+        self.assertNotIn('farmer_name', selected)
+
+    def test_filter_on_joined_table_is_ignored(self):
+        sql = orm_sql(Farmer.objects.filter(crop__crop_name='rice', state='Telangana').order_by('created_at'))
+        self.assertEqual(suggest_index(sql)[:3], ('farmers', ['state', 'created_at'], 1))
+
+    def test_backtick_quoted_identifiers(self):
+        sql = ('SELECT `farmers`.`id`, `farmers`.`farmer_name` FROM `farmers` '
+               'INNER JOIN `farmer_crops` ON (`farmers`.`id` = `farmer_crops`.`farmer_id`) '
+               'WHERE (`farmer_crops`.`crop_name` = %s AND `farmers`.`district` = %s '
+               'AND `farmers`.`updated_at` > %s) ORDER BY `farmers`.`updated_at` ASC LIMIT 21')
+        self.assertEqual(suggest_index(sql), ('farmers', ['district', 'updated_at'], 1, ['id', 'farmer_name']))
+
+    def test_in_list_is_an_equality_and_normalizes(self):
+        short = 'SELECT "jobs"."id" FROM "jobs" WHERE "jobs"."status" IN (%s) ORDER BY "jobs"."run_at" ASC'
+        long = short.replace('IN (%s)', 'IN (%s, %s, %s)')
+        self.assertEqual(normalize_sql(short), normalize_sql(long))
+        self.assertIn('IN (%s, ...)', normalize_sql(long))
+        self.assertEqual(suggest_index(long)[:3], ('jobs', ['status', 'run_at'], 1))
+
+    def test_keyset_condition_is_a_range(self):
+        sql = ('SELECT "farmers"."id" FROM "farmers" WHERE ("farmers"."sync_status" = %s AND '
+               '("farmers"."updated_at" > %s OR ("farmers"."updated_at" = %s AND "farmers"."id" > %s))) '
+               'ORDER BY "farmers"."updated_at" ASC, "farmers"."id" ASC LIMIT 501')
+        table, equality, ranged, order, grouped, selected = parse_query(sql)
+        self.assertEqual((equality, ranged), (['sync_status'], ['updated_at', 'id']))
+        self.assertEqual(order, [('updated_at', False), ('id', False)])
+        self.assertEqual(suggest_index(sql)[1], ['sync_status', 'updated_at', 'id'])
+
+    def test_order_by_position_and_expression(self):
+        grouped = ('SELECT "farmers"."state" AS "key", SUM("farmers"."total_co2_emissions") AS "total" '
+                   'FROM "farmers" WHERE "farmers"."district" = %s GROUP BY 1 ORDER BY 1 DESC')
+        self.assertEqual(parse_query(grouped)[3], [('state', True)])
+        self.assertEqual(suggest_index(grouped)[1], ['district', 'state'])
+        # No index serves an ORDER BY expression; fall back to the range column
+        expression = ('SELECT "farmers"."id" FROM "farmers" WHERE "farmers"."acreage" >= %s '
+                      'ORDER BY LOWER("farmers"."farmer_name") ASC')
+        self.assertEqual(suggest_index(expression)[1], ['acreage'])
+
+    def test_statements_without_advice(self):
+        self.assertIsNone(suggest_index('UPDATE "jobs" SET "status" = %s WHERE "jobs"."id" = %s'))
+        self.assertIsNone(suggest_index('SELECT COUNT(*) FROM "farmers"'))
+
+    def test_existing_and_redundant_indexes(self):
+        indexes = {
+            'pk': (['id'], True),
+            'by_state': (['state'], False),
+            'by_state_district': (['state', 'district'], False),
+            'by_state_district_2': (['state', 'district'], False),
+        }
+        self.assertEqual(redundant_indexes(indexes), [('by_state', 'by_state_district'),
+                                                      ('by_state_district_2', 'by_state_district')])
+        self.assertEqual(covering_index(indexes, ['state', 'district'], 2), 'by_state_district')
+        self.assertEqual(covering_index(indexes, ['district', 'state'], 2), 'by_state_district')
+        self.assertIsNone(covering_index(indexes, ['district', 'state'], 1))
+
+
+class KeysetPaginationTests(TestCase):
+    """Cursor pages over /api/farmers/ neither skip nor repeat rows"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_user(email='admin@example.com', password='pw', role='admin')
+        cls.farmers = [Farmer.objects.create(farmer_name=f'Farmer {index}') for index in range(7)]
+        # Ties on created_at are broken by id
+        Farmer.objects.update(created_at=timezone.now() - timedelta(days=1))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def pages(self, params, between_pages=None):
+        response = self.client.get('/api/farmers/', params)
+        pages = []
+        while True:
+            self.assertEqual(response.status_code, 200)
+            pages.append([row['id'] for row in response.data['results']])
+            if not response.data['next']:
+                return pages
+            if between_pages:
+                between_pages()
+            response = self.client.get(response.data['next'])
+
+    def test_pages_are_stable_under_inserts(self):
+        pages = self.pages({'page_size': 3}, between_pages=lambda: Farmer.objects.create(farmer_name='Newcomer'))
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        seen = [farmer_id for page in pages for farmer_id in page]
+        expected = sorted((str(farmer.id) for farmer in self.farmers), reverse=True)
+        self.assertEqual(seen, expected)
+
+    def test_custom_ordering(self):
+        pages = self.pages({'page_size': 4, 'ordering': 'total_co2_emissions'})
+        seen = [farmer_id for page in pages for farmer_id in page]
+        self.assertEqual(seen, sorted(str(farmer.id) for farmer in self.farmers))
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/farmers/', {'cursor': 'bm90IGEgY3Vyc29y'})
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(REPLICA_PIN_SECONDS=5, REPLICA_READS_DEFAULT=True)
+class ReplicaRoutingTests(SimpleTestCase):
+    """Reads go to a replica until the client writes, then stay on the primary"""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.router = ReplicaRouter()
+        patcher = mock.patch('api.db_router.replica_aliases', return_value=['replica'])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def request(self, method='get', token='client-a', write=False, view=None):
+        """Run a request through the middleware; returns where a read after it would go"""
+        reads = []
+
+        def get_response(request):
+            if view is not None:
+                middleware.process_view(request, view, (), {})
+            reads.append(self.router.db_for_read(Farmer))
+            if write:
+                self.router.db_for_write(Farmer)
+                reads.append(self.router.db_for_read(Farmer))
+            return HttpResponse()
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+        middleware(getattr(self.factory, method)('/api/farmers/', **headers))
+        return reads
+
+    def test_reads_use_the_replica(self):
+        self.assertEqual(self.request(), ['replica'])
+        self.assertEqual(self.request(method='post'), ['default'])
+        # Outside a request everything uses the primary
+        self.assertEqual(self.router.db_for_read(Farmer), 'default')
+
+    def test_client_is_pinned_after_a_write(self):
+        self.assertEqual(self.request(write=True), ['replica', 'default'])
+        self.assertEqual(self.request(), ['default'])
+        self.assertEqual(self.request(token='client-b'), ['replica'])
+        # Once the pin expires the client reads from the replica again
+        cache.clear()
+        self.assertEqual(self.request(), ['replica'])
+
+    def test_view_can_opt_out(self):
+        class PrimaryOnlyView:
+            read_replica = False
+
+        self.assertEqual(self.request(view=PrimaryOnlyView), ['default'])
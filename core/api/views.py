@@ -1,3 +1,37 @@
-from django.shortcuts import render
+import hmac
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from .metrics import registry
 
-# Create your views here.
+
+def metrics_client_ip(request):
+    """
+    Address of the client asking for /metrics, or None if it cannot be told.
+    X-Forwarded-For is only believed from METRICS_TRUSTED_PROXIES; a
+    forwarded request from any other peer came through a proxy we do not
+    know about, so its REMOTE_ADDR is not the client's.
+    """
+    remote_addr = request.META.get('REMOTE_ADDR')
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    trusted = settings.METRICS_TRUSTED_PROXIES
+    if remote_addr not in trusted:
+        return None if forwarded else remote_addr
+    # The nearest hop that is not one of our proxies
+    for hop in reversed((forwarded or '').split(',')):
+        hop = hop.strip()
+        if hop and hop not in trusted:
+            return hop
+    return None
+
+
+def metrics(request):
+    """
+    Prometheus scrape endpoint, only answered for METRICS_ALLOWED_IPS and,
+    when METRICS_TOKEN is set, to ``Authorization: Bearer <token>``
+    """
+    if metrics_client_ip(request) not in settings.METRICS_ALLOWED_IPS:
+        raise Http404
+    token = settings.METRICS_TOKEN
+    if token and not hmac.compare_digest(request.META.get('HTTP_AUTHORIZATION', ''), f'Bearer {token}'):
+        raise Http404
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -3,6 +3,9 @@ from django.utils.html import format_html
 from django.contrib import messages
 from django.utils.safestring import mark_safe
 from .models import Company
+import logging
+
+logger = logging.getLogger('security')
 
 
 @admin.register(Company)
@@ -104,7 +107,7 @@ class CompanyAdmin(admin.ModelAdmin):
                 messages.success(request, credential_box)
 
                 # Log the credential generation (without the actual password)
-                print(f"SECURITY: Credentials generated for company: {obj.name} (ID: {obj.id})")
+                logger.info("Credentials generated for company: %s (ID: %s)", obj.name, obj.id)
             else:
                 # Show a warning if user creation failed
                 messages.warning(
@@ -114,7 +117,7 @@ class CompanyAdmin(admin.ModelAdmin):
                 )
 
                 # Log the failure
-                print(f"WARNING: Failed to create user account for company: {obj.name} (ID: {obj.id})")
+                logger.warning("Failed to create user account for company: %s (ID: %s)", obj.name, obj.id)
 
     def delete_model(self, request, obj):
         """Override delete_model to handle user deletion.
@@ -128,11 +131,11 @@ class CompanyAdmin(admin.ModelAdmin):
 
         try:
             # Log the deletion attempt
-            print(f"SECURITY: Admin initiated deletion of company: {company_name} (ID: {company_id})")
+            logger.info("Admin initiated deletion of company: %s (ID: %s)", company_name, company_id)
 
             # Delete the associated user first
             if obj.user:
-                print(f"SECURITY: Deleting associated user: {user_email}")
+                logger.info("Deleting associated user: %s", user_email)
                 obj.delete_user()
 
                 # Notify the admin about the user deletion
@@ -141,13 +144,13 @@ class CompanyAdmin(admin.ModelAdmin):
                     f"The user account ({user_email}) associated with {company_name} has been permanently deleted."
                 )
             else:
-                print(f"SECURITY: No user account associated with company: {company_name}")
+                logger.info("No user account associated with company: %s", company_name)
 
             # Then delete the company
             super().delete_model(request, obj)
 
             # Log the successful deletion
-            print(f"SECURITY: Company {company_name} (ID: {company_id}) successfully deleted")
+            logger.info("Company %s (ID: %s) successfully deleted", company_name, company_id)
 
             # Notify the admin about the successful deletion
             messages.success(
@@ -157,7 +160,7 @@ class CompanyAdmin(admin.ModelAdmin):
 
         except Exception as e:
             # Log the error
-            print(f"ERROR: Failed to delete company {company_name} (ID: {company_id}): {str(e)}")
+            logger.error("Failed to delete company %s (ID: %s): %s", company_name, company_id, e)
 
             # Notify the admin about the error
             messages.error(
@@ -180,23 +183,23 @@ class CompanyAdmin(admin.ModelAdmin):
 
         try:
             # Log the bulk deletion attempt
-            print(f"SECURITY: Admin initiated bulk deletion of {company_count} companies")
+            logger.info("Admin initiated bulk deletion of %s companies", company_count)
 
             # Delete the associated users first
             for obj in queryset:
                 if obj.user:
                     user_email = obj.user.email
-                    print(f"SECURITY: Deleting associated user for company: {obj.name} (Email: {user_email})")
+                    logger.info("Deleting associated user for company: %s (Email: %s)", obj.name, user_email)
                     obj.delete_user()
                     deleted_users.append(user_email)
                 else:
-                    print(f"SECURITY: No user account for company: {obj.name}")
+                    logger.info("No user account for company: %s", obj.name)
 
             # Then delete the companies
             super().delete_queryset(request, queryset)
 
             # Log the successful deletion
-            print(f"SECURITY: Successfully deleted {company_count} companies and {len(deleted_users)} user accounts")
+            logger.info("Successfully deleted %s companies and %s user accounts", company_count, len(deleted_users))
 
             # Notify the admin about the successful deletion
             if deleted_users:
@@ -216,7 +219,7 @@ class CompanyAdmin(admin.ModelAdmin):
 
         except Exception as e:
             # Log the error
-            print(f"ERROR: Failed to delete companies in bulk: {str(e)}")
+            logger.error("Failed to delete companies in bulk: %s", e)
 
             # Notify the admin about the error
             messages.error(
@@ -1,13 +1,21 @@
-from django.db import models
-from django.db.models.signals import post_save
+from django.db import models, transaction
+from django.db.models.signals import post_init, post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from django.utils.text import slugify
 import random
 import string
+from api.cache import bump_generation
+from users.tokens import revoke_tokens
+import logging
+
+logger = logging.getLogger('security')
 
 User = get_user_model()
 
+# Cache namespace of the company list endpoint
+COMPANY_LIST_CACHE_NAMESPACE = 'company-list'
+
 def generate_random_password(length=10):
     """Generate a random password of specified length"""
     # Use a mix of letters, digits, and a few special characters for better usability
@@ -74,12 +82,12 @@ class Company(models.Model):
         The generated password is stored temporarily in memory for the admin to see.
         """
         if not self.email:
-            print(f"Cannot create user for company {self.name}: No email provided")
+            logger.warning("Cannot create user for company %s: No email provided", self.name)
             return None
 
         # Check if a user with this email already exists
         if User.objects.filter(email=self.email).exists():
-            print(f"Cannot create user for company {self.name}: User with email {self.email} already exists")
+            logger.warning("Cannot create user for company %s: User with email %s already exists", self.name, self.email)
             return None
 
         # Generate a secure random password
@@ -107,14 +115,14 @@ class Company(models.Model):
             self.save(update_fields=['user'])
 
             # Log the user creation
-            print(f"SECURITY: Created user account for company: {self.name}")
-            print(f"SECURITY: User email: {self.email}")
-            print(f"SECURITY: Generated secure password (not stored in database)")
+            logger.info("Created user account for company: %s", self.name)
+            logger.info("User email: %s", self.email)
+            logger.info("Generated secure password (not stored in database)")
 
             return user
 
         except Exception as e:
-            print(f"ERROR: Failed to create user for company {self.name}: {str(e)}")
+            logger.error("Failed to create user for company %s: %s", self.name, e)
             return None
 
     def delete_user(self):
@@ -129,7 +137,7 @@ class Company(models.Model):
             bool: True if the user was successfully deleted, False otherwise
         """
         if not self.user:
-            print(f"SECURITY: No user account associated with company: {self.name}")
+            logger.info("No user account associated with company: %s", self.name)
             return False
 
         try:
@@ -139,8 +147,8 @@ class Company(models.Model):
             user_email = user.email
 
             # Log the deletion attempt
-            print(f"SECURITY: Attempting to delete user account (ID: {user_id}, Email: {user_email}) "
-                  f"for company: {self.name} (ID: {self.id})")
+            logger.info("Attempting to delete user account (ID: %s, Email: %s) for company: %s (ID: %s)",
+                        user_id, user_email, self.name, self.id)
 
             # Temporarily set the user to None to avoid recursion
             self.user = None
@@ -150,17 +158,17 @@ class Company(models.Model):
             user.delete()
 
             # Log the successful deletion
-            print(f"SECURITY: Successfully deleted user account (ID: {user_id}, Email: {user_email}) "
-                  f"for company: {self.name} (ID: {self.id})")
+            logger.info("Successfully deleted user account (ID: %s, Email: %s) for company: %s (ID: %s)",
+                        user_id, user_email, self.name, self.id)
 
             return True
 
         except Exception as e:
-            print(f"ERROR: Failed to delete user account for company {self.name}: {str(e)}")
+            logger.error("Failed to delete user account for company %s: %s", self.name, e)
 
             # If there was an error, try to restore the relationship
             if 'user' in locals() and 'user_id' in locals() and User.objects.filter(id=user_id).exists():
-                print(f"SECURITY: Restoring user relationship after failed deletion attempt")
+                logger.info("Restoring user relationship after failed deletion attempt")
                 self.user = user
                 self.save(update_fields=['user'])
 
@@ -173,3 +181,40 @@ def create_company_user(sender, instance, created, **kwargs):
     """Signal to create a user when a company is created"""
     if created and not instance.user:
         instance.create_user()
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def invalidate_company_list(sender, instance, **kwargs):
+    """Signal to drop cached company lists when a company changes"""
+    transaction.on_commit(lambda: bump_generation(COMPANY_LIST_CACHE_NAMESPACE))
+
+
+@receiver(post_save, sender=User)
+def invalidate_company_list_for_user(sender, instance, update_fields=None, **kwargs):
+    """Signal to drop cached company lists when a company login changes"""
+    if instance.role == 'company' and set(update_fields or ()) != {'last_login'}:
+        transaction.on_commit(lambda: bump_generation(COMPANY_LIST_CACHE_NAMESPACE))
+
+
+@receiver(post_init, sender=Company)
+def remember_company_user(sender, instance, **kwargs):
+    """Signal to remember which user a company was linked to when loaded"""
+    instance._loaded_user_id = instance.__dict__.get('user_id')
+
+
+@receiver(post_save, sender=Company)
+def revoke_relinked_user_tokens(sender, instance, created, **kwargs):
+    """Signal to revoke tokens whose company_id claim no longer holds"""
+    if created or instance.user_id != instance._loaded_user_id:
+        revoke_tokens(instance._loaded_user_id)
+        revoke_tokens(instance.user_id)
+        if instance.user is not None:
+            instance.user.__dict__.pop('company_id', None)
+    instance._loaded_user_id = instance.user_id
+
+
+@receiver(post_delete, sender=Company)
+def revoke_company_user_tokens(sender, instance, **kwargs):
+    """Signal to revoke the company user's tokens when the company is deleted"""
+    revoke_tokens(instance.user_id)
@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from .models import Company
 from django.contrib.auth import get_user_model
+import logging
+
+logger = logging.getLogger(__name__)
 
 User = get_user_model()
 
@@ -65,9 +68,10 @@ class CompanyCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError({"password": "Password is required."})
 
         # Log validation checks for debugging
-        print(f"Validation check - Email: {email}")
-        print(f"Existing users with this email: {User.objects.filter(email=email).exists()}")
-        print(f"Existing companies with this email: {Company.objects.filter(email=email).exists()}")
+        if logger.isEnabledFor(logging.DEBUG):
+            # These checks cost two queries, so only run them when they are logged
+            logger.debug('Validation check - Email: %s, existing user: %s, existing company: %s', email,
+                         User.objects.filter(email=email).exists(), Company.objects.filter(email=email).exists())
 
         # Check if a user with this email already exists - case insensitive
         if User.objects.filter(email__iexact=email).exists():
@@ -91,26 +95,26 @@ class CompanyCreateSerializer(serializers.ModelSerializer):
         # Normalize the email to ensure consistent case handling
         normalized_email = email.lower().strip()
 
-        print(f"Creating company with email: {normalized_email}, username: {username}")
+        logger.debug('Creating company with email: %s, username: %s', normalized_email, username)
 
         # Double-check if a user with this email already exists - case insensitive
         # This is a safety check in case a user was created between validation and creation
         if User.objects.filter(email__iexact=normalized_email).exists():
-            print(f"User with email {normalized_email} already exists during creation")
+            logger.debug('User with email %s already exists during creation', normalized_email)
             raise serializers.ValidationError({
                 "email": "A user with this email already exists. Please use a different email address."
             })
 
         # Double-check if a company with this email already exists - case insensitive
         if Company.objects.filter(email__iexact=normalized_email).exists():
-            print(f"Company with email {normalized_email} already exists during creation")
+            logger.debug('Company with email %s already exists during creation', normalized_email)
             raise serializers.ValidationError({
                 "email": "A company with this email already exists. Please use a different email address."
             })
 
         # Create the user first
         try:
-            print(f"Creating user with email: {normalized_email}")
+            logger.debug('Creating user with email: %s', normalized_email)
 
             # Create the user with company role
             user = User.objects.create_user(
@@ -122,11 +126,11 @@ class CompanyCreateSerializer(serializers.ModelSerializer):
                 is_active=True
             )
 
-            print(f"User created successfully: {user.email} (ID: {user.id})")
+            logger.debug('User created successfully: %s (ID: %s)', user.email, user.id)
 
             # Now create the company and link it to the user
             try:
-                print(f"Creating company with data: {validated_data}")
+                logger.debug('Creating company with data: %s', validated_data)
 
                 # Create the company and link it to the user
                 company = Company.objects.create(
@@ -134,7 +138,7 @@ class CompanyCreateSerializer(serializers.ModelSerializer):
                     user=user  # Link the user directly during creation
                 )
 
-                print(f"Company created successfully: {company.name} (ID: {company.id})")
+                logger.debug('Company created successfully: %s (ID: %s)', company.name, company.id)
 
                 # Store credentials for the response
                 company._credentials = {
@@ -146,9 +150,9 @@ class CompanyCreateSerializer(serializers.ModelSerializer):
                 return company
             except Exception as company_error:
                 # If company creation fails, delete the user we just created
-                print(f"Error creating company: {str(company_error)}")
+                logger.exception('Error creating company')
                 if user.id:  # Make sure user has an ID before trying to delete
-                    print(f"Deleting user {user.email} (ID: {user.id}) due to company creation failure")
+                    logger.debug('Deleting user %s (ID: %s) due to company creation failure', user.email, user.id)
                     user.delete()
                 raise serializers.ValidationError({
                     "error": f"Failed to create company: {str(company_error)}"
@@ -159,7 +163,7 @@ class CompanyCreateSerializer(serializers.ModelSerializer):
             raise
         except Exception as user_error:
             # Handle user creation errors
-            print(f"Error creating user: {str(user_error)}")
+            logger.exception('Error creating user')
             raise serializers.ValidationError({
                 "error": f"Failed to create user account: {str(user_error)}"
             })
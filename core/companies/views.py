@@ -3,13 +3,34 @@ from rest_framework.response import Response
 from rest_framework.decorators import action
 from django.utils import timezone
 from django.db import transaction
-from .models import Company
+from django.conf import settings
+from django.core.cache import cache
+from .models import Company, COMPANY_LIST_CACHE_NAMESPACE
 from .serializers import CompanySerializer, CompanyCreateSerializer
 from api.permissions import IsAdminRole, IsCompanyRole
+from api.cache import make_cache_key
+from api.pagination import EnvelopePagination, KeysetPagination
+from farmer_mappings.models import FarmerMapping, CompanyFarmerStats
+from farmer_mappings.serializers import CompanyFarmerSerializer, CompanyFarmerStatsSerializer
 import logging
 
 # Set up logger for security events
 logger = logging.getLogger('security')
+debug_logger = logging.getLogger(__name__)
+
+
+class CompanyPagination(EnvelopePagination):
+    results_key = 'companies'
+
+
+class CompanyFarmerPagination(KeysetPagination):
+    optional = False
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'farmers': data,
+        })
 
 
 class CompanyViewSet(viewsets.ModelViewSet):
@@ -18,64 +39,62 @@ class CompanyViewSet(viewsets.ModelViewSet):
     queryset = Company.objects.all()
     serializer_class = CompanySerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CompanyPagination
 
     def get_serializer_class(self):
-        print(f"CompanyViewSet.get_serializer_class called for action: {self.action}")
-        if self.action == 'create':
-            print("Returning CompanyCreateSerializer")
-            return CompanyCreateSerializer
-        print("Returning CompanySerializer")
-        return CompanySerializer
+        serializer_class = CompanyCreateSerializer if self.action == 'create' else CompanySerializer
+        debug_logger.debug('CompanyViewSet.get_serializer_class for action %s: %s', self.action, serializer_class.__name__,
+                           extra={'event': 'company.serializer_class', 'action': self.action})
+        return serializer_class
+
+    def get_queryset(self):
+        # user_email/user_id are read from the linked user
+        return Company.objects.select_related('user')
 
     def list(self, request, *args, **kwargs):
-        """Override list method to return all companies.
+        """Override list method to return companies in a ``companies`` envelope.
 
-        This method adds additional logging to help debug issues with the company list.
+        Pass ``page``/``page_size`` to page through the list. Responses are
+        cached per query string until a company or company user changes.
         """
-        print(f"CompanyViewSet.list called by user: {request.user}")
-
-        # Get all companies
-        queryset = self.filter_queryset(self.get_queryset())
-        print(f"Found {queryset.count()} companies in the database")
-
-        # Log each company for debugging
-        for company in queryset:
-            print(f"Company: {company.name}, ID: {company.id}, Email: {company.email}")
-
-        # Serialize the data
-        serializer = self.get_serializer(queryset, many=True)
-        print(f"Serialized {len(serializer.data)} companies")
-
-        # Return the response with a wrapper to match frontend expectations
-        return Response({
-            'companies': serializer.data,
-            'count': len(serializer.data)
-        })
+        cache_key = make_cache_key(COMPANY_LIST_CACHE_NAMESPACE, sorted(request.query_params.lists()))
+        data = cache.get(cache_key)
+        if data is None:
+            queryset = self.filter_queryset(self.get_queryset())
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                data = self.get_paginated_response(self.get_serializer(page, many=True).data).data
+            else:
+                companies = self.get_serializer(queryset, many=True).data
+                # Return the response with a wrapper to match frontend expectations
+                data = {
+                    'companies': companies,
+                    'count': len(companies)
+                }
+            cache.set(cache_key, data, settings.COMPANY_LIST_CACHE_TIMEOUT)
+        return Response(data)
 
     def get_permissions(self):
         """
         Instantiates and returns the list of permissions that this view requires.
         Only admin role users can create companies, and authenticated users can view them.
         """
-        print(f"CompanyViewSet.get_permissions called for action: {self.action}")
-        print(f"User: {self.request.user}, authenticated: {self.request.user.is_authenticated}")
-
-        if hasattr(self.request.user, 'role'):
-            print(f"User role: {self.request.user.role}")
+        debug_logger.debug('CompanyViewSet.get_permissions for action %s, user %s', self.action, self.request.user,
+                           extra={'event': 'company.permissions', 'action': self.action,
+                                  'role': getattr(self.request.user, 'role', None)})
 
         if self.action == 'list' or self.action == 'retrieve':
-            print("Returning IsAuthenticated permission for list/retrieve")
             return [permissions.IsAuthenticated()]
         elif self.action == 'create' or self.action == 'update' or self.action == 'partial_update' or self.action == 'destroy':
             # Only admin role users can create, update, or delete companies
-            print("Returning IsAdminRole permission for create/update/partial_update/destroy")
             return [IsAdminRole()]
         elif self.action == 'my_company':
             # Company users can access their own company profile
-            print("Returning IsCompanyRole permission for my_company")
             return [IsCompanyRole()]
+        elif self.action == 'farmers':
+            # Admins and the company's own user; checked per object in farmers()
+            return [permissions.IsAuthenticated()]
 
-        print("Returning default permissions")
         return super().get_permissions()
 
     def create(self, request, *args, **kwargs):
@@ -87,18 +106,17 @@ class CompanyViewSet(viewsets.ModelViewSet):
         """
         # The IsAdminRole permission class already ensures the user has the admin role
         # Log the admin user for audit purposes
-        logger.info(f"Admin user creating company - User: {request.user.email} (ID: {request.user.id})")
+        logger.info('Admin user creating company - User: %s (ID: %s)', request.user.email, request.user.id)
 
         # Log the creation attempt with client info for security auditing
         client_ip = self.get_client_ip(request)
-        user_info = f"Admin: {request.user.email}"
-        logger.info(f"Company creation initiated - {user_info} from IP: {client_ip}")
-        logger.info(f"Request data: {request.data}")
+        logger.info('Company creation initiated - Admin: %s from IP: %s', request.user.email, client_ip)
+        logger.info('Request data: %s', request.data)
 
         # Validate the request data
         serializer = self.get_serializer(data=request.data)
         if not serializer.is_valid():
-            logger.warning(f"Invalid company data submitted: {serializer.errors}")
+            logger.warning('Invalid company data submitted: %s', serializer.errors)
 
             # Format the error response for better readability
             error_messages = {}
@@ -125,9 +143,9 @@ class CompanyViewSet(viewsets.ModelViewSet):
             company_email = company.email
 
             # Log the successful creation
-            logger.info(f"Company created successfully: {company.name} (ID: {company.id})")
-            logger.info(f"User account created for company with email: {company_email}")
-            logger.info(f"Username: {username}")
+            logger.info('Company created successfully: %s (ID: %s)', company.name, company.id)
+            logger.info('User account created for company with email: %s', company_email)
+            logger.info('Username: %s', username)
 
             # Return the company details along with the user credentials
             response_serializer = CompanySerializer(company)
@@ -145,12 +163,12 @@ class CompanyViewSet(viewsets.ModelViewSet):
                 'id': company.id  # Include the company ID in the response
             })
 
-            logger.info(f"Returning response: {response_data}")
+            logger.info('Returning response: %s', response_data)
             return Response(response_data, status=status.HTTP_201_CREATED)
 
         except serializers.ValidationError as e:
             # Log the validation error
-            logger.error(f"Validation error creating company: {str(e)}")
+            logger.error('Validation error creating company: %s', e)
 
             # Format the error response
             if hasattr(e, 'detail') and isinstance(e.detail, dict):
@@ -164,8 +182,7 @@ class CompanyViewSet(viewsets.ModelViewSet):
             )
         except Exception as e:
             # Log the error
-            logger.error(f"Error creating company: {str(e)}")
-            logger.exception(e)  # Log the full traceback
+            logger.exception('Error creating company')
 
             # Return a user-friendly error response
             return Response(
@@ -205,8 +222,8 @@ class CompanyViewSet(viewsets.ModelViewSet):
             # Log the deletion attempt with client info for security auditing
             client_ip = self.get_client_ip(request)
             user_info = f"User: {request.user}" if request.user.is_authenticated else "Unauthenticated user"
-            logger.info(f"Company deletion initiated - {user_info} from IP: {client_ip} - "
-                       f"Company: {company_name} (ID: {company_id})")
+            logger.info('Company deletion initiated - %s from IP: %s - Company: %s (ID: %s)',
+                        user_info, client_ip, company_name, company_id)
 
             # Use a transaction to ensure data consistency
             with transaction.atomic():
@@ -215,22 +232,22 @@ class CompanyViewSet(viewsets.ModelViewSet):
                     user_email = instance.user.email
                     user_id = instance.user.id
 
-                    logger.info(f"Deleting associated user account - Email: {user_email}, ID: {user_id}")
+                    logger.info('Deleting associated user account - Email: %s, ID: %s', user_email, user_id)
 
                     try:
                         instance.delete_user()
-                        logger.info(f"Successfully deleted user account - Email: {user_email}, ID: {user_id}")
-                    except Exception as user_error:
-                        logger.error(f"Error deleting user account - Email: {user_email}: {str(user_error)}")
+                        logger.info('Successfully deleted user account - Email: %s, ID: %s', user_email, user_id)
+                    except Exception:
+                        logger.exception('Error deleting user account - Email: %s', user_email)
                         # Continue with company deletion even if user deletion fails
                 else:
-                    logger.info(f"No user account associated with company: {company_name} (ID: {company_id})")
+                    logger.info('No user account associated with company: %s (ID: %s)', company_name, company_id)
 
                 # Then perform the standard deletion
                 self.perform_destroy(instance)
 
                 # Log the successful deletion
-                logger.info(f"Company successfully deleted - Name: {company_name}, ID: {company_id}")
+                logger.info('Company successfully deleted - Name: %s, ID: %s', company_name, company_id)
 
                 # Return a success response
                 return Response(
@@ -238,9 +255,9 @@ class CompanyViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_204_NO_CONTENT
                 )
 
-        except Exception as e:
-            # Log the error
-            logger.error(f"Error deleting company: {str(e)}")
+        except Exception:
+            # Log the error with its traceback
+            logger.exception('Error deleting company')
 
             # Return a user-friendly error response
             return Response(
@@ -260,11 +277,11 @@ class CompanyViewSet(viewsets.ModelViewSet):
 
         # Log the access attempt
         client_ip = self.get_client_ip(request)
-        logger.info(f"Company profile access attempt - User: {user} from IP: {client_ip}")
+        logger.info('Company profile access attempt - User: %s from IP: %s', user, client_ip)
 
         # Check if the user is authenticated
         if not user.is_authenticated:
-            logger.warning(f"Unauthenticated company profile access attempt from IP: {client_ip}")
+            logger.warning('Unauthenticated company profile access attempt from IP: %s', client_ip)
             return Response(
                 {"detail": "Authentication required to access company profile"},
                 status=status.HTTP_401_UNAUTHORIZED
@@ -272,7 +289,7 @@ class CompanyViewSet(viewsets.ModelViewSet):
 
         # Check if the user has the company role
         if user.role != 'company':
-            logger.warning(f"Non-company user attempted to access company profile - User: {user.email}, Role: {user.role}")
+            logger.warning('Non-company user attempted to access company profile - User: %s, Role: %s', user.email, user.role)
             return Response(
                 {"detail": "Access denied. Only company users can access this endpoint."},
                 status=status.HTTP_403_FORBIDDEN
@@ -280,10 +297,10 @@ class CompanyViewSet(viewsets.ModelViewSet):
 
         try:
             # Get the company associated with the user
-            company = Company.objects.get(user=user)
+            company = Company.objects.select_related('user').get(pk=user.company_id)
 
             # Log the successful access
-            logger.info(f"Company profile accessed - Company: {company.name} (ID: {company.id}), User: {user.email}")
+            logger.info('Company profile accessed - Company: %s (ID: %s), User: %s', company.name, company.id, user.email)
 
             # Return the company data
             serializer = self.get_serializer(company)
@@ -291,10 +308,46 @@ class CompanyViewSet(viewsets.ModelViewSet):
 
         except Company.DoesNotExist:
             # Log the error
-            logger.error(f"Company not found for user - User: {user.email} (ID: {user.id})")
+            logger.error('Company not found for user - User: %s (ID: %s)', user.email, user.id)
 
             # Return a user-friendly error response
             return Response(
                 {"detail": "No company profile found for your account. Please contact an administrator."},
                 status=status.HTTP_404_NOT_FOUND
             )
+
+    @action(detail=True, methods=['get'])
+    def farmers(self, request, pk=None):
+        """List the farmers mapped to a company, with the company's totals.
+
+        Pages are keyset paginated on ``(created_at, id)`` and can be narrowed
+        with ``?status=``; both are served by the ``(company, status,
+        created_at)`` index on farmer mappings. ``stats`` comes from the
+        precomputed per-company row, so the whole response costs three queries.
+        """
+        company = self.get_object()
+        user = request.user
+        if user.role != 'admin' and not (user.role == 'company' and company.user_id == user.id):
+            logger.warning('Company farmers access denied - User: %s, Company ID: %s', user.email, company.id)
+            return Response(
+                {"detail": "Access denied. You can only view farmers of your own company."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        mappings = FarmerMapping.objects.filter(company=company)
+        status_filter = request.query_params.get('status')
+        if status_filter:
+            mappings = mappings.filter(status=status_filter)
+        mappings = mappings.select_related('farmer').only(
+            'id', 'status', 'created_at', 'farmer_id',
+            *(f'farmer__{name}' for name in CompanyFarmerSerializer.farmer_columns)
+        )
+
+        paginator = CompanyFarmerPagination()
+        page = paginator.paginate_queryset(mappings, request, view=self)
+        response = paginator.get_paginated_response(CompanyFarmerSerializer(page, many=True).data)
+
+        stats = CompanyFarmerStats.objects.filter(company=company).first() or CompanyFarmerStats(company=company)
+        response.data['company'] = company.id
+        response.data['stats'] = CompanyFarmerStatsSerializer(stats).data
+        return response
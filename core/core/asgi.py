@@ -12,5 +12,11 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+# Serve logins from the async view so password hashing never holds a
+# request thread
+os.environ.setdefault('ASYNC_LOGIN', 'true')
+# Async requests do not reuse persistent connections reliably; use
+# DB_POOL_MAX_SIZE on PostgreSQL instead
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
@@ -0,0 +1,119 @@
+"""
+Non-blocking, structured logging.
+
+Request threads only put records on an in-memory queue; a ``QueueListener``
+thread formats them as JSON and writes them to the real handlers (files,
+console, admin mail). Records keep their ``msg`` and ``args`` until the
+listener formats them, so ``logger.debug('... %s', payload)`` costs nothing
+when debug logging is off and little more than a queue put when it is on.
+Arguments are rendered later, so do not mutate them after logging.
+
+Wire it up in ``settings.LOGGING`` with ``queue_handler`` as a handler
+factory, ``JsonFormatter`` as the target formatter and, optionally,
+``SamplingFilter`` on the queue handler.
+"""
+import atexit
+import datetime
+import json
+import logging
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener
+
+# LogRecord attributes that are not user supplied ``extra`` fields
+RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with any ``extra=`` fields as keys"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'process': record.process,
+            'thread': record.thread,
+        }
+        for key, value in record.__dict__.items():
+            if key not in RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry['stack'] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of the records below WARNING from chosen loggers.
+
+    ``rates`` maps a logger name to the fraction to keep; it also applies to
+    child loggers, and the most specific name wins. Warnings and errors are
+    never dropped.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = dict(rates or {})
+
+    def rate_for(self, name):
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition('.')[0]
+        return 1.0
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self.rate_for(record.name)
+        return rate >= 1 or random.random() < rate
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread. The stock
+    ``prepare()`` renders the message on the calling thread.
+    """
+
+    dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        # A full queue means the listener cannot keep up with the disk;
+        # losing records beats stalling requests
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def queue_handler(handlers, maxsize=10000):
+    """
+    ``logging.config.dictConfig`` factory for a ``LazyQueueHandler`` feeding
+    ``handlers``, given as ``cfg://handlers.<name>`` references. Starts the
+    listener thread and stops it, flushing the queue, at exit.
+
+    dictConfig builds handlers in name order, so the queue handler's name
+    must sort after the names of its targets.
+    """
+    targets = []
+    for index in range(len(handlers)):
+        # Indexing is what resolves the cfg:// reference
+        target = handlers[index]
+        if not isinstance(target, logging.Handler):
+            raise ValueError('Queue handler targets must be configured first; name them so they sort before it')
+        targets.append(target)
+
+    records = queue.Queue(maxsize)
+    handler = LazyQueueHandler(records)
+    handler.listener = QueueListener(records, *targets, respect_handler_level=True)
+    handler.listener.start()
+    atexit.register(handler.listener.stop)
+    return handler
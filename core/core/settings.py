@@ -11,6 +11,9 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+import django
+from django.core.exceptions import ImproperlyConfigured
+import json
 import os
 from datetime import timedelta
 
@@ -52,9 +55,13 @@ INSTALLED_APPS = [
     'api',
     'farmers',
     'farmer_mappings',
+    'jobs',
 ]
 
 MIDDLEWARE = [
+    # First, so its timings cover the rest of the stack
+    'api.metrics.MetricsMiddleware',
+    'api.db_router.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # CORS middleware
@@ -88,21 +95,69 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Connections are kept open for DB_CONN_MAX_AGE seconds and checked before
+# reuse, so requests skip the connect/auth round trips. On PostgreSQL (Django
+# 5.1+ with psycopg 3 and psycopg_pool installed), DB_POOL_MAX_SIZE > 0 uses a
+# connection pool instead; persistent connections are then turned off.
+DB_ENGINE = os.environ.get('DB_ENGINE', 'django.db.backends.mysql')
+DB_POOL_MIN_SIZE = int(os.environ.get('DB_POOL_MIN_SIZE', 2))
+DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', 0))
+
+if DB_ENGINE == 'django.db.backends.mysql':
+    DB_OPTIONS = {
+        'charset': 'utf8mb4',
+        'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
+    }
+else:
+    DB_OPTIONS = {}
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.mysql',
-        'NAME': 'farmerconnect',
-        'USER': 'root',
-        'PASSWORD': '1234',
-        'HOST': 'localhost',
-        'PORT': '3306',
-        'OPTIONS': {
-            'charset': 'utf8mb4',
-            'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
-        }
+        'ENGINE': DB_ENGINE,
+        'NAME': os.environ.get('DB_NAME', 'farmerconnect'),
+        'USER': os.environ.get('DB_USER', 'root'),
+        'PASSWORD': os.environ.get('DB_PASSWORD', '1234'),
+        'HOST': os.environ.get('DB_HOST', 'localhost'),
+        'PORT': os.environ.get('DB_PORT', '3306' if DB_ENGINE == 'django.db.backends.mysql' else '5432'),
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': DB_OPTIONS,
     }
 }
 
+if DB_POOL_MAX_SIZE:
+    if DB_ENGINE != 'django.db.backends.postgresql' or django.VERSION < (5, 1):
+        raise ImproperlyConfigured('DB_POOL_MAX_SIZE needs the PostgreSQL backend and Django 5.1 or later')
+    DB_OPTIONS['pool'] = {'min_size': DB_POOL_MIN_SIZE, 'max_size': DB_POOL_MAX_SIZE}
+    # The pool manages connection lifetime itself
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+
+# Read replica: DB_REPLICA_HOST (or DB_REPLICA_NAME, e.g. a second SQLite file
+# when testing locally) adds a 'replica' alias that serves safe-method reads;
+# see api/db_router.py. Views set read_replica = False to always read from the
+# primary. After a write, a client keeps reading from the primary for
+# REPLICA_PIN_SECONDS.
+DB_REPLICA_HOST = os.environ.get('DB_REPLICA_HOST')
+DB_REPLICA_NAME = os.environ.get('DB_REPLICA_NAME')
+if DB_REPLICA_HOST or DB_REPLICA_NAME:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': DB_REPLICA_HOST or DATABASES['default']['HOST'],
+        'NAME': DB_REPLICA_NAME or DATABASES['default']['NAME'],
+        'OPTIONS': dict(DB_OPTIONS),
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['api.db_router.ReplicaRouter']
+REPLICA_READS_DEFAULT = True
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', 5))
+
+# The farmer change feed (/api/farmers/changes/) only returns rows whose
+# updated_at is at least this old. It must be longer than the longest
+# transaction that writes farmers: a /api/farmers/sync/ batch of the largest
+# size clients send, or a sync job. Rows committed later than this behind a
+# client's cursor are never sent to that client.
+FARMER_CHANGES_SETTLE_SECONDS = int(os.environ.get('FARMER_CHANGES_SETTLE_SECONDS', 30))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -152,6 +207,68 @@ AUTH_USER_MODEL = 'users.User'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Resumable uploads: part files are kept outside MEDIA_ROOT so unfinished
+# uploads are never served
+FARMER_UPLOAD_TEMP_DIR = os.path.join(BASE_DIR, 'upload_parts')
+FARMER_UPLOAD_MAX_SIZE = 25 * 1024 * 1024
+
+# Processes rendering photo thumbnails; 0 renders inline after commit.
+# FARMER_IMAGE_JOBS renders them on the job workers instead (see below).
+FARMER_IMAGE_WORKERS = int(os.environ.get('FARMER_IMAGE_WORKERS', 2))
+FARMER_IMAGE_JOBS = os.environ.get('FARMER_IMAGE_JOBS', 'false').lower() == 'true'
+
+# Background jobs: run by `manage.py run_workers`. Failed attempts are retried
+# after JOB_RETRY_BASE_SECONDS, doubling up to JOB_RETRY_MAX_SECONDS; a job
+# running longer than JOB_LEASE_SECONDS is assumed lost and queued again.
+JOB_WORKER_THREADS = int(os.environ.get('JOB_WORKER_THREADS', 4))
+JOB_WORKER_PROCESSES = int(os.environ.get('JOB_WORKER_PROCESSES', 1))
+JOB_POLL_SECONDS = float(os.environ.get('JOB_POLL_SECONDS', 1.0))
+JOB_MAX_ATTEMPTS = 5
+JOB_RETRY_BASE_SECONDS = 10
+JOB_RETRY_MAX_SECONDS = 3600
+JOB_LEASE_SECONDS = 600
+JOB_RETENTION_DAYS = 7
+
+# Cache
+# Use a shared backend (e.g. django.core.cache.backends.redis.RedisCache) in
+# production so cache invalidation reaches every worker process.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'nobrac-default'),
+    }
+}
+
+# Seconds other worker processes may keep accepting revoked tokens when the
+# cache above is LocMemCache; a shared backend revokes them everywhere at once
+TOKEN_VERSION_LOCAL_CACHE_TIMEOUT = 5
+
+# Seconds an emissions summary response stays cached
+EMISSIONS_SUMMARY_CACHE_TIMEOUT = 300
+
+# Seconds a company list response stays cached
+COMPANY_LIST_CACHE_TIMEOUT = 300
+
+# Metrics: /metrics answers only these clients; slower requests are logged
+# with their SQL to api.metrics.slow. SLOW_REQUEST_LOG_PARAMS adds the query
+# parameters, which advise_indexes needs to EXPLAIN the statements; they can
+# hold personal data, so it is off by default.
+# Behind a reverse proxy every request comes from the proxy's address: list
+# the proxies in METRICS_TRUSTED_PROXIES so the client is read from
+# X-Forwarded-For. Forwarded requests from other peers are refused.
+# METRICS_TOKEN, if set, must also be sent as "Authorization: Bearer <token>".
+METRICS_ALLOWED_IPS = os.environ.get('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',')
+METRICS_TRUSTED_PROXIES = [ip for ip in os.environ.get('METRICS_TRUSTED_PROXIES', '').split(',') if ip]
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+SLOW_REQUEST_SECONDS = float(os.environ.get('SLOW_REQUEST_SECONDS', 1.0))
+SLOW_REQUEST_LOG_PARAMS = os.environ.get('SLOW_REQUEST_LOG_PARAMS', 'false').lower() == 'true'
+
+# Login: threads hashing passwords, and seconds an unknown email is remembered.
+# ASYNC_LOGIN serves /api/auth/login/ from an async view; core/asgi.py turns it on.
+LOGIN_HASH_WORKERS = int(os.environ.get('LOGIN_HASH_WORKERS', 4))
+LOGIN_UNKNOWN_EMAIL_CACHE_TIMEOUT = 60
+ASYNC_LOGIN = os.environ.get('ASYNC_LOGIN', 'false').lower() == 'true'
+
 # Authentication settings
 AUTHENTICATION_BACKENDS = [
     'django.contrib.auth.backends.ModelBackend',
@@ -159,7 +276,7 @@ AUTHENTICATION_BACKENDS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -215,20 +332,23 @@ LOGS_DIR = os.path.join(BASE_DIR.parent, 'logs')
 os.makedirs(LOGS_DIR, exist_ok=True)
 
 # Logging configuration
+# Logging: request threads only enqueue records; a listener thread per queue
+# writes them as JSON lines (see core/log.py). APP_LOG_LEVEL=DEBUG turns on the
+# per-request debug events, and LOG_SAMPLE_RATES (JSON, e.g.
+# '{"farmers.views": 0.05}') keeps only a fraction of a logger's
+# sub-warning records.
+APP_LOG_LEVEL = os.environ.get('APP_LOG_LEVEL', 'INFO')
+LOG_SAMPLE_RATES = json.loads(os.environ.get('LOG_SAMPLE_RATES', '{}'))
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
     'formatters': {
-        'verbose': {
-            'format': '{levelname} {asctime} {module} {process:d} {thread:d} {message}',
-            'style': '{',
+        'json': {
+            '()': 'core.log.JsonFormatter',
         },
         'simple': {
-            'format': '{levelname} {message}',
-            'style': '{',
-        },
-        'security': {
-            'format': 'SECURITY [{asctime}] {levelname}: {message}',
+            'format': '{levelname} {name} {message}',
             'style': '{',
         },
     },
@@ -239,46 +359,60 @@ LOGGING = {
         'require_debug_false': {
             '()': 'django.utils.log.RequireDebugFalse',
         },
+        'sample': {
+            '()': 'core.log.SamplingFilter',
+            'rates': LOG_SAMPLE_RATES,
+        },
     },
+    # Queue handlers must sort after the handlers they feed
     'handlers': {
         'console': {
-            'level': 'INFO',
+            'level': 'DEBUG',
             'filters': ['require_debug_true'],
             'class': 'logging.StreamHandler',
             'formatter': 'simple',
         },
         'file': {
-            'level': 'INFO',
+            'level': 'DEBUG',
             'class': 'logging.FileHandler',
             'filename': os.path.join(LOGS_DIR, 'django.log'),
-            'formatter': 'verbose',
+            'formatter': 'json',
         },
         'security_file': {
             'level': 'INFO',
             'class': 'logging.FileHandler',
             'filename': os.path.join(LOGS_DIR, 'security.log'),
-            'formatter': 'security',
+            'formatter': 'json',
         },
         'mail_admins': {
             'level': 'ERROR',
             'filters': ['require_debug_false'],
             'class': 'django.utils.log.AdminEmailHandler',
-            'formatter': 'verbose',
+        },
+        'queue': {
+            '()': 'core.log.queue_handler',
+            'handlers': ['cfg://handlers.console', 'cfg://handlers.file', 'cfg://handlers.mail_admins'],
+            'filters': ['sample'],
+        },
+        'security_queue': {
+            '()': 'core.log.queue_handler',
+            'handlers': ['cfg://handlers.console', 'cfg://handlers.security_file', 'cfg://handlers.mail_admins'],
+            'filters': ['sample'],
         },
     },
+    'root': {
+        'handlers': ['queue'],
+        'level': APP_LOG_LEVEL,
+    },
     'loggers': {
         'django': {
-            'handlers': ['console', 'file', 'mail_admins'],
             'level': 'INFO',
-            'propagate': True,
         },
         'django.request': {
-            'handlers': ['mail_admins', 'file'],
             'level': 'ERROR',
-            'propagate': False,
         },
         'security': {
-            'handlers': ['console', 'security_file', 'mail_admins'],
+            'handlers': ['security_queue'],
             'level': 'INFO',
             'propagate': False,
         },
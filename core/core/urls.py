@@ -25,6 +25,8 @@ from users.views import UserViewSet
 from companies.views import CompanyViewSet
 from farmer_mappings.views import FarmerMappingViewSet
 from volunteers.views import VolunteerViewSet
+from jobs.views import JobViewSet
+from api.views import metrics
 
 router = DefaultRouter()
 router.register(r'users', UserViewSet)
@@ -33,9 +35,11 @@ router.register(r'users', UserViewSet)
 router.register(r'companies', CompanyViewSet)
 router.register(r'farmer-mappings', FarmerMappingViewSet)
 router.register(r'volunteers', VolunteerViewSet)
+router.register(r'jobs', JobViewSet, basename='job')
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics, name='metrics'),
     path('api/auth/', include('api.auth_urls')), # Auth URLs
     path('api/farmers/', include('farmers.urls')), # Include farmer app URLs
     path('api/', include(router.urls)), # General API routes from the main router (users, companies, etc.)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import FarmerMapping
+from .models import FarmerMapping, CompanyFarmerStats
 
 @admin.register(FarmerMapping)
 class FarmerMappingAdmin(admin.ModelAdmin):
@@ -22,3 +22,10 @@ class FarmerMappingAdmin(admin.ModelAdmin):
         if obj:  # Editing an existing object
             return self.readonly_fields + ('farmer', 'company')
         return self.readonly_fields
+
+
+@admin.register(CompanyFarmerStats)
+class CompanyFarmerStatsAdmin(admin.ModelAdmin):
+    list_display = ('company', 'active_count', 'pending_count', 'total_acreage', 'total_co2_emissions', 'updated_at')
+    readonly_fields = ('company', 'active_count', 'inactive_count', 'pending_count', 'rejected_count',
+                       'total_acreage', 'total_co2_emissions', 'updated_at')
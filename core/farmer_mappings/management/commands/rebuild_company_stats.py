@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from farmer_mappings.stats import rebuild_company_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute per-company farmer counts, acreage and emissions from the mappings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('company_ids', nargs='*', type=int,
+                            help='Only rebuild these companies')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuilt = rebuild_company_stats(options['company_ids'] or None)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt stats for {rebuilt} companies'))
@@ -0,0 +1,63 @@
+# Generated by Django 5.0.2 on 2026-10-17 17:35
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def build_company_stats(apps, schema_editor):
+    Company = apps.get_model('companies', 'Company')
+    FarmerMapping = apps.get_model('farmer_mappings', 'FarmerMapping')
+    CompanyFarmerStats = apps.get_model('farmer_mappings', 'CompanyFarmerStats')
+
+    stats = {company_id: CompanyFarmerStats(company_id=company_id) for company_id in Company.objects.values_list('id', flat=True)}
+    rows = FarmerMapping.objects.order_by().values('company_id', 'status').annotate(
+        count=Count('id'), acreage=Sum('farmer__acreage'), emissions=Sum('farmer__total_co2_emissions')
+    )
+    for row in rows:
+        row_stats = stats[row['company_id']]
+        setattr(row_stats, f"{row['status']}_count", row['count'])
+        row_stats.total_acreage += row['acreage'] or Decimal('0')
+        row_stats.total_co2_emissions += row['emissions'] or Decimal('0')
+    CompanyFarmerStats.objects.bulk_create(stats.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0001_initial'),
+        ('farmer_mappings', '0001_initial'),
+        ('farmers', '0008_media_blobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompanyFarmerStats',
+            fields=[
+                ('company', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='farmer_stats', serialize=False, to='companies.company')),
+                ('active_count', models.PositiveIntegerField(default=0)),
+                ('inactive_count', models.PositiveIntegerField(default=0)),
+                ('pending_count', models.PositiveIntegerField(default=0)),
+                ('rejected_count', models.PositiveIntegerField(default=0)),
+                ('total_acreage', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=18)),
+                ('total_co2_emissions', models.DecimalField(decimal_places=6, default=Decimal('0'), max_digits=24)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Company Farmer Stats',
+                'verbose_name_plural': 'Company Farmer Stats',
+                'db_table': 'company_farmer_stats',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='farmermapping',
+            index=models.Index(fields=['company', 'status', 'created_at'], name='farmer_mapp_company_7cc337_idx'),
+        ),
+        # After the composite index exists, so MySQL keeps an index for the FK
+        migrations.RemoveIndex(
+            model_name='farmermapping',
+            name='farmer_mapp_company_fcfdb8_idx',
+        ),
+        migrations.RunPython(build_company_stats, migrations.RunPython.noop),
+    ]
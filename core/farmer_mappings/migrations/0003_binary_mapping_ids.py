@@ -0,0 +1,35 @@
+# Generated by Django 5.0.2 on 2026-10-17 19:30
+
+import api.fields
+from django.db import migrations
+
+
+def pack_ids(apps, schema_editor):
+    """
+    MySQL stores UUIDField as char(32) hex; turn it into the 16 raw bytes
+    BinaryUUIDField reads before AlterField retypes the column. Other
+    backends already store mapping ids the way BinaryUUIDField does.
+    """
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    FarmerMapping = apps.get_model('farmer_mappings', 'FarmerMapping')
+    table = schema_editor.quote_name(FarmerMapping._meta.db_table)
+    schema_editor.execute(f'ALTER TABLE {table} MODIFY `id` varbinary(32) NOT NULL')
+    schema_editor.execute(f'UPDATE {table} SET `id` = UNHEX(`id`)')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farmer_mappings', '0002_company_farmer_stats'),
+        ('farmers', '0016_farmer_binary_ids'),
+    ]
+
+    operations = [
+        migrations.RunPython(pack_ids),
+        migrations.AlterField(
+            model_name='farmermapping',
+            name='id',
+            field=api.fields.BinaryUUIDField(default=api.fields.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.2 on 2026-10-17 18:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0001_initial'),
+        ('farmer_mappings', '0003_binary_mapping_ids'),
+        ('farmers', '0017_farmer_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='farmermapping',
+            name='farmer_mapp_farmer__f67f51_idx',
+        ),
+        migrations.AlterField(
+            model_name='farmermapping',
+            name='company',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='farmer_mappings', to='companies.company'),
+        ),
+        migrations.AlterField(
+            model_name='farmermapping',
+            name='farmer',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='company_mappings', to='farmers.farmer'),
+        ),
+    ]
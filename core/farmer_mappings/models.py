@@ -1,8 +1,12 @@
 from django.db import models
-import uuid
 from farmers.models import Farmer
+from api.fields import BinaryUUIDField, uuid7
 from companies.models import Company
 from django.utils import timezone
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from farmers.emissions import invalidate_summary_cache
+from decimal import Decimal
 
 class FarmerMapping(models.Model):
     """
@@ -15,9 +19,11 @@ class FarmerMapping(models.Model):
         ('rejected', 'Rejected'),
     ]
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    farmer = models.ForeignKey(Farmer, on_delete=models.CASCADE, related_name='company_mappings')
-    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='farmer_mappings')
+    id = BinaryUUIDField(primary_key=True, default=uuid7, editable=False)
+    # The (farmer, company) unique index serves lookups by farmer
+    farmer = models.ForeignKey(Farmer, on_delete=models.CASCADE, related_name='company_mappings', db_index=False)
+    # Served by the (company, status, created_at) index below
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='farmer_mappings', db_index=False)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     notes = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -28,8 +34,9 @@ class FarmerMapping(models.Model):
         ordering = ['-created_at']
         unique_together = ['farmer', 'company']
         indexes = [
-            models.Index(fields=['farmer']),
-            models.Index(fields=['company']),
+            # Serves company portfolio pages filtered by status and ordered
+            # by created_at; also covers lookups on company alone
+            models.Index(fields=['company', 'status', 'created_at']),
             models.Index(fields=['status']),
         ]
         verbose_name = 'Farmer-Company Mapping'
@@ -42,3 +49,103 @@ class FarmerMapping(models.Model):
         # Update the updated_at timestamp
         self.updated_at = timezone.now()
         super().save(*args, **kwargs)
+
+
+@receiver(post_save, sender=FarmerMapping)
+@receiver(post_delete, sender=FarmerMapping)
+def invalidate_company_summaries(sender, instance, **kwargs):
+    """Signal to drop cached per-company emission rollups when mappings change"""
+    invalidate_summary_cache()
+
+
+class CompanyFarmerStats(models.Model):
+    """
+    Running totals of the farmers mapped to a company. Kept up to date
+    incrementally by the signals below and by the bulk write paths; rebuild
+    with ``manage.py rebuild_company_stats``.
+    """
+    company = models.OneToOneField(Company, on_delete=models.CASCADE, primary_key=True, related_name='farmer_stats')
+    active_count = models.PositiveIntegerField(default=0)
+    inactive_count = models.PositiveIntegerField(default=0)
+    pending_count = models.PositiveIntegerField(default=0)
+    rejected_count = models.PositiveIntegerField(default=0)
+    total_acreage = models.DecimalField(max_digits=18, decimal_places=2, default=Decimal('0'))
+    total_co2_emissions = models.DecimalField(max_digits=24, decimal_places=6, default=Decimal('0'))
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'company_farmer_stats'
+        verbose_name = 'Company Farmer Stats'
+        verbose_name_plural = 'Company Farmer Stats'
+
+    def __str__(self):
+        return f"Stats for company {self.company_id}"
+
+    @property
+    def farmer_count(self):
+        return self.active_count + self.inactive_count + self.pending_count + self.rejected_count
+
+
+@receiver(post_save, sender=Company)
+def create_company_stats(sender, instance, created, **kwargs):
+    """Signal to start an empty stats row for a new company"""
+    if created:
+        CompanyFarmerStats.objects.get_or_create(company=instance)
+
+
+@receiver(post_init, sender=FarmerMapping)
+def remember_mapping_status(sender, instance, **kwargs):
+    """Signal to remember the status, company and farmer a mapping had when loaded"""
+    instance._loaded_status = instance.__dict__.get('status')
+    instance._loaded_company_id = instance.__dict__.get('company_id')
+    instance._loaded_farmer_id = instance.__dict__.get('farmer_id')
+
+
+@receiver(post_save, sender=FarmerMapping)
+def count_saved_mapping(sender, instance, created, **kwargs):
+    """Signal to update company stats when a mapping is created, changes status or is reassigned"""
+    from .stats import adjust_company_stats, farmer_totals
+
+    if created:
+        acreage, emissions = farmer_totals(instance.farmer)
+        adjust_company_stats(instance.company_id, {instance.status: 1}, acreage, emissions)
+    elif instance._loaded_status is not None and (
+        instance._loaded_company_id != instance.company_id or instance._loaded_farmer_id != instance.farmer_id
+    ):
+        # Moved to another company or farmer: take it out of the old totals
+        old_farmer = Farmer.objects.filter(pk=instance._loaded_farmer_id).first()
+        old_acreage, old_emissions = farmer_totals(old_farmer) if old_farmer else (Decimal('0'), Decimal('0'))
+        adjust_company_stats(instance._loaded_company_id, {instance._loaded_status: -1}, -old_acreage, -old_emissions)
+        acreage, emissions = farmer_totals(instance.farmer)
+        adjust_company_stats(instance.company_id, {instance.status: 1}, acreage, emissions)
+    elif instance._loaded_status is not None and instance._loaded_status != instance.status:
+        adjust_company_stats(instance.company_id, {instance._loaded_status: -1, instance.status: 1})
+    instance._loaded_status = instance.status
+    instance._loaded_company_id = instance.company_id
+    instance._loaded_farmer_id = instance.farmer_id
+
+
+@receiver(post_delete, sender=FarmerMapping)
+def count_deleted_mapping(sender, instance, **kwargs):
+    """Signal to update company stats when a mapping is deleted"""
+    from .stats import adjust_company_stats, farmer_totals
+
+    acreage, emissions = farmer_totals(instance.farmer)
+    adjust_company_stats(instance.company_id, {instance._loaded_status or instance.status: -1}, -acreage, -emissions)
+
+
+@receiver(post_init, sender=Farmer)
+def remember_farmer_totals(sender, instance, **kwargs):
+    """Signal to remember the acreage and emissions a farmer had when loaded"""
+    from .stats import snapshot_farmer
+
+    snapshot_farmer(instance)
+
+
+@receiver(post_save, sender=Farmer)
+def count_saved_farmer(sender, instance, created, **kwargs):
+    """Signal to move company totals when a mapped farmer's acreage or emissions change"""
+    from .stats import apply_farmer_deltas, farmer_deltas
+
+    if not created:
+        apply_farmer_deltas(farmer_deltas([instance]))
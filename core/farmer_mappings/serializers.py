@@ -1,18 +1,30 @@
 from rest_framework import serializers
-from .models import FarmerMapping
+from .models import FarmerMapping, CompanyFarmerStats
 from farmers.serializer import FarmerSerializer
 from companies.serializers import CompanySerializer
 
 class FarmerMappingSerializer(serializers.ModelSerializer):
-    farmer_details = FarmerSerializer(source='farmer', read_only=True)
-    company_details = CompanySerializer(source='company', read_only=True)
+    """
+    Compact mapping representation. Pass ``expand=('farmer', 'company')`` to
+    nest the full farmer and/or company records.
+    """
+    farmer_name = serializers.CharField(source='farmer.farmer_name', read_only=True)
+    company_name = serializers.CharField(source='company.name', read_only=True)
 
     class Meta:
         model = FarmerMapping
-        fields = ['id', 'farmer', 'farmer_details', 'company', 'company_details', 
+        fields = ['id', 'farmer', 'farmer_name', 'company', 'company_name',
                  'status', 'notes', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
 
+    def __init__(self, *args, **kwargs):
+        expand = kwargs.pop('expand', ())
+        super().__init__(*args, **kwargs)
+        if 'farmer' in expand:
+            self.fields['farmer_details'] = FarmerSerializer(source='farmer', read_only=True)
+        if 'company' in expand:
+            self.fields['company_details'] = CompanySerializer(source='company', read_only=True)
+
     def validate(self, data):
         """
         Validate that the farmer and company combination is unique
@@ -38,4 +50,37 @@ class BulkFarmerMappingSerializer(serializers.Serializer):
         choices=FarmerMapping._meta.get_field('status').choices,
         default='pending'
     )
-    notes = serializers.CharField(required=False, allow_blank=True) 
\ No newline at end of file
+    notes = serializers.CharField(required=False, allow_blank=True) 
+
+
+class CompanyFarmerSerializer(serializers.ModelSerializer):
+    """
+    One row of a company's farmer portfolio: the mapping plus a summary of
+    the farmer.
+    """
+    mapping_id = serializers.UUIDField(source='id', read_only=True)
+    farmer_id = serializers.CharField(source='farmer.id', read_only=True)
+    farmer_name = serializers.CharField(source='farmer.farmer_name', read_only=True)
+    mobile = serializers.CharField(source='farmer.mobile', read_only=True)
+    village = serializers.CharField(source='farmer.village', read_only=True)
+    district = serializers.CharField(source='farmer.district', read_only=True)
+    state = serializers.CharField(source='farmer.state', read_only=True)
+    acreage = serializers.DecimalField(source='farmer.acreage', max_digits=10, decimal_places=2, read_only=True)
+    total_co2_emissions = serializers.DecimalField(source='farmer.total_co2_emissions', max_digits=18, decimal_places=6, read_only=True)
+
+    # Farmer columns read above, for only()
+    farmer_columns = ('id', 'farmer_name', 'mobile', 'village', 'district', 'state', 'acreage', 'total_co2_emissions')
+
+    class Meta:
+        model = FarmerMapping
+        fields = ['mapping_id', 'farmer_id', 'farmer_name', 'mobile', 'village', 'district', 'state',
+                  'acreage', 'total_co2_emissions', 'status', 'created_at']
+
+
+class CompanyFarmerStatsSerializer(serializers.ModelSerializer):
+    farmer_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = CompanyFarmerStats
+        fields = ['farmer_count', 'active_count', 'inactive_count', 'pending_count', 'rejected_count',
+                  'total_acreage', 'total_co2_emissions', 'updated_at']
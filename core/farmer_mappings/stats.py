@@ -0,0 +1,98 @@
+"""
+Incremental maintenance of ``CompanyFarmerStats``.
+
+Each change is applied as a single ``UPDATE ... SET col = col + delta`` on the
+company row, so concurrent writers never overwrite each other's totals.
+"""
+from collections import defaultdict
+from decimal import Decimal
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+from .models import CompanyFarmerStats, FarmerMapping
+
+STATUS_COLUMNS = {status: f'{status}_count' for status, _ in FarmerMapping.STATUS_CHOICES}
+ZERO = Decimal('0')
+
+
+def farmer_totals(farmer):
+    """The ``(acreage, emissions)`` a farmer adds to each company it is mapped to"""
+    return farmer.acreage or ZERO, farmer.total_co2_emissions or ZERO
+
+
+def snapshot_farmer(farmer):
+    """Remember a farmer's current totals, when both columns are loaded"""
+    if 'acreage' in farmer.__dict__ and 'total_co2_emissions' in farmer.__dict__:
+        farmer._stats_totals = farmer_totals(farmer)
+    else:
+        farmer._stats_totals = None
+
+
+def farmer_deltas(farmers):
+    """
+    Return ``{farmer_id: (acreage delta, emissions delta)}`` since each
+    farmer's last snapshot and take a new snapshot.
+    """
+    deltas = {}
+    for farmer in farmers:
+        previous = getattr(farmer, '_stats_totals', None)
+        snapshot_farmer(farmer)
+        if previous is None or farmer._stats_totals is None:
+            continue
+        acreage = farmer._stats_totals[0] - previous[0]
+        emissions = farmer._stats_totals[1] - previous[1]
+        if acreage or emissions:
+            deltas[farmer.pk] = (acreage, emissions)
+    return deltas
+
+
+def adjust_company_stats(company_id, status_counts=None, acreage=ZERO, emissions=ZERO):
+    """Add counts and totals to one company's stats row"""
+    updates = {
+        STATUS_COLUMNS[status]: F(STATUS_COLUMNS[status]) + count
+        for status, count in (status_counts or {}).items() if count
+    }
+    if acreage:
+        updates['total_acreage'] = F('total_acreage') + acreage
+    if emissions:
+        updates['total_co2_emissions'] = F('total_co2_emissions') + emissions
+    if updates:
+        CompanyFarmerStats.objects.filter(company_id=company_id).update(updated_at=timezone.now(), **updates)
+
+
+def apply_farmer_deltas(deltas):
+    """Apply farmer acreage/emission changes to every company they are mapped to"""
+    if not deltas:
+        return
+    per_company = defaultdict(lambda: [ZERO, ZERO])
+    mappings = FarmerMapping.objects.filter(farmer_id__in=list(deltas)).values_list('farmer_id', 'company_id')
+    for farmer_id, company_id in mappings:
+        per_company[company_id][0] += deltas[farmer_id][0]
+        per_company[company_id][1] += deltas[farmer_id][1]
+    for company_id, (acreage, emissions) in per_company.items():
+        adjust_company_stats(company_id, acreage=acreage, emissions=emissions)
+
+
+def rebuild_company_stats(company_ids=None):
+    """Recompute stats rows from the mappings, for all companies or some"""
+    from companies.models import Company
+
+    companies = Company.objects.all()
+    mappings = FarmerMapping.objects.order_by()
+    if company_ids is not None:
+        companies = companies.filter(id__in=company_ids)
+        mappings = mappings.filter(company_id__in=company_ids)
+
+    stats = {company_id: CompanyFarmerStats(company_id=company_id) for company_id in companies.values_list('id', flat=True)}
+    for row in mappings.values('company_id', 'status').annotate(
+        count=Count('id'), acreage=Sum('farmer__acreage'), emissions=Sum('farmer__total_co2_emissions')
+    ):
+        row_stats = stats.get(row['company_id'])
+        if row_stats is None:
+            continue
+        setattr(row_stats, STATUS_COLUMNS[row['status']], row['count'])
+        row_stats.total_acreage += row['acreage'] or ZERO
+        row_stats.total_co2_emissions += row['emissions'] or ZERO
+
+    CompanyFarmerStats.objects.filter(company_id__in=list(stats)).delete()
+    CompanyFarmerStats.objects.bulk_create(stats.values())
+    return len(stats)
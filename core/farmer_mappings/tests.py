@@ -1,3 +1,81 @@
+from decimal import Decimal
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APIClient
+from companies.models import Company
+from farmers.models import Farmer
+from .models import CompanyFarmerStats, FarmerMapping
 
-# Create your tests here.
+
+class FarmerMappingListQueryTests(TestCase):
+    """A page of mappings costs the same number of queries at any page size"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_user(email='admin@example.com', password='pw', role='admin')
+        company = Company.objects.create(name='Acme', email='acme@example.com')
+        for index in range(25):
+            farmer = Farmer.objects.create(farmer_name=f'Farmer {index}', village='Kondapur', crop_name='rice')
+            FarmerMapping.objects.create(farmer=farmer, company=company, status='active')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def get_page(self, queries, page_size, expand=None):
+        params = {'page_size': page_size}
+        if expand:
+            params['expand'] = expand
+        with self.assertNumQueries(queries):
+            response = self.client.get('/api/farmer-mappings/', params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), page_size)
+        return response.data['results']
+
+    def test_compact_page(self):
+        for page_size in (5, 20):
+            rows = self.get_page(1, page_size)
+            self.assertEqual(rows[0]['company_name'], 'Acme')
+            self.assertTrue(rows[0]['farmer_name'].startswith('Farmer'))
+
+    def test_expanded_page(self):
+        # One query for the page, one for the farmers' photo renditions
+        for page_size in (5, 20):
+            rows = self.get_page(2, page_size, expand='farmer,company')
+            self.assertEqual(rows[0]['farmer_details']['crop_name'], 'rice')
+            self.assertEqual(rows[0]['company_details']['user_email'], 'acme@example.com')
+
+
+class CompanyFarmerStatsTests(TestCase):
+    """Mapping writes keep each company's counts and totals in step"""
+
+    def setUp(self):
+        self.acme = Company.objects.create(name='Acme', email='acme@example.com')
+        self.globex = Company.objects.create(name='Globex', email='globex@example.com')
+        # 100 kg of organic fertilizer at 0.6 kg CO2e per kg
+        self.farmer = Farmer.objects.create(farmer_name='Asha', acreage=Decimal('2.50'),
+                                            fertilizer_type='organic', application_rate='100')
+        self.other = Farmer.objects.create(farmer_name='Ravi', acreage=Decimal('1.00'))
+
+    def assertStats(self, company, active, acreage, emissions, pending=0):
+        stats = CompanyFarmerStats.objects.get(company=company)
+        self.assertEqual((stats.active_count, stats.pending_count), (active, pending))
+        self.assertEqual(stats.total_acreage, Decimal(acreage))
+        self.assertEqual(stats.total_co2_emissions, Decimal(emissions))
+
+    def test_reassigning_company_moves_the_mapping(self):
+        mapping = FarmerMapping.objects.create(farmer=self.farmer, company=self.acme, status='active')
+        self.assertStats(self.acme, 1, '2.50', '0.06')
+
+        mapping = FarmerMapping.objects.get(pk=mapping.pk)
+        mapping.company = self.globex
+        mapping.status = 'pending'
+        mapping.save()
+        self.assertStats(self.acme, 0, '0', '0')
+        self.assertStats(self.globex, 0, '2.50', '0.06', pending=1)
+
+    def test_reassigning_farmer_moves_the_totals(self):
+        mapping = FarmerMapping.objects.create(farmer=self.farmer, company=self.acme, status='active')
+        mapping.farmer = self.other
+        mapping.save()
+        self.assertStats(self.acme, 1, '1.00', '0')
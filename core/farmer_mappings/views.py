@@ -5,10 +5,19 @@ from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from .models import FarmerMapping
 from .serializers import FarmerMappingSerializer, BulkFarmerMappingSerializer
-from farmers.models import Farmer
+from farmers.models import Farmer, farmer_pk
+from farmers.sections import SECTIONS, SECTION_OF, section_lookup
 from companies.models import Company
+from companies.serializers import CompanySerializer
+from api.pagination import KeysetPagination
 from rest_framework.permissions import IsAuthenticated
-from django.db import IntegrityError
+from django.db import transaction
+from farmers.emissions import invalidate_summary_cache
+from .stats import adjust_company_stats, farmer_totals
+from decimal import Decimal
+
+# Rows inserted per INSERT statement by bulk_create
+BULK_CREATE_BATCH_SIZE = 1000
 
 class FarmerMappingViewSet(viewsets.ModelViewSet):
     """
@@ -17,6 +26,46 @@ class FarmerMappingViewSet(viewsets.ModelViewSet):
     queryset = FarmerMapping.objects.all()
     serializer_class = FarmerMappingSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    # Nested records available through ?expand=
+    expansions = ('farmer', 'company')
+
+    def get_expand(self):
+        """Return the set of relations requested through ``?expand=`` on reads"""
+        if self.request.method not in ('GET', 'HEAD'):
+            return set()
+        expand = self.request.query_params.get('expand', '')
+        return {name.strip() for name in expand.split(',')} & set(self.expansions)
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('expand', self.get_expand())
+        return super().get_serializer(*args, **kwargs)
+
+    def get_keyset_ordering(self):
+        return ('-created_at', '-id')
+
+    def project(self, queryset):
+        """
+        Join the farmer and company in the same query and load only the
+        columns the serializer reads, so a page costs one query (plus one for
+        farmer thumbnails when farmers are expanded).
+        """
+        expand = self.get_expand()
+        columns = [field.name for field in FarmerMapping._meta.concrete_fields]
+        columns += ['farmer__farmer_name', 'company__name']
+        queryset = queryset.select_related('farmer', 'company')
+        if 'farmer' in expand:
+            columns += [f'farmer__{field.name}' for field in Farmer._meta.concrete_fields]
+            columns += [section_lookup(field, prefix='farmer__') for field in SECTION_OF]
+            queryset = queryset.select_related(*(f'farmer__{section}' for section in SECTIONS))
+            queryset = queryset.prefetch_related('farmer__renditions')
+        if 'company' in expand:
+            columns += [f'company__{name}' for name in CompanySerializer.Meta.fields if name not in ('user_email', 'user_id')]
+            columns += ['company__user__id', 'company__user__email']
+            queryset = queryset.select_related('company__user')
+        if self.request.method not in ('GET', 'HEAD'):
+            return queryset
+        return queryset.only(*columns)
 
     def get_queryset(self):
         """
@@ -28,13 +77,13 @@ class FarmerMappingViewSet(viewsets.ModelViewSet):
         status = self.request.query_params.get('status', None)
 
         if farmer_id:
-            queryset = queryset.filter(farmer_id=farmer_id)
+            queryset = queryset.filter(farmer_id=farmer_pk(farmer_id))
         if company_id:
             queryset = queryset.filter(company_id=company_id)
         if status:
             queryset = queryset.filter(status=status)
 
-        return queryset
+        return self.project(queryset)
 
     @action(detail=False, methods=['post'])
     def bulk_create(self, request):
@@ -51,48 +100,76 @@ class FarmerMappingViewSet(viewsets.ModelViewSet):
             # Get the company
             company = get_object_or_404(Company, id=company_id)
 
+            # Valid farmers and the pairs that already exist, one query each
+            # Ids that match no farmer are reported as failed
+            farmers = Farmer.objects.only('id', 'farmer_name', 'acreage', 'total_co2_emissions').in_bulk(
+                {farmer_pk(farmer_id) for farmer_id in farmer_ids} - {None}
+            )
+            existing = dict(
+                FarmerMapping.objects.filter(company=company, farmer_id__in=list(farmers))
+                .values_list('farmer_id', 'status')
+            )
+
             # Create mappings
             created_mappings = []
             duplicate_mappings = []
             failed_mappings = []
 
             for farmer_id in farmer_ids:
-                try:
-                    farmer = get_object_or_404(Farmer, id=farmer_id)
-                    
-                    # Check if mapping already exists
-                    existing_mapping = FarmerMapping.objects.filter(
-                        farmer=farmer,
-                        company=company
-                    ).first()
-                    
-                    if existing_mapping:
-                        duplicate_mappings.append({
-                            'farmer_id': farmer_id,
-                            'farmer_name': farmer.farmer_name,
-                            'existing_status': existing_mapping.status
-                        })
-                        continue
-
-                    # Create new mapping
-                    mapping = FarmerMapping.objects.create(
+                farmer = farmers.get(farmer_pk(farmer_id))
+                if farmer is None:
+                    failed_mappings.append({
+                        'farmer_id': farmer_id,
+                        'error': 'No Farmer matches the given query.'
+                    })
+                elif farmer.id in existing:
+                    duplicate_mappings.append({
+                        'farmer_id': farmer_id,
+                        'farmer_name': farmer.farmer_name,
+                        'existing_status': existing[farmer.id]
+                    })
+                else:
+                    created_mappings.append(FarmerMapping(
                         farmer=farmer,
                         company=company,
                         status=status_value,
                         notes=notes
+                    ))
+                    # A repeated id in the same request is a duplicate
+                    existing[farmer.id] = status_value
+
+            with transaction.atomic():
+                for start in range(0, len(created_mappings), BULK_CREATE_BATCH_SIZE):
+                    FarmerMapping.objects.bulk_create(
+                        created_mappings[start:start + BULK_CREATE_BATCH_SIZE],
+                        ignore_conflicts=True
                     )
-                    created_mappings.append(mapping)
-                except IntegrityError:
+                # ignore_conflicts hides rows skipped because a concurrent
+                # request created the same pair, so check which ids landed
+                inserted = set()
+                for start in range(0, len(created_mappings), BULK_CREATE_BATCH_SIZE):
+                    inserted.update(FarmerMapping.objects.filter(
+                        id__in=[mapping.id for mapping in created_mappings[start:start + BULK_CREATE_BATCH_SIZE]]
+                    ).values_list('id', flat=True))
+                # bulk_create sends no post_save signals
+                landed = [mapping for mapping in created_mappings if mapping.id in inserted]
+                totals = [farmer_totals(mapping.farmer) for mapping in landed]
+                adjust_company_stats(
+                    company.id,
+                    {status_value: len(landed)},
+                    sum((acreage for acreage, _ in totals), Decimal('0')),
+                    sum((emissions for _, emissions in totals), Decimal('0'))
+                )
+                transaction.on_commit(invalidate_summary_cache)
+
+            for mapping in created_mappings:
+                if mapping.id not in inserted:
                     duplicate_mappings.append({
-                        'farmer_id': farmer_id,
-                        'farmer_name': farmer.farmer_name if 'farmer' in locals() else 'Unknown',
+                        'farmer_id': mapping.farmer_id,
+                        'farmer_name': mapping.farmer.farmer_name,
                         'error': 'Mapping already exists'
                     })
-                except Exception as e:
-                    failed_mappings.append({
-                        'farmer_id': farmer_id,
-                        'error': str(e)
-                    })
+            created_mappings = [mapping for mapping in created_mappings if mapping.id in inserted]
 
             # Prepare response data
             response_data = {
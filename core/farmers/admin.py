@@ -1,22 +1,18 @@
 from django.contrib import admin
-from .models import Farmer
+from .models import Farmer, FarmerProfile, FarmerCrop, FarmerInputs, FarmerMedia, UnparsedQuantity, EMISSION_FIELDS
 
-@admin.register(Farmer)
-class FarmerAdmin(admin.ModelAdmin):
-    list_display = ('farmer_name', 'mobile', 'village', 'district', 'state', 'created_at', 'sync_status')
-    list_filter = ('sync_status', 'district', 'state', 'gender')
-    search_fields = ('farmer_name', 'mobile', 'govt_id', 'village', 'district')
-    readonly_fields = ('id', 'created_at', 'updated_at')
-    
+
+class FarmerSectionInline(admin.StackedInline):
+    can_delete = False
+    extra = 1
+    max_num = 1
+
+
+class FarmerProfileInline(FarmerSectionInline):
+    model = FarmerProfile
     fieldsets = (
-        ('Basic Information', {
-            'fields': ('farmer_name', 'spouse_name', 'gender', 'mobile', 'alt_mobile', 'govt_id')
-        }),
-        ('Location', {
-            'fields': ('village', 'mandal', 'district', 'state', 'pincode')
-        }),
         ('Land Information', {
-            'fields': ('acreage', 'land_status', 'product_ids')
+            'fields': ('land_status', 'product_ids')
         }),
         ('Organization', {
             'fields': ('has_organization', 'fpo_name', 'fpg_name', 'fpg_id')
@@ -25,6 +21,12 @@ class FarmerAdmin(admin.ModelAdmin):
             'fields': ('category', 'literacy', 'children', 'livelihood', 'annual_income', 
                       'other_source_income', 'total_income')
         }),
+    )
+
+
+class FarmerCropInline(FarmerSectionInline):
+    model = FarmerCrop
+    fieldsets = (
         ('Crop Information', {
             'fields': ('crop_name', 'crop_area', 'crop_area_unit', 'yield_produced', 
                       'yield_unit', 'cropping_season', 'cropping_pattern', 
@@ -33,6 +35,12 @@ class FarmerAdmin(admin.ModelAdmin):
         ('Soil Characteristics', {
             'fields': ('soil_type', 'soil_ph', 'ec', 'ec_unit', 'organic_carbon', 'organic_carbon_unit')
         }),
+    )
+
+
+class FarmerInputsInline(FarmerSectionInline):
+    model = FarmerInputs
+    fieldsets = (
         ('Fertilizer', {
             'fields': ('fertilizer_type', 'application_rate', 'application_rate_unit')
         }),
@@ -50,11 +58,55 @@ class FarmerAdmin(admin.ModelAdmin):
             'fields': ('transport_activity_type', 'transport_mode', 'distance', 
                       'distance_unit', 'fuel_type', 'fuel_consumption', 'fuel_consumption_unit')
         }),
+    )
+
+
+class FarmerMediaInline(FarmerSectionInline):
+    model = FarmerMedia
+    fieldsets = (
         ('Media', {
             'fields': ('farmer_photo', 'land_photo_1', 'land_photo_2', 'land_photo_3', 
                       'land_photo_4', 'soil_characteristics', 'fertilizer_photos', 
                       'crop_protection_photos')
         }),
+    )
+
+
+class UnparsedQuantityInline(admin.TabularInline):
+    """Legacy text kept by migration 0010; delete a row once the value is fixed"""
+    model = UnparsedQuantity
+    extra = 0
+    fields = ('field', 'raw_value', 'created_at')
+    readonly_fields = fields
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Farmer)
+class FarmerAdmin(admin.ModelAdmin):
+    list_display = ('farmer_name', 'mobile', 'village', 'district', 'state', 'created_at', 'sync_status')
+    list_filter = ('sync_status', 'district', 'state', 'gender')
+    search_fields = ('farmer_name', 'mobile', 'govt_id', 'village', 'district')
+    inlines = (FarmerProfileInline, FarmerCropInline, FarmerInputsInline, FarmerMediaInline, UnparsedQuantityInline)
+    readonly_fields = ('id', 'created_at', 'updated_at', 'fertilizer_co2_emissions', 'pesticide_co2_emissions',
+                       'energy_co2_emissions', 'irrigation_co2_emissions', 'total_co2_emissions')
+    
+    fieldsets = (
+        ('Basic Information', {
+            'fields': ('farmer_name', 'spouse_name', 'gender', 'mobile', 'alt_mobile', 'govt_id')
+        }),
+        ('Location', {
+            'fields': ('village', 'mandal', 'district', 'state', 'pincode')
+        }),
+        ('Land Information', {
+            'fields': ('acreage',)
+        }),
+        ('CO2 Emissions', {
+            'fields': ('fertilizer_co2_emissions', 'pesticide_co2_emissions', 'energy_co2_emissions',
+                      'irrigation_co2_emissions', 'total_co2_emissions'),
+            'classes': ('collapse',)
+        }),
         ('System Information', {
             'fields': ('id', 'created_at', 'updated_at', 'sync_status', 'is_read_only'),
             'classes': ('collapse',)
@@ -64,4 +116,11 @@ class FarmerAdmin(admin.ModelAdmin):
     def get_readonly_fields(self, request, obj=None):
         if obj and obj.is_read_only:
             return self.readonly_fields + ('farmer_name', 'mobile', 'govt_id')
-        return self.readonly_fields 
\ No newline at end of file
+        return self.readonly_fields 
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # The inputs inline is saved after the farmer; score its new values
+        farmer = Farmer.objects.with_sections('inputs').get(pk=form.instance.pk)
+        farmer.refresh_emissions()
+        farmer.save(update_fields=EMISSION_FIELDS)
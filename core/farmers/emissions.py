@@ -0,0 +1,127 @@
+"""
+Emission factor registry and scoring engine.
+
+``calculate_emissions`` scores one farmer with Decimal arithmetic and backs
+``Farmer.refresh_emissions``, which every write path (save, sync, backfill)
+goes through. Rollups are summed in the database over the stored columns.
+"""
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from django.conf import settings
+from api.cache import bump_generation
+
+# Cache namespace of the emissions summary endpoint
+SUMMARY_CACHE_NAMESPACE = 'emissions-summary'
+
+# Each rule is (keyword groups, factor). A rule matches when every group has at
+# least one keyword contained in the normalised category text; the first
+# matching rule wins. Override with settings.FARMER_EMISSION_FACTORS.
+DEFAULT_EMISSION_FACTORS = {
+    'fertilizer': [
+        ((('n',), ('application',)), '0.1'),
+        ((('p', 'k'), ('application',)), '0.2'),
+        ((('organic',),), '0.6'),
+    ],
+    'pesticide': [
+        ((('pesticide',),), '5.1'),
+        ((('fungicide',),), '6.3'),
+    ],
+    'fuel': [
+        ((('fuelwood',),), '1.8'),
+        ((('coal',),), '2.5'),
+        ((('petrol',),), '2.3'),
+        ((('diesel',),), '2.68'),
+        ((('electricity', 'grid'),), '0.8'),
+    ],
+}
+
+# Emission column -> (factor category, category field, amount field)
+EMISSION_SOURCES = {
+    'fertilizer_co2_emissions': ('fertilizer', 'fertilizer_type', 'application_rate'),
+    'pesticide_co2_emissions': ('pesticide', 'pesticide_category', 'pesticide_application_rate'),
+    'energy_co2_emissions': ('fuel', 'direct_energy_use', 'energy_used'),
+    'irrigation_co2_emissions': ('fuel', 'power_source', 'power_consumption'),
+}
+
+SOURCE_FIELDS = tuple(
+    field for _, category_field, amount_field in EMISSION_SOURCES.values()
+    for field in (category_field, amount_field)
+)
+
+
+def parse_decimal(value):
+    """Convert a survey value to Decimal, treating blanks and junk as zero"""
+    try:
+        return Decimal(value) if value else Decimal('0')
+    except (ValueError, TypeError, InvalidOperation):
+        return Decimal('0')
+
+
+# Distinct (category, text) lookups remembered per process
+FACTOR_CACHE_SIZE = 4096
+
+
+def normalize_category(value):
+    return value.strip().lower() if value else ''
+
+
+class FactorRegistry:
+    """
+    Keyword -> factor lookup for each emission category.
+
+    Lookups are memoised per (category, text) pair, so scoring a large batch
+    only runs the keyword rules once per distinct category value. The texts
+    come from client payloads, so the memo is bounded.
+    """
+
+    def __init__(self, table):
+        self.rules = {
+            category: [
+                (tuple(tuple(group) for group in groups), Decimal(str(factor)))
+                for groups, factor in rules
+            ]
+            for category, rules in table.items()
+        }
+        self._lookup = lru_cache(maxsize=FACTOR_CACHE_SIZE)(self._match)
+
+    def factor(self, category, text):
+        """Return the Decimal factor for a normalised category text"""
+        return self._lookup(category, text)
+
+    def _match(self, category, text):
+        if not text:
+            return Decimal('0')
+        for groups, factor in self.rules.get(category, ()):
+            if all(any(keyword in text for keyword in group) for group in groups):
+                return factor
+        return Decimal('0')
+
+
+@lru_cache(maxsize=None)
+def get_factor_registry():
+    """Load the factor table once per process"""
+    return FactorRegistry(getattr(settings, 'FARMER_EMISSION_FACTORS', DEFAULT_EMISSION_FACTORS))
+
+
+def calculate_emissions(farmer):
+    """
+    Score a single farmer. Returns a dict of Decimal values keyed by emission
+    column, including ``total_co2_emissions``.
+    """
+    registry = get_factor_registry()
+    results = {}
+    for column, (category, category_field, amount_field) in EMISSION_SOURCES.items():
+        text = getattr(farmer, category_field)
+        amount = getattr(farmer, amount_field)
+        if not text or not amount:
+            results[column] = Decimal('0')
+            continue
+        factor = registry.factor(category, normalize_category(text))
+        results[column] = (parse_decimal(amount) * factor) / Decimal('1000')
+    results['total_co2_emissions'] = sum(results.values(), Decimal('0'))
+    return results
+
+
+def invalidate_summary_cache():
+    """Drop cached emission rollups after member farmers or mappings change"""
+    bump_generation(SUMMARY_CACHE_NAMESPACE)
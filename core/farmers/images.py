@@ -0,0 +1,206 @@
+"""
+Background rendition pipeline for farmer photos.
+
+Originals uploaded from the app are full-size camera images. After a photo
+is committed, its bytes are handed to a process pool that decodes it once
+with Pillow, applies the EXIF orientation, and encodes each configured
+rendition without EXIF metadata. The results are stored as
+``FarmerImageRendition`` rows holding the derived file and its dimensions.
+"""
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Farmer ImageFields that get renditions
+IMAGE_FIELDS = (
+    'farmer_photo',
+    'land_photo_1',
+    'land_photo_2',
+    'land_photo_3',
+    'land_photo_4',
+    'soil_characteristics',
+    'fertilizer_photos',
+    'crop_protection_photos',
+)
+
+# Rendition name -> (longest side in pixels, format, quality).
+# Override with settings.FARMER_IMAGE_RENDITIONS.
+DEFAULT_RENDITIONS = {
+    'thumbnail': (320, 'WEBP', 75),
+    'display': (1280, 'JPEG', 82),
+}
+
+FORMAT_EXTENSIONS = {'WEBP': 'webp', 'JPEG': 'jpg', 'PNG': 'png'}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_renditions():
+    return getattr(settings, 'FARMER_IMAGE_RENDITIONS', DEFAULT_RENDITIONS)
+
+
+def image_workers():
+    """Size of the process pool; 0 renders inline after commit"""
+    return getattr(settings, 'FARMER_IMAGE_WORKERS', 2)
+
+
+def render_image(data, renditions):
+    """
+    Decode ``data`` and encode every rendition. Runs in a worker process, so
+    it only deals in bytes and plain tuples.
+
+    Returns a list of ``(name, extension, content, width, height)``.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(data)) as source:
+        image = ImageOps.exif_transpose(source)
+        image.load()
+
+    results = []
+    for name, (size, image_format, quality) in renditions.items():
+        rendition = image.copy()
+        rendition.thumbnail((size, size), Image.LANCZOS)
+        if image_format == 'JPEG' and rendition.mode not in ('RGB', 'L'):
+            rendition = rendition.convert('RGB')
+        output = io.BytesIO()
+        # No exif= argument, so no metadata is written to the rendition
+        rendition.save(output, image_format, quality=quality, optimize=True)
+        results.append((name, FORMAT_EXTENSIONS[image_format], output.getvalue(), rendition.width, rendition.height))
+    return results
+
+
+def get_executor():
+    """Process pool shared by the web process, created on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=image_workers(),
+                # Workers never touch Django state, and spawning avoids
+                # forking a process that holds DB connections and threads
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _executor
+
+
+def reset_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = None
+
+
+def image_jobs():
+    """Render on the background job workers instead of the web process"""
+    return getattr(settings, 'FARMER_IMAGE_JOBS', False)
+
+
+def schedule_renditions(farmer, fields):
+    """
+    Queue rendition jobs for the given image fields of ``farmer`` once the
+    current transaction commits. With FARMER_IMAGE_JOBS the work goes to
+    the durable job queue, committed together with the photo.
+    """
+    from django.db import transaction
+
+    jobs = [(field, getattr(farmer, field).name) for field in fields if getattr(farmer, field)]
+    if not jobs:
+        return
+    if image_jobs():
+        from jobs.queue import enqueue
+        enqueue('farmers.renditions', {'farmer_id': str(farmer.pk), 'images': jobs})
+        return
+    farmer_id = farmer.pk
+    transaction.on_commit(lambda: submit_renditions(farmer_id, jobs))
+
+
+def submit_renditions(farmer_id, jobs, inline=False):
+    """Render ``(field, source)`` pairs on the pool, or right here if ``inline``"""
+    from .storage import media_storage
+
+    renditions = get_renditions()
+    for field, source in jobs:
+        try:
+            with media_storage.open(source, 'rb') as original:
+                data = original.read()
+        except OSError:
+            logger.warning('Original %s of farmer %s is missing', source, farmer_id)
+            continue
+
+        if inline or not image_workers():
+            store_renditions(farmer_id, field, source, _safe_render(data, renditions, source))
+            continue
+        try:
+            future = get_executor().submit(render_image, data, renditions)
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool for the next job
+            reset_executor()
+            store_renditions(farmer_id, field, source, _safe_render(data, renditions, source))
+            continue
+        future.add_done_callback(
+            lambda future, field=field, source=source: _store_result(farmer_id, field, source, future)
+        )
+
+
+def _safe_render(data, renditions, source):
+    try:
+        return render_image(data, renditions)
+    except Exception:
+        logger.exception('Could not process image %s', source)
+        return None
+
+
+def _store_result(farmer_id, field, source, future):
+    """Done callback; runs on the executor's management thread"""
+    from django.db import connection
+
+    try:
+        results = future.result()
+    except Exception:
+        logger.exception('Could not process image %s', source)
+        return
+    try:
+        store_renditions(farmer_id, field, source, results)
+    except Exception:
+        logger.exception('Could not store renditions of %s', source)
+    finally:
+        # This thread is not managed by the request cycle
+        connection.close()
+
+
+def store_renditions(farmer_id, field, source, results):
+    """
+    Save rendered images for one farmer field, replacing older renditions.
+    Results for an original that has since been replaced are dropped.
+    """
+    from django.core.files.base import ContentFile
+    from .models import FarmerImageRendition, FarmerMedia
+
+    if not results:
+        return
+    current = FarmerMedia.objects.filter(pk=farmer_id).values_list(field, flat=True).first()
+    if current != source:
+        return
+
+    stem = os.path.splitext(os.path.basename(source))[0]
+    existing = {rendition.name: rendition for rendition in FarmerImageRendition.objects.filter(farmer_id=farmer_id, field=field)}
+    for name, extension, content, width, height in results:
+        rendition = existing.get(name) or FarmerImageRendition(farmer_id=farmer_id, field=field, name=name)
+        previous = rendition.file.name if rendition.file else None
+        rendition.source = source
+        rendition.width = width
+        rendition.height = height
+        rendition.file.save(f'{stem}_{name}.{extension}', ContentFile(content), save=False)
+        rendition.save()
+        if previous:
+            rendition.file.storage.delete(previous)
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from farmers.emissions import SOURCE_FIELDS, invalidate_summary_cache
+from farmers.models import Farmer, EMISSION_FIELDS
+from farmers.sections import section_lookup, sections_for
+from farmer_mappings.stats import rebuild_company_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the persisted CO2 emission columns for existing farmers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Number of farmers scored and updated per batch')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        # Scored with refresh_emissions(), the Decimal path save() uses, so a
+        # backfilled row stores exactly what re-saving it would
+        queryset = (
+            Farmer.objects.select_related(*sections_for(SOURCE_FIELDS))
+            .only('id', *EMISSION_FIELDS, *(section_lookup(field) for field in SOURCE_FIELDS))
+            .order_by('pk')
+        )
+        self.stdout.write(f'Backfilling emissions for {Farmer.objects.count()} farmers')
+
+        scored = updated = 0
+        last_id = None
+        while True:
+            chunk = list((queryset.filter(pk__gt=last_id) if last_id else queryset)[:batch_size])
+            if not chunk:
+                break
+            last_id = chunk[-1].pk
+            batch = []
+            for farmer in chunk:
+                before = [getattr(farmer, column) for column in EMISSION_FIELDS]
+                farmer.refresh_emissions()
+                if [getattr(farmer, column) for column in EMISSION_FIELDS] != before:
+                    batch.append(farmer)
+            if batch:
+                with transaction.atomic():
+                    Farmer.objects.bulk_update(batch, EMISSION_FIELDS)
+            scored += len(chunk)
+            updated += len(batch)
+            self.stdout.write(f'  ... {scored} farmers scored, {updated} updated')
+
+        if updated:
+            # bulk_update bypasses the signals that keep company totals and
+            # the cached rollups current
+            rebuild_company_stats()
+            invalidate_summary_cache()
+        self.stdout.write(self.style.SUCCESS(f'Updated emissions for {updated} farmers'))
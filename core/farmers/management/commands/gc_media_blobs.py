@@ -0,0 +1,76 @@
+from collections import Counter
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from farmers.images import IMAGE_FIELDS
+from farmers.models import FarmerMedia, MediaBlob
+from farmers.storage import media_storage
+
+
+class Command(BaseCommand):
+    help = 'Delete content-addressed media blobs that no farmer references'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-hours', type=int, default=24,
+                            help='Keep unreferenced blobs newer than this, they may belong to an upload in progress')
+        parser.add_argument('--recount', action='store_true',
+                            help='Recompute reference counts from the farmer_media table first')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report what would be deleted without deleting it')
+
+    def handle(self, *args, **options):
+        if options['recount']:
+            self.recount(options['dry_run'])
+
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+        orphans = MediaBlob.objects.filter(refcount=0, pinned=False, created_at__lt=cutoff)
+        deleted = freed = 0
+        for blob in orphans.iterator():
+            if options['dry_run']:
+                self.stdout.write(f'Would delete {blob.name}')
+                deleted += 1
+                freed += blob.size
+                continue
+            if self.collect(blob):
+                deleted += 1
+                freed += blob.size
+
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {deleted} blobs ({freed} bytes)'))
+
+    def collect(self, blob):
+        """Delete one blob, re-checking references right before removing it"""
+        with transaction.atomic():
+            if not MediaBlob.objects.filter(pk=blob.pk, refcount=0, pinned=False).delete()[0]:
+                return False
+            references = FarmerMedia.objects.filter(self.referencing(blob.name)).count()
+            if references:
+                # A farmer was pointed at the blob after it was counted
+                MediaBlob.objects.create(digest=blob.digest, name=blob.name, size=blob.size, refcount=references)
+                return False
+        media_storage.purge(blob.name)
+        return True
+
+    def recount(self, dry_run):
+        counts = Counter()
+        for names in FarmerMedia.objects.values_list(*IMAGE_FIELDS).iterator(chunk_size=2000):
+            counts.update(name for name in names if name)
+
+        changed = []
+        for blob in MediaBlob.objects.iterator():
+            refcount = counts.get(blob.name, 0)
+            if blob.refcount != refcount:
+                blob.refcount = refcount
+                changed.append(blob)
+        if not dry_run:
+            MediaBlob.objects.bulk_update(changed, ['refcount'], batch_size=1000)
+        self.stdout.write(f'Corrected {len(changed)} reference counts')
+
+    @staticmethod
+    def referencing(name):
+        condition = Q()
+        for field in IMAGE_FIELDS:
+            condition |= Q(**{field: name})
+        return condition
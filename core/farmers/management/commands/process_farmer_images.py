@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from farmers.images import IMAGE_FIELDS, get_renditions, render_image, store_renditions
+from farmers.models import FarmerImageRendition, FarmerMedia
+from farmers.storage import media_storage
+
+
+class Command(BaseCommand):
+    help = 'Create missing or outdated renditions for farmer photos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true',
+                            help='Re-render photos that already have renditions')
+
+    def handle(self, *args, **options):
+        renditions = get_renditions()
+        done = {
+            (farmer_id, field, source)
+            for farmer_id, field, source in FarmerImageRendition.objects.values_list('farmer_id', 'field', 'source').distinct()
+        }
+        has_photo = Q()
+        for field in IMAGE_FIELDS:
+            has_photo |= ~Q(**{field: ''}) & Q(**{f'{field}__isnull': False})
+
+        processed = failed = 0
+        for row in FarmerMedia.objects.filter(has_photo).values('farmer_id', *IMAGE_FIELDS).iterator():
+            for field in IMAGE_FIELDS:
+                source = row[field]
+                if not source or (not options['force'] and (row['farmer_id'], field, source) in done):
+                    continue
+                try:
+                    with media_storage.open(source, 'rb') as original:
+                        results = render_image(original.read(), renditions)
+                    store_renditions(row['farmer_id'], field, source, results)
+                    processed += 1
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f'{row["farmer_id"]} {field}: {e}')
+
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} photos ({failed} failed)'))
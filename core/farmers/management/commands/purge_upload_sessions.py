@@ -0,0 +1,21 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from farmers.models import FarmerUploadSession
+
+
+class Command(BaseCommand):
+    help = 'Delete abandoned and completed upload sessions along with their part files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24,
+                            help='Delete sessions not touched for this many hours')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        deleted = 0
+        # Delete one by one so post_delete removes each part file
+        for session in FarmerUploadSession.objects.filter(updated_at__lt=cutoff).iterator():
+            session.delete()
+            deleted += 1
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} upload sessions'))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from farmers.models import Farmer
+from farmers.search import index_farmers, SEARCH_FIELDS
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the farmer search token index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Number of farmers indexed per batch')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = Farmer.objects.only('id', *SEARCH_FIELDS).order_by('pk')
+        self.stdout.write(f'Indexing {queryset.count()} farmers')
+
+        batch = []
+        indexed = 0
+        for farmer in queryset.iterator(chunk_size=batch_size):
+            batch.append(farmer)
+            if len(batch) >= batch_size:
+                indexed += self.flush(batch)
+                batch = []
+        if batch:
+            indexed += self.flush(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} farmers'))
+
+    def flush(self, batch):
+        with transaction.atomic():
+            index_farmers(batch)
+        return len(batch)
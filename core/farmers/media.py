@@ -0,0 +1,126 @@
+"""
+Farmer media helpers and resumable chunked uploads.
+
+An upload session is created with the final file size, the client then PUTs
+byte ranges (``Content-Range: bytes start-end/total``) that are streamed to a
+part file on disk, and finalising hands the completed part file to the farmer
+ImageField so the storage backend writes it once.
+"""
+import os
+from django.conf import settings
+from django.core.files import File
+from .images import schedule_renditions
+
+# media_type sent by the app -> Farmer ImageField
+MEDIA_TYPE_FIELDS = {
+    'photo': 'farmer_photo',
+    'farmer_photo': 'farmer_photo',
+    'land_photo_1': 'land_photo_1',
+    'land_photo_2': 'land_photo_2',
+    'land_photo_3': 'land_photo_3',
+    'land_photo_4': 'land_photo_4',
+    'soil_characteristics': 'soil_characteristics',
+    'fertilizer_photos': 'fertilizer_photos',
+    'crop_protection_photos': 'crop_protection_photos',
+}
+
+# Bytes copied from the request body per read
+UPLOAD_READ_SIZE = 64 * 1024
+
+
+def media_field(media_type):
+    """Return the Farmer field name for a media type, or None if unknown"""
+    return MEDIA_TYPE_FIELDS.get(media_type)
+
+
+def attach_media(farmer, media_type, file, name=None):
+    """
+    Store ``file`` in the farmer field matching ``media_type`` and save only
+    that column. Returns the stored FieldFile.
+    """
+    field_name = MEDIA_TYPE_FIELDS[media_type]
+    field_file = getattr(farmer, field_name)
+    field_file.save(os.path.basename(name or file.name), file, save=False)
+    farmer.save(update_fields=[field_name, 'updated_at'])
+    # The file was committed before save(), so pre_save cannot see it
+    schedule_renditions(farmer, [field_name])
+    return field_file
+
+
+def attach_stored(farmer, media_type, name):
+    """
+    Point the farmer field matching ``media_type`` at a file that is already
+    in storage, without copying it. Returns the FieldFile.
+    """
+    field_name = MEDIA_TYPE_FIELDS[media_type]
+    setattr(farmer, field_name, name)
+    farmer.save(update_fields=[field_name, 'updated_at'])
+    schedule_renditions(farmer, [field_name])
+    return getattr(farmer, field_name)
+
+
+def upload_dir():
+    return getattr(settings, 'FARMER_UPLOAD_TEMP_DIR', os.path.join(settings.BASE_DIR, 'upload_parts'))
+
+
+def max_upload_size():
+    return getattr(settings, 'FARMER_UPLOAD_MAX_SIZE', 25 * 1024 * 1024)
+
+
+def part_path(session):
+    return os.path.join(upload_dir(), f'{session.id}.part')
+
+
+def parse_content_range(header):
+    """
+    Parse ``bytes start-end/total`` into ``(start, end, total)`` with an
+    inclusive ``end``. Returns None for a missing or malformed header.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.strip().partition(' ')
+    byte_range, _, total = spec.partition('/')
+    start, _, end = byte_range.partition('-')
+    try:
+        start, end, total = int(start), int(end), int(total)
+    except ValueError:
+        return None
+    if unit != 'bytes' or start < 0 or end < start or end >= total:
+        return None
+    return start, end, total
+
+
+def write_chunk(session, stream, start, length):
+    """
+    Copy ``length`` bytes from ``stream`` into the session part file at
+    ``start`` without buffering the whole chunk. Returns the number of bytes
+    written, which is short if the client disconnected.
+    """
+    path = part_path(session)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    written = 0
+    with open(path, 'r+b' if os.path.exists(path) else 'wb') as part:
+        part.seek(start)
+        while written < length:
+            data = stream.read(min(UPLOAD_READ_SIZE, length - written))
+            if not data:
+                break
+            part.write(data)
+            written += len(data)
+    return written
+
+
+def finalize_upload(session):
+    """Attach the completed part file to the farmer and remove it"""
+    path = part_path(session)
+    with open(path, 'rb') as part:
+        field_file = attach_media(session.farmer, session.media_type, File(part), name=session.filename)
+    discard_part(session)
+    return field_file
+
+
+def discard_part(session):
+    try:
+        os.remove(part_path(session))
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.2 on 2026-10-17 17:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farmers', '0002_alter_farmer_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedFarmer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('farmer_id', models.CharField(max_length=36)),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'deleted_farmers',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='farmer',
+            index=models.Index(fields=['updated_at', 'id'], name='farmers_updated_7176a9_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.2 on 2026-10-17 17:17
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farmers', '0003_farmer_change_feed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='farmer',
+            name='energy_co2_emissions',
+            field=models.DecimalField(decimal_places=6, default=Decimal('0'), editable=False, max_digits=18),
+        ),
+        migrations.AddField(
+            model_name='farmer',
+            name='fertilizer_co2_emissions',
+            field=models.DecimalField(decimal_places=6, default=Decimal('0'), editable=False, max_digits=18),
+        ),
+        migrations.AddField(
+            model_name='farmer',
+            name='irrigation_co2_emissions',
+            field=models.DecimalField(decimal_places=6, default=Decimal('0'), editable=False, max_digits=18),
+        ),
+        migrations.AddField(
+            model_name='farmer',
+            name='pesticide_co2_emissions',
+            field=models.DecimalField(decimal_places=6, default=Decimal('0'), editable=False, max_digits=18),
+        ),
+        migrations.AddField(
+            model_name='farmer',
+            name='total_co2_emissions',
+            field=models.DecimalField(decimal_places=6, default=Decimal('0'), editable=False, max_digits=18),
+        ),
+        migrations.AddIndex(
+            model_name='farmer',
+            index=models.Index(fields=['total_co2_emissions'], name='farmers_total_c_9be00d_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.2 on 2026-10-17 17:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+from farmers.search import tokenize, SEARCH_FIELDS
+
+
+def build_search_index(apps, schema_editor):
+    Farmer = apps.get_model('farmers', 'Farmer')
+    FarmerSearchToken = apps.get_model('farmers', 'FarmerSearchToken')
+
+    batch = []
+    for row in Farmer.objects.order_by('pk').values('id', *SEARCH_FIELDS).iterator(chunk_size=2000):
+        for field in SEARCH_FIELDS:
+            for token in tokenize(row[field]):
+                batch.append(FarmerSearchToken(farmer_id=row['id'], field=field, token=token))
+        if len(batch) >= 5000:
+            FarmerSearchToken.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        FarmerSearchToken.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farmers', '0004_farmer_emission_columns'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FarmerSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(max_length=20)),
+                ('token', models.CharField(db_index=True, max_length=50)),
+                ('farmer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='farmers.farmer')),
+            ],
+            options={
+                'db_table': 'farmer_search_tokens',
+                'indexes': [models.Index(fields=['field', 'token'], name='farmer_sear_field_67e965_idx')],
+            },
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
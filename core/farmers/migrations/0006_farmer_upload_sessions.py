@@ -0,0 +1,32 @@
+# Generated by Django 5.0.2 on 2026-10-17 17:25
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farmers', '0005_farmer_search_tokens'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FarmerUploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('media_type', models.CharField(max_length=30)),
+                ('filename', models.CharField(max_length=255)),
+                ('total_size', models.PositiveBigIntegerField()),
+                ('received', models.PositiveBigIntegerField(default=0)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('complete', 'Complete')], default='pending', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('farmer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to='farmers.farmer')),
+            ],
+            options={
+                'db_table': 'farmer_upload_sessions',
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.2 on 2026-10-17 17:27
+
+import django.db.models.deletion
+import farmers.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farmers', '0006_farmer_upload_sessions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FarmerImageRendition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(max_length=30)),
+                ('name', models.CharField(max_length=20)),
+                ('source', models.CharField(max_length=255)),
+                ('file', models.FileField(max_length=255, upload_to=farmers.models.rendition_path)),
+                ('width', models.PositiveIntegerField()),
+                ('height', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('farmer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='renditions', to='farmers.farmer')),
+            ],
+            options={
+                'db_table': 'farmer_image_renditions',
+                'unique_together': {('farmer', 'field', 'name')},
+            },
+        ),
+    ]
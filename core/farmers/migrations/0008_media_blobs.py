@@ -0,0 +1,69 @@
+# Generated by Django 5.0.2 on 2026-10-17 17:30
+
+import farmers.models
+import farmers.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farmers', '0007_farmer_image_renditions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('refcount', models.PositiveIntegerField(default=0)),
+                ('pinned', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'media_blobs',
+            },
+        ),
+        migrations.AlterField(
+            model_name='farmer',
+            name='crop_protection_photos',
+            field=models.ImageField(blank=True, null=True, storage=farmers.storage.get_media_storage, upload_to=farmers.models.crop_protection_photos_path),
+        ),
+        migrations.AlterField(
+            model_name='farmer',
+            name='farmer_photo',
+            field=models.ImageField(blank=True, null=True, storage=farmers.storage.get_media_storage, upload_to=farmers.models.farmer_photo_path),
+        ),
+        migrations.AlterField(
+            model_name='farmer',
+            name='fertilizer_photos',
+            field=models.ImageField(blank=True, null=True, storage=farmers.storage.get_media_storage, upload_to=farmers.models.fertilizer_photos_path),
+        ),
+        migrations.AlterField(
+            model_name='farmer',
+            name='land_photo_1',
+            field=models.ImageField(blank=True, null=True, storage=farmers.storage.get_media_storage, upload_to=farmers.models.land_photo_path),
+        ),
+        migrations.AlterField(
+            model_name='farmer',
+            name='land_photo_2',
+            field=models.ImageField(blank=True, null=True, storage=farmers.storage.get_media_storage, upload_to=farmers.models.land_photo_path),
+        ),
+        migrations.AlterField(
+            model_name='farmer',
+            name='land_photo_3',
+            field=models.ImageField(blank=True, null=True, storage=farmers.storage.get_media_storage, upload_to=farmers.models.land_photo_path),
+        ),
+        migrations.AlterField(
+            model_name='farmer',
+            name='land_photo_4',
+            field=models.ImageField(blank=True, null=True, storage=farmers.storage.get_media_storage, upload_to=farmers.models.land_photo_path),
+        ),
+        migrations.AlterField(
+            model_name='farmer',
+            name='soil_characteristics',
+            field=models.ImageField(blank=True, null=True, storage=farmers.storage.get_media_storage, upload_to=farmers.models.soil_characteristics_path),
+        ),
+    ]
@@ -0,0 +1,293 @@
+# Generated by Django 5.0.2 on 2026-10-17 18:40
+
+import django.db.models.deletion
+import logging
+import re
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from django.conf import settings
+from django.db import migrations, models, transaction
+from django.db.models import Sum
+
+logger = logging.getLogger('farmers.migrations')
+
+# Farmers parsed and written per transaction
+CHUNK_SIZE = 2000
+
+# The parser and emission rules below are frozen copies of farmers.quantities
+# and farmers.emissions as of this migration; later edits to those modules
+# must not change what this migration does.
+
+# Quantity field -> the field holding its unit, if any
+QUANTITY_FIELDS = {
+    'crop_area': 'crop_area_unit',
+    'yield_produced': 'yield_unit',
+    'soil_ph': None,
+    'ec': 'ec_unit',
+    'organic_carbon': 'organic_carbon_unit',
+    'application_rate': 'application_rate_unit',
+    'pesticide_application_rate': 'pesticide_application_rate_unit',
+    'energy_used': 'energy_unit',
+    'power_consumption': 'power_consumption_unit',
+    'distance': 'distance_unit',
+    'fuel_consumption': 'fuel_consumption_unit',
+}
+
+QUANTITY_MAX_DIGITS = 14
+QUANTITY_PRECISION = Decimal('0.0001')
+
+UNIT_ALIASES = {
+    'acre': ('acre', 'acres', 'ac'),
+    'ha': ('ha', 'hectare', 'hectares'),
+    'g': ('g', 'gm', 'gms', 'gram', 'grams'),
+    'kg': ('kg', 'kgs', 'kilo', 'kilos', 'kilogram', 'kilograms'),
+    'quintal': ('q', 'qtl', 'qtls', 'quintal', 'quintals'),
+    't': ('t', 'mt', 'ton', 'tons', 'tonne', 'tonnes'),
+    'ml': ('ml', 'millilitre', 'millilitres', 'milliliter', 'milliliters'),
+    'l': ('l', 'lt', 'ltr', 'ltrs', 'litre', 'litres', 'liter', 'liters'),
+    'kwh': ('kwh', 'unit', 'units'),
+    'km': ('km', 'kms', 'kilometre', 'kilometres', 'kilometer', 'kilometers'),
+    'ds/m': ('ds/m', 'dsm'),
+    'ms/cm': ('ms/cm', 'mscm'),
+    '%': ('%', 'percent', 'pct'),
+    'kg/acre': ('kg/acre', 'kg/ac', 'kgs/acre', 'kg per acre'),
+    'kg/ha': ('kg/ha', 'kgs/ha', 'kg per ha', 'kg/hectare'),
+    'l/acre': ('l/acre', 'ltr/acre', 'litre/acre', 'l per acre'),
+    'l/ha': ('l/ha', 'ltr/ha', 'litre/ha', 'l per ha'),
+}
+_UNITS = {alias: unit for unit, aliases in UNIT_ALIASES.items() for alias in aliases}
+
+_QUANTITY = re.compile(r'^([-+]?(?:\d+(?:\.\d*)?|\.\d+))\s*([^\d]*)$')
+_THOUSANDS = re.compile(r'(?<=\d),(?=\d)')
+
+EMISSION_FACTORS = {
+    'fertilizer': [
+        ((('n',), ('application',)), '0.1'),
+        ((('p', 'k'), ('application',)), '0.2'),
+        ((('organic',),), '0.6'),
+    ],
+    'pesticide': [
+        ((('pesticide',),), '5.1'),
+        ((('fungicide',),), '6.3'),
+    ],
+    'fuel': [
+        ((('fuelwood',),), '1.8'),
+        ((('coal',),), '2.5'),
+        ((('petrol',),), '2.3'),
+        ((('diesel',),), '2.68'),
+        ((('electricity', 'grid'),), '0.8'),
+    ],
+}
+
+# Emission column -> (factor category, category field, amount field)
+EMISSION_SOURCES = {
+    'fertilizer_co2_emissions': ('fertilizer', 'fertilizer_type', 'application_rate'),
+    'pesticide_co2_emissions': ('pesticide', 'pesticide_category', 'pesticide_application_rate'),
+    'energy_co2_emissions': ('fuel', 'direct_energy_use', 'energy_used'),
+    'irrigation_co2_emissions': ('fuel', 'power_source', 'power_consumption'),
+}
+EMISSION_PRECISION = Decimal('0.000001')
+
+
+def normalize_unit(value):
+    if not value:
+        return value
+    text = ' '.join(str(value).split())
+    return _UNITS.get(text.lower().rstrip('.'), text)
+
+
+def to_quantity(value):
+    try:
+        value = Decimal(value).quantize(QUANTITY_PRECISION, rounding=ROUND_HALF_UP)
+    except InvalidOperation:
+        raise ValueError(f'{value!r} is not a finite number')
+    if len(value.as_tuple().digits) > QUANTITY_MAX_DIGITS:
+        raise ValueError(f'{value} does not fit a quantity column')
+    return value
+
+
+def parse_quantity(value):
+    """``(Decimal, unit)`` of a legacy text value; ValueError if it is not a number"""
+    if value is None:
+        return None, None
+    text = _THOUSANDS.sub('', str(value).strip())
+    if not text:
+        return None, None
+    match = _QUANTITY.match(text)
+    if match is None:
+        raise ValueError(f'{value!r} is not a number')
+    return to_quantity(match.group(1)), normalize_unit(match.group(2)) or None
+
+
+def factor_rules():
+    table = getattr(settings, 'FARMER_EMISSION_FACTORS', EMISSION_FACTORS)
+    return {
+        category: [(groups, Decimal(str(factor))) for groups, factor in rules]
+        for category, rules in table.items()
+    }
+
+
+def emission_factor(rules, category, text):
+    text = text.strip().lower() if text else ''
+    if not text:
+        return Decimal('0')
+    for groups, factor in rules.get(category, ()):
+        if all(any(keyword in text for keyword in group) for group in groups):
+            return factor
+    return Decimal('0')
+
+
+def set_emissions(farmer, rules, categories):
+    """Score ``farmer`` from its parsed amounts, as Farmer.refresh_emissions does"""
+    total = Decimal('0')
+    for column, (category, category_field, amount_field) in EMISSION_SOURCES.items():
+        amount = getattr(farmer, f'{amount_field}_value')
+        value = Decimal('0')
+        if categories[category_field] and amount:
+            factor = emission_factor(rules, category, categories[category_field])
+            value = (amount * factor / Decimal('1000')).quantize(EMISSION_PRECISION)
+        setattr(farmer, column, value)
+        total += value
+    farmer.total_co2_emissions = total
+
+
+def _chunks(farmers, columns):
+    """Rows of ``columns`` in primary key order, one keyset page at a time"""
+    last = None
+    while True:
+        rows = farmers.order_by('pk')
+        if last is not None:
+            rows = rows.filter(pk__gt=last)
+        rows = list(rows.values_list('pk', *columns)[:CHUNK_SIZE])
+        if not rows:
+            return
+        yield rows
+        last = rows[-1][0]
+
+
+def parse_quantities(apps, schema_editor):
+    """
+    Fill the typed quantity columns and re-score each farmer from them.
+    Text that is not a number, or whose unit could not be kept, is copied
+    to farmer_unparsed_quantities before 0011 drops the text columns.
+    """
+    alias = schema_editor.connection.alias
+    Farmer = apps.get_model('farmers', 'Farmer')
+    UnparsedQuantity = apps.get_model('farmers', 'UnparsedQuantity')
+    farmers = Farmer.objects.using(alias)
+    rules = factor_rules()
+    unit_fields = [unit for unit in QUANTITY_FIELDS.values() if unit]
+    unit_lengths = {unit: Farmer._meta.get_field(unit).max_length for unit in unit_fields}
+    category_fields = [category_field for _, category_field, _ in EMISSION_SOURCES.values()]
+    columns = [*QUANTITY_FIELDS, *unit_fields, *category_fields]
+    update_fields = [f'{field}_value' for field in QUANTITY_FIELDS] + unit_fields + [
+        *EMISSION_SOURCES, 'total_co2_emissions',
+    ]
+    kept = 0
+
+    for rows in _chunks(farmers, columns):
+        batch, unparsed = [], []
+        for pk, *values in rows:
+            row = dict(zip(columns, values))
+            farmer = Farmer(pk=pk)
+            for unit_field in unit_fields:
+                setattr(farmer, unit_field, normalize_unit(row[unit_field]))
+            for field, unit_field in QUANTITY_FIELDS.items():
+                try:
+                    value, unit = parse_quantity(row[field])
+                except ValueError:
+                    value, unit = None, None
+                    unparsed.append(UnparsedQuantity(farmer_id=pk, field=field, raw_value=row[field]))
+                setattr(farmer, f'{field}_value', value)
+                if not unit:
+                    continue
+                # "12 kg" with no unit recorded yet moves the unit to its column
+                if unit_field and not getattr(farmer, unit_field) and len(unit) <= unit_lengths[unit_field]:
+                    setattr(farmer, unit_field, unit)
+                if not unit_field or getattr(farmer, unit_field) != unit:
+                    unparsed.append(UnparsedQuantity(farmer_id=pk, field=field, raw_value=row[field]))
+            set_emissions(farmer, rules, row)
+            batch.append(farmer)
+        # One short transaction per chunk keeps locks brief on large tables
+        with transaction.atomic(using=alias):
+            farmers.bulk_update(batch, update_fields)
+            UnparsedQuantity.objects.using(alias).bulk_create(unparsed)
+        kept += len(unparsed)
+
+    if kept:
+        logger.warning('Kept %s quantities that could not be parsed in farmer_unparsed_quantities', kept)
+    refresh_company_emissions(apps, alias)
+
+
+def refresh_company_emissions(apps, alias):
+    """
+    Re-total company stats from the re-scored farmers. When the stats table
+    does not exist yet, farmer_mappings 0002 builds it from these scores.
+    """
+    try:
+        CompanyFarmerStats = apps.get_model('farmer_mappings', 'CompanyFarmerStats')
+    except LookupError:
+        return
+    FarmerMapping = apps.get_model('farmer_mappings', 'FarmerMapping')
+    totals = dict(
+        FarmerMapping.objects.using(alias).order_by().values_list('company_id').annotate(
+            emissions=Sum('farmer__total_co2_emissions'))
+    )
+    stats = list(CompanyFarmerStats.objects.using(alias).only('pk'))
+    for row in stats:
+        row.total_co2_emissions = totals.get(row.pk) or Decimal('0')
+    CompanyFarmerStats.objects.using(alias).bulk_update(stats, ['total_co2_emissions'], batch_size=1000)
+
+
+def format_quantities(apps, schema_editor):
+    """Write the numbers back as text, restoring the kept raw values"""
+    alias = schema_editor.connection.alias
+    Farmer = apps.get_model('farmers', 'Farmer')
+    UnparsedQuantity = apps.get_model('farmers', 'UnparsedQuantity')
+    farmers = Farmer.objects.using(alias)
+    columns = [f'{field}_value' for field in QUANTITY_FIELDS]
+
+    for rows in _chunks(farmers, columns):
+        raw = {
+            (farmer_id, field): raw_value
+            for farmer_id, field, raw_value in UnparsedQuantity.objects.using(alias).filter(
+                farmer_id__in=[row[0] for row in rows]).values_list('farmer_id', 'field', 'raw_value')
+        }
+        batch = []
+        for pk, *values in rows:
+            farmer = Farmer(pk=pk)
+            for field, value in zip(QUANTITY_FIELDS, values):
+                if (pk, field) in raw:
+                    text = raw[pk, field]
+                else:
+                    text = format(value.normalize(), 'f') if value is not None else None
+                setattr(farmer, field, text)
+            batch.append(farmer)
+        with transaction.atomic(using=alias):
+            farmers.bulk_update(batch, list(QUANTITY_FIELDS))
+
+
+class Migration(migrations.Migration):
+    # Each chunk commits on its own instead of one long transaction
+    atomic = False
+
+    dependencies = [
+        ('farmers', '0009_farmer_quantity_values'),
+    ]
+
+    # Emission scores are left as re-computed when reversed
+    operations = [
+        migrations.CreateModel(
+            name='UnparsedQuantity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(max_length=40)),
+                ('raw_value', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('farmer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='unparsed_quantities', to='farmers.farmer')),
+            ],
+            options={
+                'db_table': 'farmer_unparsed_quantities',
+            },
+        ),
+        migrations.RunPython(parse_quantities, format_quantities),
+    ]
@@ -0,0 +1,112 @@
+# Generated by Django 5.0.2 on 2026-10-17 18:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farmers', '0010_parse_farmer_quantities'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='farmer',
+            name='crop_area',
+        ),
+        migrations.RenameField(
+            model_name='farmer',
+            old_name='crop_area_value',
+            new_name='crop_area',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='yield_produced',
+        ),
+        migrations.RenameField(
+            model_name='farmer',
+            old_name='yield_produced_value',
+            new_name='yield_produced',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='soil_ph',
+        ),
+        migrations.RenameField(
+            model_name='farmer',
+            old_name='soil_ph_value',
+            new_name='soil_ph',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='ec',
+        ),
+        migrations.RenameField(
+            model_name='farmer',
+            old_name='ec_value',
+            new_name='ec',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='organic_carbon',
+        ),
+        migrations.RenameField(
+            model_name='farmer',
+            old_name='organic_carbon_value',
+            new_name='organic_carbon',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='application_rate',
+        ),
+        migrations.RenameField(
+            model_name='farmer',
+            old_name='application_rate_value',
+            new_name='application_rate',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='pesticide_application_rate',
+        ),
+        migrations.RenameField(
+            model_name='farmer',
+            old_name='pesticide_application_rate_value',
+            new_name='pesticide_application_rate',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='energy_used',
+        ),
+        migrations.RenameField(
+            model_name='farmer',
+            old_name='energy_used_value',
+            new_name='energy_used',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='power_consumption',
+        ),
+        migrations.RenameField(
+            model_name='farmer',
+            old_name='power_consumption_value',
+            new_name='power_consumption',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='distance',
+        ),
+        migrations.RenameField(
+            model_name='farmer',
+            old_name='distance_value',
+            new_name='distance',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='fuel_consumption',
+        ),
+        migrations.RenameField(
+            model_name='farmer',
+            old_name='fuel_consumption_value',
+            new_name='fuel_consumption',
+        ),
+    ]
@@ -0,0 +1,110 @@
+# Generated by Django 5.0.2 on 2026-10-17 18:00
+
+import django.db.models.deletion
+import farmers.models
+import farmers.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farmers', '0011_farmer_quantity_columns'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FarmerCrop',
+            fields=[
+                ('farmer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='crop', serialize=False, to='farmers.farmer')),
+                ('crop_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('crop_area', models.DecimalField(blank=True, decimal_places=4, max_digits=14, null=True)),
+                ('crop_area_unit', models.CharField(blank=True, max_length=10, null=True)),
+                ('yield_produced', models.DecimalField(blank=True, decimal_places=4, max_digits=14, null=True)),
+                ('yield_unit', models.CharField(blank=True, max_length=10, null=True)),
+                ('cropping_season', models.CharField(blank=True, max_length=100, null=True)),
+                ('cropping_pattern', models.CharField(blank=True, max_length=100, null=True)),
+                ('farming_practice', models.CharField(blank=True, max_length=100, null=True)),
+                ('agriculture_crop_type', models.CharField(blank=True, max_length=100, null=True)),
+                ('soil_type', models.CharField(blank=True, max_length=100, null=True)),
+                ('soil_ph', models.DecimalField(blank=True, decimal_places=4, max_digits=14, null=True)),
+                ('ec', models.DecimalField(blank=True, decimal_places=4, max_digits=14, null=True)),
+                ('ec_unit', models.CharField(blank=True, max_length=10, null=True)),
+                ('organic_carbon', models.DecimalField(blank=True, decimal_places=4, max_digits=14, null=True)),
+                ('organic_carbon_unit', models.CharField(blank=True, max_length=10, null=True)),
+            ],
+            options={
+                'db_table': 'farmer_crops',
+            },
+        ),
+        migrations.CreateModel(
+            name='FarmerInputs',
+            fields=[
+                ('farmer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='inputs', serialize=False, to='farmers.farmer')),
+                ('fertilizer_type', models.CharField(blank=True, max_length=100, null=True)),
+                ('application_rate', models.DecimalField(blank=True, decimal_places=4, max_digits=14, null=True)),
+                ('application_rate_unit', models.CharField(blank=True, max_length=20, null=True)),
+                ('pesticide_category', models.CharField(blank=True, max_length=100, null=True)),
+                ('pesticide_application_rate', models.DecimalField(blank=True, decimal_places=4, max_digits=14, null=True)),
+                ('pesticide_application_rate_unit', models.CharField(blank=True, max_length=20, null=True)),
+                ('direct_energy_use', models.CharField(blank=True, max_length=100, null=True)),
+                ('energy_used', models.DecimalField(blank=True, decimal_places=4, max_digits=14, null=True)),
+                ('energy_unit', models.CharField(blank=True, max_length=10, null=True)),
+                ('energy_category', models.CharField(blank=True, max_length=50, null=True)),
+                ('water_source', models.CharField(blank=True, max_length=100, null=True)),
+                ('irrigation_method', models.CharField(blank=True, max_length=100, null=True)),
+                ('power_source', models.CharField(blank=True, max_length=100, null=True)),
+                ('power_consumption', models.DecimalField(blank=True, decimal_places=4, max_digits=14, null=True)),
+                ('power_consumption_unit', models.CharField(blank=True, max_length=10, null=True)),
+                ('transport_activity_type', models.CharField(blank=True, max_length=100, null=True)),
+                ('transport_mode', models.CharField(blank=True, max_length=100, null=True)),
+                ('distance', models.DecimalField(blank=True, decimal_places=4, max_digits=14, null=True)),
+                ('distance_unit', models.CharField(blank=True, max_length=10, null=True)),
+                ('fuel_type', models.CharField(blank=True, max_length=50, null=True)),
+                ('fuel_consumption', models.DecimalField(blank=True, decimal_places=4, max_digits=14, null=True)),
+                ('fuel_consumption_unit', models.CharField(blank=True, max_length=10, null=True)),
+            ],
+            options={
+                'db_table': 'farmer_inputs',
+            },
+        ),
+        migrations.CreateModel(
+            name='FarmerMedia',
+            fields=[
+                ('farmer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='media', serialize=False, to='farmers.farmer')),
+                ('farmer_photo', models.ImageField(blank=True, null=True, storage=farmers.storage.get_media_storage, upload_to=farmers.models.farmer_photo_path)),
+                ('land_photo_1', models.ImageField(blank=True, null=True, storage=farmers.storage.get_media_storage, upload_to=farmers.models.land_photo_path)),
+                ('land_photo_2', models.ImageField(blank=True, null=True, storage=farmers.storage.get_media_storage, upload_to=farmers.models.land_photo_path)),
+                ('land_photo_3', models.ImageField(blank=True, null=True, storage=farmers.storage.get_media_storage, upload_to=farmers.models.land_photo_path)),
+                ('land_photo_4', models.ImageField(blank=True, null=True, storage=farmers.storage.get_media_storage, upload_to=farmers.models.land_photo_path)),
+                ('soil_characteristics', models.ImageField(blank=True, null=True, storage=farmers.storage.get_media_storage, upload_to=farmers.models.soil_characteristics_path)),
+                ('fertilizer_photos', models.ImageField(blank=True, null=True, storage=farmers.storage.get_media_storage, upload_to=farmers.models.fertilizer_photos_path)),
+                ('crop_protection_photos', models.ImageField(blank=True, null=True, storage=farmers.storage.get_media_storage, upload_to=farmers.models.crop_protection_photos_path)),
+            ],
+            options={
+                'db_table': 'farmer_media',
+            },
+        ),
+        migrations.CreateModel(
+            name='FarmerProfile',
+            fields=[
+                ('farmer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='profile', serialize=False, to='farmers.farmer')),
+                ('land_status', models.CharField(blank=True, max_length=50, null=True)),
+                ('product_ids', models.TextField(blank=True, null=True)),
+                ('has_organization', models.BooleanField(default=False)),
+                ('fpo_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('fpg_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('fpg_id', models.CharField(blank=True, max_length=50, null=True)),
+                ('category', models.CharField(blank=True, max_length=100, null=True)),
+                ('literacy', models.CharField(blank=True, max_length=100, null=True)),
+                ('children', models.CharField(blank=True, max_length=50, null=True)),
+                ('livelihood', models.CharField(blank=True, max_length=100, null=True)),
+                ('annual_income', models.CharField(blank=True, max_length=100, null=True)),
+                ('other_source_income', models.CharField(blank=True, max_length=100, null=True)),
+                ('total_income', models.CharField(blank=True, max_length=100, null=True)),
+            ],
+            options={
+                'db_table': 'farmer_profiles',
+            },
+        ),
+    ]
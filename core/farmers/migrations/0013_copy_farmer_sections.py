@@ -0,0 +1,73 @@
+# Generated by Django 5.0.2 on 2026-10-17 18:00
+
+from django.db import migrations, transaction
+from farmers.sections import SECTIONS
+
+# Farmers copied per transaction
+CHUNK_SIZE = 2000
+
+SECTION_MODELS = {
+    'profile': 'FarmerProfile',
+    'crop': 'FarmerCrop',
+    'inputs': 'FarmerInputs',
+    'media': 'FarmerMedia',
+}
+
+
+def _chunks(rows, key):
+    """Rows of a values() queryset in ``key`` order, one keyset page at a time"""
+    last = None
+    while True:
+        page = rows.order_by(key)
+        if last is not None:
+            page = page.filter(**{f'{key}__gt': last})
+        page = list(page[:CHUNK_SIZE])
+        if not page:
+            return
+        yield page
+        last = page[-1][key]
+
+
+def copy_sections(apps, schema_editor):
+    alias = schema_editor.connection.alias
+    Farmer = apps.get_model('farmers', 'Farmer')
+    fields = [field for section_fields in SECTIONS.values() for field in section_fields]
+
+    for rows in _chunks(Farmer.objects.using(alias).values('id', *fields), 'id'):
+        with transaction.atomic(using=alias):
+            for section, model_name in SECTION_MODELS.items():
+                model = apps.get_model('farmers', model_name)
+                # Farmers that never answered a section get no row for it
+                model.objects.using(alias).bulk_create([
+                    model(farmer_id=row['id'], **{field: row[field] for field in SECTIONS[section]})
+                    for row in rows
+                    if any(row[field] not in (None, '', False) for field in SECTIONS[section])
+                ])
+
+
+def restore_columns(apps, schema_editor):
+    alias = schema_editor.connection.alias
+    Farmer = apps.get_model('farmers', 'Farmer')
+
+    for section, model_name in SECTION_MODELS.items():
+        model = apps.get_model('farmers', model_name)
+        fields = list(SECTIONS[section])
+        for rows in _chunks(model.objects.using(alias).values('farmer_id', *fields), 'farmer_id'):
+            with transaction.atomic(using=alias):
+                Farmer.objects.using(alias).bulk_update(
+                    [Farmer(id=row['farmer_id'], **{field: row[field] for field in fields}) for row in rows],
+                    fields,
+                )
+
+
+class Migration(migrations.Migration):
+    # Each chunk commits on its own instead of one long transaction
+    atomic = False
+
+    dependencies = [
+        ('farmers', '0012_farmer_sections'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_sections, restore_columns),
+    ]
@@ -0,0 +1,245 @@
+# Generated by Django 5.0.2 on 2026-10-17 18:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farmers', '0013_copy_farmer_sections'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='farmer',
+            name='agriculture_crop_type',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='annual_income',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='application_rate',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='application_rate_unit',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='category',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='children',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='crop_area',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='crop_area_unit',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='crop_name',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='crop_protection_photos',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='cropping_pattern',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='cropping_season',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='direct_energy_use',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='distance',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='distance_unit',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='ec',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='ec_unit',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='energy_category',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='energy_unit',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='energy_used',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='farmer_photo',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='farming_practice',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='fertilizer_photos',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='fertilizer_type',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='fpg_id',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='fpg_name',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='fpo_name',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='fuel_consumption',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='fuel_consumption_unit',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='fuel_type',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='has_organization',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='irrigation_method',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='land_photo_1',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='land_photo_2',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='land_photo_3',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='land_photo_4',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='land_status',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='literacy',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='livelihood',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='organic_carbon',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='organic_carbon_unit',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='other_source_income',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='pesticide_application_rate',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='pesticide_application_rate_unit',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='pesticide_category',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='power_consumption',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='power_consumption_unit',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='power_source',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='product_ids',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='soil_characteristics',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='soil_ph',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='soil_type',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='total_income',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='transport_activity_type',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='transport_mode',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='water_source',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='yield_produced',
+        ),
+        migrations.RemoveField(
+            model_name='farmer',
+            name='yield_unit',
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.0.2 on 2026-10-17 19:10
+
+import logging
+import uuid
+from django.db import migrations, transaction
+from api.fields import parse_uuid
+
+logger = logging.getLogger('farmers.migrations')
+
+# Farmers checked per transaction
+CHUNK_SIZE = 2000
+
+# Namespace of the UUIDs given to legacy ids that are not UUIDs
+LEGACY_ID_NAMESPACE = uuid.UUID('6f1c3a52-9d7e-4b0a-8c5e-2f4d1b7a9e30')
+
+
+def canonical_id(value):
+    """Lower-case dashed form of a UUID id; other ids map to a stable UUID5"""
+    return str(parse_uuid(value) or uuid.uuid5(LEGACY_ID_NAMESPACE, value))
+
+
+def key_columns(Farmer):
+    """``(model, field attname)`` of every column holding a farmer id"""
+    return [(Farmer, 'id')] + [
+        (rel.related_model, rel.field.attname)
+        for rel in Farmer._meta.related_objects
+        if not rel.many_to_many
+    ]
+
+
+def canonicalize_ids(apps, schema_editor):
+    """
+    Rewrite farmer ids into the one spelling the uuid column will return,
+    so ids already handed to clients are unchanged after the type change
+    """
+    alias = schema_editor.connection.alias
+    Farmer = apps.get_model('farmers', 'Farmer')
+    columns = key_columns(Farmer)
+    mysql = schema_editor.connection.vendor == 'mysql'
+
+    last = None
+    while True:
+        rows = Farmer.objects.using(alias).order_by('id')
+        if last is not None:
+            rows = rows.filter(id__gt=last)
+        ids = list(rows.values_list('id', flat=True)[:CHUNK_SIZE])
+        if not ids:
+            return
+        last = ids[-1]
+
+        renamed = {old: canonical_id(old) for old in ids if canonical_id(old) != old}
+        if not renamed:
+            continue
+        with transaction.atomic(using=alias):
+            if mysql:
+                # MySQL checks foreign keys per statement, not at commit
+                schema_editor.execute('SET FOREIGN_KEY_CHECKS = 0')
+            for old, new in renamed.items():
+                if parse_uuid(old) is None:
+                    logger.warning('Farmer %r is not a UUID; renamed to %s', old, new)
+                for model, attname in columns:
+                    model.objects.using(alias).filter(**{attname: old}).update(**{attname: new})
+            if mysql:
+                schema_editor.execute('SET FOREIGN_KEY_CHECKS = 1')
+
+
+class Migration(migrations.Migration):
+    # Each chunk commits on its own instead of one long transaction
+    atomic = False
+
+    dependencies = [
+        ('farmers', '0014_remove_farmer_section_columns'),
+        # Mappings reference farmer ids too
+        ('farmer_mappings', '0002_company_farmer_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(canonicalize_ids, migrations.RunPython.noop),
+    ]
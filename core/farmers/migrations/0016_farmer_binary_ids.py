@@ -0,0 +1,56 @@
+# Generated by Django 5.0.2 on 2026-10-17 19:20
+
+import api.fields
+from django.db import migrations
+
+
+def key_columns(Farmer):
+    """``(model, field)`` of every column holding a farmer id"""
+    return [(Farmer, Farmer._meta.pk)] + [
+        (rel.related_model, rel.field)
+        for rel in Farmer._meta.related_objects
+        if not rel.many_to_many
+    ]
+
+
+def pack_ids(apps, schema_editor):
+    """
+    Rewrite the dashed ids into the storage format of BinaryUUIDField so
+    the AlterField below only has to change the column types. PostgreSQL
+    needs nothing: it casts the text to uuid while altering the columns.
+    """
+    vendor = schema_editor.connection.vendor
+    quote = schema_editor.quote_name
+    columns = key_columns(apps.get_model('farmers', 'Farmer'))
+
+    if vendor == 'sqlite':
+        for model, field in columns:
+            table, column = quote(model._meta.db_table), quote(field.column)
+            schema_editor.execute(f"UPDATE {table} SET {column} = REPLACE({column}, '-', '')")
+    elif vendor == 'mysql':
+        # MySQL will not retype a column a foreign key points at or from;
+        # AlterField re-creates the constraints after the type change.
+        for model, field in columns[1:]:
+            for name in schema_editor._constraint_names(model, [field.column], foreign_key=True):
+                schema_editor.execute(schema_editor._delete_fk_sql(model, name))
+        for model, field in columns:
+            table, column = quote(model._meta.db_table), quote(field.column)
+            schema_editor.execute(f'ALTER TABLE {table} MODIFY {column} varbinary(36) NOT NULL')
+            schema_editor.execute(f"UPDATE {table} SET {column} = UNHEX(REPLACE({column}, '-', ''))")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farmers', '0015_canonical_farmer_ids'),
+    ]
+
+    # Irreversible: the text ids are gone once the columns are packed
+    operations = [
+        migrations.RunPython(pack_ids),
+        migrations.AlterField(
+            model_name='farmer',
+            name='id',
+            field=api.fields.BinaryUUIDField(default=api.fields.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
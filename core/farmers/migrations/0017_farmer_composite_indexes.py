@@ -0,0 +1,48 @@
+# Generated by Django 5.0.2 on 2026-10-17 18:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farmers', '0016_farmer_binary_ids'),
+    ]
+
+    operations = [
+        # New indexes first so the queries they replace always have one
+        migrations.AddIndex(
+            model_name='farmer',
+            index=models.Index(fields=['state', 'district'], name='farmers_state_de4ac7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='farmer',
+            index=models.Index(fields=['sync_status', 'created_at'], name='farmers_sync_st_538e6c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='farmer',
+            index=models.Index(fields=['created_at', 'id'], name='farmers_created_c77966_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='farmer',
+            index=models.Index(fields=['total_co2_emissions', 'id'], name='farmers_total_c_a61fba_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='farmer',
+            name='farmers_state_62ef65_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='farmer',
+            name='farmers_sync_st_8eb14c_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='farmer',
+            name='farmers_total_c_9be00d_idx',
+        ),
+        migrations.AlterField(
+            model_name='farmerimagerendition',
+            name='farmer',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='renditions', to='farmers.farmer'),
+        ),
+    ]
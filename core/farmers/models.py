@@ -1,25 +1,115 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import post_init, pre_save, post_save, post_delete
+from django.dispatch import receiver
 from django.core.validators import RegexValidator
 import uuid
 from decimal import Decimal
+from .emissions import calculate_emissions, parse_decimal, invalidate_summary_cache, SOURCE_FIELDS
+from .search import index_farmers, SEARCH_FIELDS, TOKEN_MAX_LENGTH
+from .media import discard_part
+from .images import IMAGE_FIELDS, schedule_renditions
+from .storage import get_media_storage, retain, release
+from .quantities import QUANTITY_MAX_DIGITS, QUANTITY_DECIMAL_PLACES
+from .sections import SECTIONS, SECTION_OF, split_fields
+from api.fields import BinaryUUIDField, parse_uuid, uuid7
+
+# Persisted emission columns and the survey fields they are derived from
+EMISSION_FIELDS = (
+    'fertilizer_co2_emissions',
+    'pesticide_co2_emissions',
+    'energy_co2_emissions',
+    'irrigation_co2_emissions',
+    'total_co2_emissions',
+)
+EMISSION_SOURCE_FIELDS = SOURCE_FIELDS
+EMISSION_PRECISION = Decimal('0.000001')
+
+# Namespace of the UUIDs migration 0015 gave to legacy ids that are not UUIDs
+LEGACY_ID_NAMESPACE = uuid.UUID('6f1c3a52-9d7e-4b0a-8c5e-2f4d1b7a9e30')
+
+
+def farmer_pk(value):
+    """
+    Primary key of a farmer id sent by a client, or None if it cannot be one.
+    Legacy ids that are not UUIDs map to the UUID5 that migration 0015
+    renamed them to.
+    """
+    if not isinstance(value, (str, int, uuid.UUID)) or isinstance(value, bool) or value == '':
+        return None
+    return parse_uuid(value) or uuid.uuid5(LEGACY_ID_NAMESPACE, str(value))
+
 
 def farmer_photo_path(instance, filename):
-    return f'farmers/{instance.id}/profile/{filename}'
+    return f'farmers/{instance.pk}/profile/{filename}'
 
 def land_photo_path(instance, filename):
-    return f'farmers/{instance.id}/land/{filename}'
+    return f'farmers/{instance.pk}/land/{filename}'
 
 def land_image_path(instance, filename):
-    return f'farmers/{instance.id}/land_image/{filename}'
+    return f'farmers/{instance.pk}/land_image/{filename}'
 
 def soil_characteristics_path(instance, filename):
-    return f'farmers/{instance.id}/soil/{filename}'
+    return f'farmers/{instance.pk}/soil/{filename}'
 
 def fertilizer_photos_path(instance, filename):
-    return f'farmers/{instance.id}/fertilizer/{filename}'
+    return f'farmers/{instance.pk}/fertilizer/{filename}'
 
 def crop_protection_photos_path(instance, filename):
-    return f'farmers/{instance.id}/crop_protection/{filename}'
+    return f'farmers/{instance.pk}/crop_protection/{filename}'
+
+def rendition_path(instance, filename):
+    return f'farmers/{instance.farmer_id}/renditions/{filename}'
+
+def _changed_sections(farmer):
+    return farmer.__dict__.setdefault('_changed_sections', set())
+
+
+class FarmerQuerySet(models.QuerySet):
+    """
+    Farmer queries. ``bulk_create`` and ``bulk_update`` also write the detail
+    rows of the sections changed through the flat attributes.
+    """
+
+    def with_sections(self, *names):
+        """Join the detail rows of the named sections, or of all of them"""
+        return self.select_related(*(names or SECTIONS))
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        with transaction.atomic(using=self.db, savepoint=False):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            for name, model in SECTION_MODELS.items():
+                rows = []
+                for farmer in objs:
+                    if name in _changed_sections(farmer):
+                        section = farmer.get_section(name)
+                        section.farmer = farmer
+                        rows.append(section)
+                        _changed_sections(farmer).discard(name)
+                model.objects.using(self.db).bulk_create(rows, batch_size=kwargs.get('batch_size'))
+        for farmer in objs:
+            farmer.forget_missing_sections()
+        return objs
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        objs = list(objs)
+        core, sections = split_fields(fields)
+        with transaction.atomic(using=self.db, savepoint=False):
+            updated = super().bulk_update(objs, core, batch_size=batch_size) if core else 0
+            for name, section_fields in sections.items():
+                existing, created = [], []
+                for farmer in objs:
+                    if name in _changed_sections(farmer):
+                        section = farmer.get_section(name)
+                        section.farmer = farmer
+                        (created if section._state.adding else existing).append(section)
+                        _changed_sections(farmer).discard(name)
+                manager = SECTION_MODELS[name].objects.using(self.db)
+                if existing:
+                    manager.bulk_update(existing, section_fields, batch_size=batch_size)
+                manager.bulk_create(created, batch_size=batch_size)
+        return updated
+
 
 class Farmer(models.Model):
     SYNC_STATUS_CHOICES = [
@@ -35,7 +125,8 @@ class Farmer(models.Model):
     ]
 
     # Primary and System Fields
-    id = models.CharField(max_length=36, primary_key=True, editable=False)
+    # Time-ordered; clients may also send their own UUID in any spelling
+    id = BinaryUUIDField(primary_key=True, default=uuid7, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     sync_status = models.CharField(max_length=10, choices=SYNC_STATUS_CHOICES, default='pending')
@@ -51,8 +142,6 @@ class Farmer(models.Model):
 
     # Land Information
     acreage = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
-    land_status = models.CharField(max_length=50, null=True, blank=True)
-    product_ids = models.TextField(null=True, blank=True)
 
     # Location Information
     village = models.CharField(max_length=100, null=True, blank=True)
@@ -61,6 +150,142 @@ class Farmer(models.Model):
     state = models.CharField(max_length=50, null=True, blank=True)
     pincode = models.CharField(max_length=10, validators=[RegexValidator(r'^[0-9]{6}$')], null=True, blank=True)
 
+    # CO2 Emissions (kg CO2e), recomputed on save and in bulk write paths
+    fertilizer_co2_emissions = models.DecimalField(max_digits=18, decimal_places=6, default=Decimal('0'), editable=False)
+    pesticide_co2_emissions = models.DecimalField(max_digits=18, decimal_places=6, default=Decimal('0'), editable=False)
+    energy_co2_emissions = models.DecimalField(max_digits=18, decimal_places=6, default=Decimal('0'), editable=False)
+    irrigation_co2_emissions = models.DecimalField(max_digits=18, decimal_places=6, default=Decimal('0'), editable=False)
+    total_co2_emissions = models.DecimalField(max_digits=18, decimal_places=6, default=Decimal('0'), editable=False)
+
+    objects = FarmerQuerySet.as_manager()
+
+    class Meta:
+        db_table = 'farmers'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['farmer_name']),
+            models.Index(fields=['mobile']),
+            models.Index(fields=['govt_id']),
+            models.Index(fields=['district']),
+            # Rollups and filters by state, narrowed by district
+            models.Index(fields=['state', 'district']),
+            # Lists filtered by sync status in the default newest-first order
+            models.Index(fields=['sync_status', 'created_at']),
+            # Default ordering and the keyset pages of /api/farmers/
+            models.Index(fields=['created_at', 'id']),
+            # Keyset cursor used by the mobile change feed
+            models.Index(fields=['updated_at', 'id']),
+            # Keyset pages of ?ordering=total_co2_emissions
+            models.Index(fields=['total_co2_emissions', 'id']),
+        ]
+
+    def __str__(self):
+        return self.farmer_name or str(self.id)
+
+    # Helper function to safely convert string to decimal
+    def safe_decimal(self, value):
+        return parse_decimal(value)
+
+    def refresh_emissions(self):
+        """Recompute the persisted emission columns from the survey fields"""
+        emissions = calculate_emissions(self)
+        total = Decimal('0')
+        for column in EMISSION_FIELDS:
+            if column == 'total_co2_emissions':
+                continue
+            value = emissions[column].quantize(EMISSION_PRECISION)
+            setattr(self, column, value)
+            total += value
+        self.total_co2_emissions = total
+
+    def get_section(self, name):
+        """
+        The detail row of section ``name``. A farmer without one gets a
+        blank row, which is only written once one of its fields is set.
+        """
+        section = None
+        # Rows of an unsaved farmer cannot be in the database yet
+        if not self._state.adding or getattr(type(self), name).is_cached(self):
+            section = getattr(self, name, None)
+        if section is None:
+            section = SECTION_MODELS[name]()
+            setattr(self, name, section)
+        return section
+
+    def save(self, *args, **kwargs):
+        if not self.id:
+            self.id = uuid7()
+
+        update_fields = kwargs.get('update_fields')
+        sections = None
+        if update_fields is None:
+            self.refresh_emissions()
+        else:
+            if set(update_fields) & set(EMISSION_SOURCE_FIELDS):
+                self.refresh_emissions()
+                update_fields = set(update_fields) | set(EMISSION_FIELDS)
+            kwargs['update_fields'], sections = split_fields(update_fields)
+
+        adding = self._state.adding
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+            self.save_sections(sections)
+        if adding:
+            self.forget_missing_sections()
+
+    def save_sections(self, fields=None):
+        """
+        Write the detail rows changed through the flat attributes, or, given
+        ``fields`` as ``{section: field names}``, those columns only.
+        """
+        changed = _changed_sections(self)
+        for name in SECTIONS:
+            if fields is not None:
+                if name not in fields:
+                    continue
+                section_fields = fields[name]
+            elif name in changed:
+                section_fields = None
+            else:
+                continue
+            section = self.get_section(name)
+            section.farmer = self
+            if section._state.adding:
+                section.save(force_insert=True)
+            else:
+                section.save(update_fields=section_fields)
+            changed.discard(name)
+
+
+    def forget_missing_sections(self):
+        """
+        Note that a just created farmer has no detail rows besides the ones
+        written with it, so reading them does not query.
+        """
+        for name in SECTIONS:
+            related = getattr(type(self), name).related
+            if not related.is_cached(self):
+                related.set_cached_value(self, None)
+
+
+class FarmerSection(models.Model):
+    """One-to-one detail table of a farmer, see ``farmers.sections``"""
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return str(self.farmer_id)
+
+
+class FarmerProfile(FarmerSection):
+    """Land, organization and social survey answers"""
+    farmer = models.OneToOneField(Farmer, on_delete=models.CASCADE, primary_key=True, related_name='profile')
+
+    # Land Information
+    land_status = models.CharField(max_length=50, null=True, blank=True)
+    product_ids = models.TextField(null=True, blank=True)
+
     # Organization Information
     has_organization = models.BooleanField(default=False)
     fpo_name = models.CharField(max_length=100, null=True, blank=True)
@@ -76,11 +301,19 @@ class Farmer(models.Model):
     other_source_income = models.CharField(max_length=100, null=True, blank=True)
     total_income = models.CharField(max_length=100, null=True, blank=True)
 
+    class Meta:
+        db_table = 'farmer_profiles'
+
+
+class FarmerCrop(FarmerSection):
+    """Crop and soil survey answers"""
+    farmer = models.OneToOneField(Farmer, on_delete=models.CASCADE, primary_key=True, related_name='crop')
+
     # Crop Information
     crop_name = models.CharField(max_length=100, null=True, blank=True)
-    crop_area = models.CharField(max_length=100, null=True, blank=True)
+    crop_area = models.DecimalField(max_digits=QUANTITY_MAX_DIGITS, decimal_places=QUANTITY_DECIMAL_PLACES, null=True, blank=True)
     crop_area_unit = models.CharField(max_length=10, null=True, blank=True)
-    yield_produced = models.CharField(max_length=100, null=True, blank=True)
+    yield_produced = models.DecimalField(max_digits=QUANTITY_MAX_DIGITS, decimal_places=QUANTITY_DECIMAL_PLACES, null=True, blank=True)
     yield_unit = models.CharField(max_length=10, null=True, blank=True)
     cropping_season = models.CharField(max_length=100, null=True, blank=True)
     cropping_pattern = models.CharField(max_length=100, null=True, blank=True)
@@ -89,25 +322,33 @@ class Farmer(models.Model):
 
     # Soil Characteristics
     soil_type = models.CharField(max_length=100, null=True, blank=True)
-    soil_ph = models.CharField(max_length=20, null=True, blank=True)
-    ec = models.CharField(max_length=20, null=True, blank=True)
+    soil_ph = models.DecimalField(max_digits=QUANTITY_MAX_DIGITS, decimal_places=QUANTITY_DECIMAL_PLACES, null=True, blank=True)
+    ec = models.DecimalField(max_digits=QUANTITY_MAX_DIGITS, decimal_places=QUANTITY_DECIMAL_PLACES, null=True, blank=True)
     ec_unit = models.CharField(max_length=10, null=True, blank=True)
-    organic_carbon = models.CharField(max_length=20, null=True, blank=True)
+    organic_carbon = models.DecimalField(max_digits=QUANTITY_MAX_DIGITS, decimal_places=QUANTITY_DECIMAL_PLACES, null=True, blank=True)
     organic_carbon_unit = models.CharField(max_length=10, null=True, blank=True)
 
+    class Meta:
+        db_table = 'farmer_crops'
+
+
+class FarmerInputs(FarmerSection):
+    """Farm inputs: fertilizer, crop protection, energy, irrigation and transport"""
+    farmer = models.OneToOneField(Farmer, on_delete=models.CASCADE, primary_key=True, related_name='inputs')
+
     # Fertilizer
     fertilizer_type = models.CharField(max_length=100, null=True, blank=True)
-    application_rate = models.CharField(max_length=50, null=True, blank=True)
+    application_rate = models.DecimalField(max_digits=QUANTITY_MAX_DIGITS, decimal_places=QUANTITY_DECIMAL_PLACES, null=True, blank=True)
     application_rate_unit = models.CharField(max_length=20, null=True, blank=True)
 
     # Crop Protection
     pesticide_category = models.CharField(max_length=100, null=True, blank=True)
-    pesticide_application_rate = models.CharField(max_length=50, null=True, blank=True)
+    pesticide_application_rate = models.DecimalField(max_digits=QUANTITY_MAX_DIGITS, decimal_places=QUANTITY_DECIMAL_PLACES, null=True, blank=True)
     pesticide_application_rate_unit = models.CharField(max_length=20, null=True, blank=True)
 
     # Fuel & Energy
     direct_energy_use = models.CharField(max_length=100, null=True, blank=True)
-    energy_used = models.CharField(max_length=50, null=True, blank=True)
+    energy_used = models.DecimalField(max_digits=QUANTITY_MAX_DIGITS, decimal_places=QUANTITY_DECIMAL_PLACES, null=True, blank=True)
     energy_unit = models.CharField(max_length=10, null=True, blank=True)
     energy_category = models.CharField(max_length=50, null=True, blank=True)
 
@@ -115,141 +356,320 @@ class Farmer(models.Model):
     water_source = models.CharField(max_length=100, null=True, blank=True)
     irrigation_method = models.CharField(max_length=100, null=True, blank=True)
     power_source = models.CharField(max_length=100, null=True, blank=True)
-    power_consumption = models.CharField(max_length=50, null=True, blank=True)
+    power_consumption = models.DecimalField(max_digits=QUANTITY_MAX_DIGITS, decimal_places=QUANTITY_DECIMAL_PLACES, null=True, blank=True)
     power_consumption_unit = models.CharField(max_length=10, null=True, blank=True)
 
     # Transport
     transport_activity_type = models.CharField(max_length=100, null=True, blank=True)
     transport_mode = models.CharField(max_length=100, null=True, blank=True)
-    distance = models.CharField(max_length=50, null=True, blank=True)
+    distance = models.DecimalField(max_digits=QUANTITY_MAX_DIGITS, decimal_places=QUANTITY_DECIMAL_PLACES, null=True, blank=True)
     distance_unit = models.CharField(max_length=10, null=True, blank=True)
     fuel_type = models.CharField(max_length=50, null=True, blank=True)
-    fuel_consumption = models.CharField(max_length=50, null=True, blank=True)
+    fuel_consumption = models.DecimalField(max_digits=QUANTITY_MAX_DIGITS, decimal_places=QUANTITY_DECIMAL_PLACES, null=True, blank=True)
     fuel_consumption_unit = models.CharField(max_length=10, null=True, blank=True)
 
+    class Meta:
+        db_table = 'farmer_inputs'
+
+
+class FarmerMedia(FarmerSection):
+    """Survey photos"""
+    farmer = models.OneToOneField(Farmer, on_delete=models.CASCADE, primary_key=True, related_name='media')
+
     # Media Paths
-    farmer_photo = models.ImageField(upload_to=farmer_photo_path, null=True, blank=True)
-    land_photo_1 = models.ImageField(upload_to=land_photo_path, null=True, blank=True)
-    land_photo_2 = models.ImageField(upload_to=land_photo_path, null=True, blank=True)
-    land_photo_3 = models.ImageField(upload_to=land_photo_path, null=True, blank=True)
-    land_photo_4 = models.ImageField(upload_to=land_photo_path, null=True, blank=True)
-    soil_characteristics = models.ImageField(upload_to=soil_characteristics_path, null=True, blank=True)
-    fertilizer_photos = models.ImageField(upload_to=fertilizer_photos_path, null=True, blank=True)
-    crop_protection_photos = models.ImageField(upload_to=crop_protection_photos_path, null=True, blank=True)
+    farmer_photo = models.ImageField(upload_to=farmer_photo_path, storage=get_media_storage, null=True, blank=True)
+    land_photo_1 = models.ImageField(upload_to=land_photo_path, storage=get_media_storage, null=True, blank=True)
+    land_photo_2 = models.ImageField(upload_to=land_photo_path, storage=get_media_storage, null=True, blank=True)
+    land_photo_3 = models.ImageField(upload_to=land_photo_path, storage=get_media_storage, null=True, blank=True)
+    land_photo_4 = models.ImageField(upload_to=land_photo_path, storage=get_media_storage, null=True, blank=True)
+    soil_characteristics = models.ImageField(upload_to=soil_characteristics_path, storage=get_media_storage, null=True, blank=True)
+    fertilizer_photos = models.ImageField(upload_to=fertilizer_photos_path, storage=get_media_storage, null=True, blank=True)
+    crop_protection_photos = models.ImageField(upload_to=crop_protection_photos_path, storage=get_media_storage, null=True, blank=True)
 
     class Meta:
-        db_table = 'farmers'
-        ordering = ['-created_at']
+        db_table = 'farmer_media'
+
+
+SECTION_MODELS = {
+    'profile': FarmerProfile,
+    'crop': FarmerCrop,
+    'inputs': FarmerInputs,
+    'media': FarmerMedia,
+}
+
+
+def farmer_field(name):
+    """Model field behind a flat farmer attribute"""
+    section = SECTION_OF.get(name)
+    model = SECTION_MODELS[section] if section else Farmer
+    return model._meta.get_field(name)
+
+
+def _section_attribute(section, field):
+    def get(self):
+        return getattr(self.get_section(section), field)
+
+    def set(self, value):
+        setattr(self.get_section(section), field, value)
+        _changed_sections(self).add(section)
+
+    return property(get, set)
+
+
+def _add_section_attributes():
+    """Flat attributes for every detail field; Farmer(**kwargs) accepts them too"""
+    for section, fields in SECTIONS.items():
+        for field in fields:
+            setattr(Farmer, field, _section_attribute(section, field))
+
+
+_add_section_attributes()
+
+
+class DeletedFarmer(models.Model):
+    """
+    Tombstone left behind when a farmer is deleted so that mobile clients
+    pulling the change feed can drop their local copy.
+    """
+    farmer_id = models.CharField(max_length=36)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'deleted_farmers'
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.farmer_id} (deleted {self.deleted_at})"
+
+
+class UnparsedQuantity(models.Model):
+    """
+    Free-text survey quantity that did not survive the move to numeric
+    columns (migration 0010), kept as entered so it can be fixed by hand.
+    """
+    farmer = models.ForeignKey(Farmer, on_delete=models.CASCADE, related_name='unparsed_quantities')
+    field = models.CharField(max_length=40)
+    raw_value = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'farmer_unparsed_quantities'
+
+    def __str__(self):
+        return f"{self.farmer_id} {self.field}: {self.raw_value!r}"
+
+
+@receiver(post_delete, sender=Farmer)
+def record_farmer_tombstone(sender, instance, **kwargs):
+    """Signal to record a tombstone when a farmer is deleted"""
+    DeletedFarmer.objects.create(farmer_id=instance.id)
+
+
+class FarmerSearchToken(models.Model):
+    """
+    One normalised token of a searchable farmer field. Prefix lookups on
+    ``token`` are served by its B-tree index.
+    """
+    farmer = models.ForeignKey(Farmer, on_delete=models.CASCADE, related_name='search_tokens')
+    field = models.CharField(max_length=20)
+    token = models.CharField(max_length=TOKEN_MAX_LENGTH, db_index=True)
+
+    class Meta:
+        db_table = 'farmer_search_tokens'
         indexes = [
-            models.Index(fields=['farmer_name']),
-            models.Index(fields=['mobile']),
-            models.Index(fields=['govt_id']),
-            models.Index(fields=['district']),
-            models.Index(fields=['state']),
-            models.Index(fields=['sync_status']),
+            models.Index(fields=['field', 'token']),
         ]
 
     def __str__(self):
-        return self.farmer_name or str(self.id)
+        return f"{self.field}:{self.token}"
 
-    # Helper function to safely convert string to decimal
-    def safe_decimal(self, value):
-        try:
-            return Decimal(value) if value else Decimal('0')
-        except (ValueError, TypeError):
-            return Decimal('0')
-
-    @property
-    def fertilizer_co2_emissions(self):
-        """Calculate fertilizer CO2 emissions"""
-        if not self.fertilizer_type or not self.application_rate:
-            return Decimal('0')
-
-        application_rate = self.safe_decimal(self.application_rate)
-        fertilizer_type = self.fertilizer_type.strip().lower() if self.fertilizer_type else ''
-
-        if 'n' in fertilizer_type and 'application' in fertilizer_type:
-            return (application_rate * Decimal('0.1')) / Decimal('1000')
-        elif ('p' in fertilizer_type or 'k' in fertilizer_type) and 'application' in fertilizer_type:
-            return (application_rate * Decimal('0.2')) / Decimal('1000')
-        elif 'organic' in fertilizer_type:
-            return (application_rate * Decimal('0.6')) / Decimal('1000')
-
-        return Decimal('0')
-
-    @property
-    def pesticide_co2_emissions(self):
-        """Calculate pesticide CO2 emissions"""
-        if not self.pesticide_category or not self.pesticide_application_rate:
-            return Decimal('0')
-
-        pesticide_rate = self.safe_decimal(self.pesticide_application_rate)
-        pesticide_category = self.pesticide_category.strip().lower() if self.pesticide_category else ''
-
-        if 'pesticide' in pesticide_category:
-            return (pesticide_rate * Decimal('5.1')) / Decimal('1000')
-        elif 'fungicide' in pesticide_category:
-            return (pesticide_rate * Decimal('6.3')) / Decimal('1000')
-
-        return Decimal('0')
-
-    @property
-    def energy_co2_emissions(self):
-        """Calculate energy CO2 emissions"""
-        if not self.direct_energy_use or not self.energy_used:
-            return Decimal('0')
-
-        energy_used = self.safe_decimal(self.energy_used)
-        energy_type = self.direct_energy_use.strip().lower() if self.direct_energy_use else ''
-
-        if 'fuelwood' in energy_type:
-            return (energy_used * Decimal('1.8')) / Decimal('1000')
-        elif 'coal' in energy_type:
-            return (energy_used * Decimal('2.5')) / Decimal('1000')
-        elif 'petrol' in energy_type:
-            return (energy_used * Decimal('2.3')) / Decimal('1000')
-        elif 'diesel' in energy_type:
-            return (energy_used * Decimal('2.68')) / Decimal('1000')
-        elif 'electricity' in energy_type or 'grid' in energy_type:
-            return (energy_used * Decimal('0.8')) / Decimal('1000')
-
-        return Decimal('0')
-
-    @property
-    def irrigation_co2_emissions(self):
-        """Calculate irrigation CO2 emissions"""
-        if not self.power_source or not self.power_consumption:
-            return Decimal('0')
-
-        power_consumption = self.safe_decimal(self.power_consumption)
-        power_type = self.power_source.strip().lower() if self.power_source else ''
-
-        if 'fuelwood' in power_type:
-            return (power_consumption * Decimal('1.8')) / Decimal('1000')
-        elif 'coal' in power_type:
-            return (power_consumption * Decimal('2.5')) / Decimal('1000')
-        elif 'petrol' in power_type:
-            return (power_consumption * Decimal('2.3')) / Decimal('1000')
-        elif 'diesel' in power_type:
-            return (power_consumption * Decimal('2.68')) / Decimal('1000')
-        elif 'electricity' in power_type or 'grid' in power_type:
-            return (power_consumption * Decimal('0.8')) / Decimal('1000')
-
-        return Decimal('0')
-
-    @property
-    def total_co2_emissions(self):
-        """Calculate total CO2 emissions"""
-        return (
-            self.fertilizer_co2_emissions +
-            self.pesticide_co2_emissions +
-            self.energy_co2_emissions +
-            self.irrigation_co2_emissions
-        )
 
-    def save(self, *args, **kwargs):
-        if not self.id:
-            self.id = str(uuid.uuid4())
+@receiver(post_save, sender=Farmer)
+def index_farmer_search_tokens(sender, instance, update_fields=None, **kwargs):
+    """Signal to keep the search index in step with saved farmers"""
+    if update_fields is None or set(update_fields) & set(SEARCH_FIELDS):
+        index_farmers([instance])
+
+
+# Farmer columns the emission rollups group or sum by; crop_name, the other
+# grouping, lives in the crop section
+SUMMARY_FIELDS = ('state', 'district', 'mandal', 'village', 'acreage', *EMISSION_FIELDS)
+
+
+def summary_changed(farmer):
+    """
+    Whether writing ``farmer`` can change an emission rollup since its last
+    snapshot. Takes a new snapshot.
+    """
+    current = tuple(farmer.__dict__.get(name) for name in SUMMARY_FIELDS)
+    changed = farmer.__dict__.get('_summary_values') != current
+    farmer._summary_values = current
+    # An unloaded crop section was not changed through the flat attributes
+    crop = Farmer.crop.related.get_cached_value(farmer, default=None)
+    if crop is not None:
+        changed = changed or crop.crop_name != getattr(crop, '_summary_crop_name', None)
+        crop._summary_crop_name = crop.crop_name
+    return changed
+
+
+@receiver(post_init, sender=Farmer)
+def remember_summary_values(sender, instance, **kwargs):
+    """Signal to remember the rollup values a farmer had when loaded"""
+    instance._summary_values = tuple(instance.__dict__.get(name) for name in SUMMARY_FIELDS)
+
+
+@receiver(post_init, sender=FarmerCrop)
+def remember_summary_crop_name(sender, instance, **kwargs):
+    """Signal to remember the crop a section had when loaded"""
+    instance._summary_crop_name = instance.__dict__.get('crop_name')
+
 
-        super().save(*args, **kwargs)
+@receiver(post_save, sender=Farmer)
+def invalidate_farmer_summaries(sender, instance, created, **kwargs):
+    """Signal to drop cached emission rollups when a farmer's rollup values change"""
+    if summary_changed(instance) or created:
+        invalidate_summary_cache()
 
+
+@receiver(post_delete, sender=Farmer)
+def invalidate_deleted_farmer_summaries(sender, instance, **kwargs):
+    """Signal to drop cached emission rollups when a farmer is deleted"""
+    invalidate_summary_cache()
+
+
+class FarmerUploadSession(models.Model):
+    """
+    Resumable chunked upload of one farmer media file. ``received`` is the
+    number of contiguous bytes already stored in the part file.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('complete', 'Complete'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    farmer = models.ForeignKey(Farmer, on_delete=models.CASCADE, related_name='upload_sessions')
+    media_type = models.CharField(max_length=30)
+    filename = models.CharField(max_length=255)
+    total_size = models.PositiveBigIntegerField()
+    received = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'farmer_upload_sessions'
+
+    def __str__(self):
+        return f"{self.farmer_id} {self.media_type} ({self.received}/{self.total_size})"
+
+
+@receiver(post_delete, sender=FarmerUploadSession)
+def discard_upload_part(sender, instance, **kwargs):
+    """Signal to remove the part file of a deleted upload session"""
+    discard_part(instance)
+
+
+class FarmerImageRendition(models.Model):
+    """
+    Resized, metadata-free copy of one farmer photo, e.g. the thumbnail of
+    ``land_photo_1``. ``source`` is the name of the original it was made from.
+    """
+    # The (farmer, field, name) unique index serves lookups by farmer
+    farmer = models.ForeignKey(Farmer, on_delete=models.CASCADE, related_name='renditions', db_index=False)
+    field = models.CharField(max_length=30)
+    name = models.CharField(max_length=20)
+    source = models.CharField(max_length=255)
+    file = models.FileField(upload_to=rendition_path, max_length=255)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'farmer_image_renditions'
+        unique_together = ('farmer', 'field', 'name')
+
+    def __str__(self):
+        return f"{self.farmer_id} {self.field} {self.name} ({self.width}x{self.height})"
+
+
+@receiver(pre_save, sender=FarmerMedia)
+def detect_new_photos(sender, instance, **kwargs):
+    """Signal to note which image fields hold newly assigned files"""
+    deferred = instance.get_deferred_fields()
+    instance._new_photos = [
+        field for field in IMAGE_FIELDS
+        if field not in deferred and getattr(instance, field) and not getattr(instance, field)._committed
+    ]
+
+
+@receiver(post_save, sender=FarmerMedia)
+def process_new_photos(sender, instance, **kwargs):
+    """Signal to queue renditions for newly stored photos"""
+    if getattr(instance, '_new_photos', None):
+        schedule_renditions(instance, instance._new_photos)
+
+
+@receiver(post_delete, sender=FarmerImageRendition)
+def delete_rendition_file(sender, instance, **kwargs):
+    """Signal to remove the stored file of a deleted rendition"""
+    instance.file.delete(save=False)
+
+
+class MediaBlob(models.Model):
+    """
+    One stored file of the content-addressed media storage. ``refcount`` is
+    the number of farmer image fields that point at ``name``; pinned blobs
+    were handed out by URL only and are never garbage collected.
+    """
+    digest = models.CharField(max_length=64, primary_key=True)
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField(default=0)
+    refcount = models.PositiveIntegerField(default=0)
+    pinned = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'media_blobs'
+
+    def __str__(self):
+        return f"{self.name} ({self.refcount} refs)"
+
+
+def _media_names(instance):
+    """Stored file names of the loaded (non-deferred) image fields"""
+    names = {}
+    for field in IMAGE_FIELDS:
+        if field in instance.__dict__:
+            value = instance.__dict__[field]
+            names[field] = getattr(value, 'name', value) or None
+    return names
+
+
+@receiver(post_init, sender=FarmerMedia)
+def remember_media_names(sender, instance, **kwargs):
+    """Signal to remember which files a farmer pointed at when loaded"""
+    instance._media_names = _media_names(instance)
+
+
+@receiver(post_save, sender=FarmerMedia)
+def count_media_references(sender, instance, update_fields=None, **kwargs):
+    """Signal to move blob references when image fields change"""
+    loaded = getattr(instance, '_media_names', {})
+    current = _media_names(instance)
+    for field, name in current.items():
+        if update_fields is not None and field not in update_fields:
+            continue
+        if name != loaded.get(field):
+            retain(name)
+            release(loaded.get(field))
+            loaded[field] = name
+    instance._media_names = loaded
+
+
+@receiver(post_delete, sender=FarmerMedia)
+def release_media_references(sender, instance, **kwargs):
+    """Signal to drop the blob references of a deleted farmer"""
+    for name in getattr(instance, '_media_names', {}).values():
+        release(name)
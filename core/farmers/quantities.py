@@ -0,0 +1,102 @@
+"""
+Typed survey quantities.
+
+Amounts such as ``crop_area`` or ``application_rate`` are stored as
+``DecimalField`` columns, with their unit in a separate ``*_unit`` column
+spelled one canonical way (``kg``, ``acre``, ``kwh`` ...). The mobile app and
+older records send them as free text like ``"1,200 kg"``; ``parse_quantity``
+splits such text into the number and the unit.
+
+Values are not converted between units: the emission factors are applied to
+the amount as entered, so converting would change the reported emissions.
+"""
+import re
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+# Quantity field -> the field holding its unit, if any
+QUANTITY_FIELDS = {
+    'crop_area': 'crop_area_unit',
+    'yield_produced': 'yield_unit',
+    'soil_ph': None,
+    'ec': 'ec_unit',
+    'organic_carbon': 'organic_carbon_unit',
+    'application_rate': 'application_rate_unit',
+    'pesticide_application_rate': 'pesticide_application_rate_unit',
+    'energy_used': 'energy_unit',
+    'power_consumption': 'power_consumption_unit',
+    'distance': 'distance_unit',
+    'fuel_consumption': 'fuel_consumption_unit',
+}
+
+QUANTITY_MAX_DIGITS = 14
+QUANTITY_DECIMAL_PLACES = 4
+QUANTITY_PRECISION = Decimal('0.0001')
+
+# Canonical unit -> spellings seen in survey data
+UNIT_ALIASES = {
+    'acre': ('acre', 'acres', 'ac'),
+    'ha': ('ha', 'hectare', 'hectares'),
+    'g': ('g', 'gm', 'gms', 'gram', 'grams'),
+    'kg': ('kg', 'kgs', 'kilo', 'kilos', 'kilogram', 'kilograms'),
+    'quintal': ('q', 'qtl', 'qtls', 'quintal', 'quintals'),
+    't': ('t', 'mt', 'ton', 'tons', 'tonne', 'tonnes'),
+    'ml': ('ml', 'millilitre', 'millilitres', 'milliliter', 'milliliters'),
+    'l': ('l', 'lt', 'ltr', 'ltrs', 'litre', 'litres', 'liter', 'liters'),
+    'kwh': ('kwh', 'unit', 'units'),
+    'km': ('km', 'kms', 'kilometre', 'kilometres', 'kilometer', 'kilometers'),
+    'ds/m': ('ds/m', 'dsm'),
+    'ms/cm': ('ms/cm', 'mscm'),
+    '%': ('%', 'percent', 'pct'),
+    'kg/acre': ('kg/acre', 'kg/ac', 'kgs/acre', 'kg per acre'),
+    'kg/ha': ('kg/ha', 'kgs/ha', 'kg per ha', 'kg/hectare'),
+    'l/acre': ('l/acre', 'ltr/acre', 'litre/acre', 'l per acre'),
+    'l/ha': ('l/ha', 'ltr/ha', 'litre/ha', 'l per ha'),
+}
+_UNITS = {alias: unit for unit, aliases in UNIT_ALIASES.items() for alias in aliases}
+
+# A number, optionally with thousands separators, then an optional unit
+_QUANTITY = re.compile(r'^([-+]?(?:\d+(?:\.\d*)?|\.\d+))\s*([^\d]*)$')
+_THOUSANDS = re.compile(r'(?<=\d),(?=\d)')
+
+
+def normalize_unit(value):
+    """Canonical spelling of a unit; unknown units are only trimmed"""
+    if not value:
+        return value
+    text = ' '.join(str(value).split())
+    return _UNITS.get(text.lower().rstrip('.'), text)
+
+
+def to_quantity(value):
+    """
+    Round a number to the precision of the quantity columns. Raises
+    ValueError if it does not fit.
+    """
+    try:
+        value = Decimal(value).quantize(QUANTITY_PRECISION, rounding=ROUND_HALF_UP)
+    except InvalidOperation:
+        raise ValueError(f'{value!r} is not a finite number')
+    if len(value.as_tuple().digits) > QUANTITY_MAX_DIGITS:
+        raise ValueError(f'{value} does not fit a quantity column')
+    return value
+
+
+def parse_quantity(value):
+    """
+    Split a survey value into ``(Decimal, unit)``. Blank values give
+    ``(None, None)`` and the unit is None when the text has none. Raises
+    ValueError for text that is not a single number.
+    """
+    if value is None:
+        return None, None
+    if isinstance(value, bool):
+        raise ValueError(f'{value!r} is not a number')
+    if isinstance(value, (int, float, Decimal)):
+        return to_quantity(str(value)), None
+    text = _THOUSANDS.sub('', str(value).strip())
+    if not text:
+        return None, None
+    match = _QUANTITY.match(text)
+    if match is None:
+        raise ValueError(f'{value!r} is not a number')
+    return to_quantity(match.group(1)), normalize_unit(match.group(2)) or None
@@ -0,0 +1,70 @@
+"""
+Prefix/token search over farmer names and locations.
+
+Searchable values are split into normalised tokens stored in the indexed
+``farmer_search_tokens`` table, so ``?q=ravi kum`` becomes one indexed
+``token LIKE 'ravi%'`` range scan per query token instead of a
+``LIKE '%ravi%'`` scan over the whole farmers table.
+"""
+import re
+import unicodedata
+
+# Farmer fields that are tokenised into the search index
+SEARCH_FIELDS = ('farmer_name', 'village', 'mandal', 'district', 'state', 'mobile', 'govt_id')
+TOKEN_MAX_LENGTH = 50
+INDEX_BATCH_SIZE = 1000
+
+_SEPARATORS = re.compile(r"[\s.,;:!?/\\()\[\]{}'\"`\-_#&+*|@]+")
+
+
+def tokenize(value):
+    """Split a value into lowercased, de-duplicated search tokens"""
+    if not value:
+        return []
+    text = unicodedata.normalize('NFKC', str(value)).lower()
+    tokens = []
+    for token in _SEPARATORS.split(text):
+        token = token[:TOKEN_MAX_LENGTH]
+        if token and token not in tokens:
+            tokens.append(token)
+    return tokens
+
+
+def tokens_for(farmer):
+    """Yield ``(field, token)`` pairs for a farmer"""
+    for field in SEARCH_FIELDS:
+        for token in tokenize(getattr(farmer, field)):
+            yield field, token
+
+
+def index_farmers(farmers, batch_size=INDEX_BATCH_SIZE):
+    """Replace the search tokens of the given farmers"""
+    from .models import FarmerSearchToken
+
+    farmers = list(farmers)
+    if not farmers:
+        return
+    FarmerSearchToken.objects.filter(farmer_id__in=[farmer.id for farmer in farmers]).delete()
+    FarmerSearchToken.objects.bulk_create(
+        [
+            FarmerSearchToken(farmer_id=farmer.id, field=field, token=token)
+            for farmer in farmers
+            for field, token in tokens_for(farmer)
+        ],
+        batch_size=batch_size,
+    )
+
+
+def search(queryset, query, field=None):
+    """
+    Filter a farmer queryset to rows where every token of ``query`` is a
+    prefix of some indexed token, optionally restricted to one field.
+    """
+    from .models import FarmerSearchToken
+
+    for token in tokenize(query):
+        matches = FarmerSearchToken.objects.filter(token__startswith=token)
+        if field:
+            matches = matches.filter(field=field)
+        queryset = queryset.filter(id__in=matches.values('farmer_id'))
+    return queryset
@@ -0,0 +1,77 @@
+"""
+Vertical split of the farmer record.
+
+The ``farmers`` table keeps the columns that rosters, search, the change
+feed and the rollups read: identity, location, acreage, sync state and the
+emission totals. The survey answers live in one-to-one detail tables, one
+per group of survey sections, so that list and join queries only read the
+narrow core row.
+
+``Farmer`` exposes every detail field as a plain attribute, and its
+``save()`` and its manager's ``bulk_create``/``bulk_update`` write the detail
+rows too, so code and serializers can keep treating a farmer as one flat
+record. ORM lookups on detail fields have to name the section, which
+``section_lookup`` does.
+"""
+from .images import IMAGE_FIELDS
+
+# Reverse accessor of each detail table -> its fields
+SECTIONS = {
+    # Land, organization and social information
+    'profile': (
+        'land_status', 'product_ids',
+        'has_organization', 'fpo_name', 'fpg_name', 'fpg_id',
+        'category', 'literacy', 'children', 'livelihood', 'annual_income', 'other_source_income', 'total_income',
+    ),
+    # Crop information and soil characteristics
+    'crop': (
+        'crop_name', 'crop_area', 'crop_area_unit', 'yield_produced', 'yield_unit', 'cropping_season',
+        'cropping_pattern', 'farming_practice', 'agriculture_crop_type',
+        'soil_type', 'soil_ph', 'ec', 'ec_unit', 'organic_carbon', 'organic_carbon_unit',
+    ),
+    # Fertilizer, crop protection, energy, irrigation and transport; the
+    # emission sources, so scoring reads a single detail table
+    'inputs': (
+        'fertilizer_type', 'application_rate', 'application_rate_unit',
+        'pesticide_category', 'pesticide_application_rate', 'pesticide_application_rate_unit',
+        'direct_energy_use', 'energy_used', 'energy_unit', 'energy_category',
+        'water_source', 'irrigation_method', 'power_source', 'power_consumption', 'power_consumption_unit',
+        'transport_activity_type', 'transport_mode', 'distance', 'distance_unit',
+        'fuel_type', 'fuel_consumption', 'fuel_consumption_unit',
+    ),
+    'media': IMAGE_FIELDS,
+}
+
+# Detail field -> accessor of the section holding it
+SECTION_OF = {field: section for section, fields in SECTIONS.items() for field in fields}
+
+
+def section_lookup(field, prefix=''):
+    """ORM path of a flat farmer field, e.g. ``crop__crop_name`` for ``crop_name``"""
+    section = SECTION_OF.get(field)
+    return f'{prefix}{section}__{field}' if section else f'{prefix}{field}'
+
+
+def split_fields(fields):
+    """
+    Split flat field names into ``(core fields, {section: fields})``.
+    Changing a detail field also stamps the farmer's ``updated_at`` so the
+    change feed picks it up.
+    """
+    core = set()
+    sections = {}
+    for field in fields:
+        section = SECTION_OF.get(field)
+        if section is None:
+            core.add(field)
+        else:
+            sections.setdefault(section, set()).add(field)
+    if sections:
+        core.add('updated_at')
+    return core, sections
+
+
+def sections_for(fields):
+    """Sections needed to read the given flat fields, in declaration order"""
+    needed = {SECTION_OF[field] for field in fields if field in SECTION_OF}
+    return [section for section in SECTIONS if section in needed]
@@ -1,9 +1,48 @@
 from rest_framework import serializers
-from .models import Farmer
+from .models import Farmer, FarmerUploadSession, farmer_field
+from .media import MEDIA_TYPE_FIELDS, max_upload_size
+from .quantities import QUANTITY_FIELDS, normalize_unit, parse_quantity
+from .sections import SECTION_OF
 
 # Add your serializers here 
 
-class FarmerSerializer(serializers.ModelSerializer):
+class SparseFieldsetMixin:
+    """
+    Lets callers restrict the serialized fields with ``fields=[...]`` and/or
+    drop some with ``omit=[...]``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        omit = kwargs.pop('omit', None)
+        super().__init__(*args, **kwargs)
+
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        for name in omit or ():
+            self.fields.pop(name, None)
+
+
+class QuantityField(serializers.DecimalField):
+    """
+    Decimal field that also takes the free text older app versions send:
+    blanks mean null, "1,200 kg" means 1200 and extra decimals are rounded.
+    """
+
+    def to_internal_value(self, data):
+        try:
+            value = parse_quantity(data)[0]
+        except ValueError:
+            self.fail('invalid')
+        if value is None:
+            if not self.allow_null:
+                self.fail('null')
+            return None
+        return super().to_internal_value(value)
+
+
+class FarmerSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     id = serializers.CharField(read_only=True)  # Explicitly define 'id' as read-only
 
     # Add calculated CO2 emissions fields
@@ -13,6 +52,9 @@ class FarmerSerializer(serializers.ModelSerializer):
     irrigation_co2_emissions = serializers.SerializerMethodField()
     total_co2_emissions = serializers.SerializerMethodField()
 
+    # Thumbnail URL of each processed photo, keyed by image field
+    thumbnails = serializers.SerializerMethodField()
+
     class Meta:
         model = Farmer
         fields = '__all__'
@@ -20,6 +62,38 @@ class FarmerSerializer(serializers.ModelSerializer):
         # 'created_at' and 'updated_at' are still handled here.
         read_only_fields = ('created_at', 'updated_at')
 
+    def get_field_names(self, declared_fields, info):
+        names = super().get_field_names(declared_fields, info)
+        # Detail fields of the farmer sections are served flat
+        if self.Meta.fields == serializers.ALL_FIELDS:
+            names = [*names, *SECTION_OF]
+        return names
+
+    def build_field(self, field_name, info, model_class, nested_depth):
+        if field_name in SECTION_OF:
+            return self.build_standard_field(field_name, farmer_field(field_name))
+        return super().build_field(field_name, info, model_class, nested_depth)
+
+    def build_standard_field(self, field_name, model_field):
+        field_class, field_kwargs = super().build_standard_field(field_name, model_field)
+        if field_name in QUANTITY_FIELDS:
+            field_class = QuantityField
+        return field_class, field_kwargs
+
+    def validate(self, attrs):
+        initial = getattr(self, 'initial_data', {})
+        for field, unit_field in QUANTITY_FIELDS.items():
+            if not unit_field:
+                continue
+            if attrs.get(unit_field):
+                attrs[unit_field] = normalize_unit(attrs[unit_field])
+            elif field in attrs and unit_field not in attrs and isinstance(initial.get(field), str):
+                # Keep the unit of a value sent as "12 kg"
+                unit = parse_quantity(initial[field])[1]
+                if unit and len(unit) <= farmer_field(unit_field).max_length:
+                    attrs[unit_field] = unit
+        return attrs
+
     def get_fertilizer_co2_emissions(self, obj):
         return str(obj.fertilizer_co2_emissions)
 
@@ -33,4 +107,39 @@ class FarmerSerializer(serializers.ModelSerializer):
         return str(obj.irrigation_co2_emissions)
 
     def get_total_co2_emissions(self, obj):
-        return str(obj.total_co2_emissions) 
\ No newline at end of file
+        return str(obj.total_co2_emissions)
+
+    def get_thumbnails(self, obj):
+        # Served from the prefetch cache when the view prefetches renditions
+        request = self.context.get('request')
+        return {
+            rendition.field: request.build_absolute_uri(rendition.file.url) if request else rendition.file.url
+            for rendition in obj.renditions.all()
+            if rendition.name == 'thumbnail'
+        } 
+
+
+class FarmerUploadSessionSerializer(serializers.ModelSerializer):
+    # Optional SHA-256 of the file; if it is already stored the upload is skipped
+    sha256 = serializers.RegexField(r'^[0-9a-fA-F]{64}$', required=False, write_only=True)
+
+    class Meta:
+        model = FarmerUploadSession
+        fields = ('id', 'farmer', 'media_type', 'filename', 'total_size', 'received', 'status', 'created_at', 'sha256')
+        read_only_fields = ('received', 'status', 'created_at')
+
+    def create(self, validated_data):
+        validated_data.pop('sha256', None)
+        return super().create(validated_data)
+
+    def validate_media_type(self, value):
+        if value not in MEDIA_TYPE_FIELDS:
+            raise serializers.ValidationError('Invalid media type')
+        return value
+
+    def validate_total_size(self, value):
+        if value < 1:
+            raise serializers.ValidationError('File is empty')
+        if value > max_upload_size():
+            raise serializers.ValidationError(f'File exceeds the {max_upload_size()} byte limit')
+        return value
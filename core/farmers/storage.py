@@ -0,0 +1,101 @@
+"""
+Content-addressed storage for farmer photos.
+
+Files are named after the SHA-256 of their bytes (``blobs/ab/cd/<digest>.jpg``)
+so a photo that is uploaded again, by a retried sync or for another farmer,
+is stored once. ``MediaBlob`` rows map digests to stored names and count how
+many farmer fields point at each blob; ``gc_media_blobs`` removes blobs that
+are no longer referenced.
+"""
+import hashlib
+import os
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+BLOB_PREFIX = 'blobs'
+
+
+def blob_name(digest, filename):
+    extension = os.path.splitext(filename)[1].lower()
+    return f'{BLOB_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}{extension}'
+
+
+def file_digest(content):
+    """SHA-256 hex digest of a Django File, read in chunks"""
+    sha256 = hashlib.sha256()
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    for chunk in content.chunks():
+        sha256.update(chunk)
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    return sha256.hexdigest()
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    FileSystemStorage that ignores the requested path and stores content
+    under its digest. Saving bytes that are already stored returns the
+    existing name without writing anything.
+
+    ``delete()`` does not remove blobs, because other rows may share them;
+    unreferenced blobs are removed by ``purge()`` from ``gc_media_blobs``.
+    """
+
+    def _save(self, name, content):
+        from .models import MediaBlob
+
+        digest = file_digest(content)
+        blob = MediaBlob.objects.filter(digest=digest).first()
+        if blob is not None and self.exists(blob.name):
+            return blob.name
+
+        name = blob_name(digest, name)
+        # The file may be left over from a rolled back transaction; its name
+        # guarantees the content is the same
+        if not self.exists(name):
+            name = super()._save(name, content)
+        try:
+            with transaction.atomic():
+                MediaBlob.objects.update_or_create(digest=digest, defaults={'name': name, 'size': content.size})
+        except IntegrityError:
+            # A concurrent upload of the same bytes registered it first
+            return MediaBlob.objects.get(digest=digest).name
+        return name
+
+    def delete(self, name):
+        pass
+
+    def purge(self, name):
+        super().delete(name)
+
+
+def get_media_storage():
+    return media_storage
+
+
+media_storage = ContentAddressedStorage()
+
+
+def retain(name):
+    """Count one more reference to the blob stored as ``name``"""
+    from .models import MediaBlob
+
+    if name:
+        MediaBlob.objects.filter(name=name).update(refcount=F('refcount') + 1)
+
+
+def release(name):
+    """Drop one reference to the blob stored as ``name``"""
+    from .models import MediaBlob
+
+    if name:
+        MediaBlob.objects.filter(name=name, refcount__gt=0).update(refcount=F('refcount') - 1)
+
+
+def pin(name):
+    """Keep a blob that is referenced by URL rather than by a farmer field"""
+    from .models import MediaBlob
+
+    MediaBlob.objects.filter(name=name).update(pinned=True)
@@ -0,0 +1,146 @@
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from django.db.models.fields.files import FileField
+from django.utils import timezone
+from .emissions import invalidate_summary_cache
+from .models import Farmer, EMISSION_FIELDS, farmer_field, farmer_pk, summary_changed
+from .search import index_farmers
+from .serializer import FarmerSerializer
+from farmer_mappings.stats import apply_farmer_deltas, farmer_deltas
+
+# Number of rows written per INSERT/UPDATE statement
+SYNC_BATCH_SIZE = 500
+
+
+class FarmerBulkUpsert:
+    """
+    Set-based upsert of a batch of farmer records coming from the mobile app.
+
+    Existing rows are loaded with a single ``in_bulk`` query, every item is
+    validated in memory and the writes are issued with chunked
+    ``bulk_create``/``bulk_update`` calls inside one transaction.
+    Per-item errors are collected so the view can keep reporting a 207
+    multi-status response.
+    """
+
+    def __init__(self, items, batch_size=SYNC_BATCH_SIZE):
+        self.items = items
+        self.batch_size = batch_size
+        self.errors = []
+        self.saved = []
+
+    def run(self):
+        # Client ids may come in any UUID spelling, or be a legacy id that
+        # migration 0015 renamed; rows are keyed by the UUID
+        ids = [farmer_pk(item.get('id')) for item in self.items if isinstance(item, dict) and item.get('id')]
+        existing = Farmer.objects.with_sections().in_bulk({farmer_id for farmer_id in ids if farmer_id})
+
+        # Farmers keyed by id, in the order they were first seen in the batch
+        pending = {}
+        created_ids = set()
+        update_fields = set()
+        # Items that carry uploaded files need the regular save() path so the
+        # storage backend gets a chance to commit the file.
+        file_items = []
+
+        for item in self.items:
+            raw_id = item.get('id') if isinstance(item, dict) else None
+            if not raw_id:
+                self.errors.append({"detail": "Missing 'id' in farmer data object.", "data": item})
+                continue
+            farmer_id = farmer_pk(raw_id)
+            if farmer_id is None:
+                self.errors.append({"id": raw_id, "errors": {"id": ["Must be a UUID or a legacy farmer id."]}})
+                continue
+
+            instance = pending.get(farmer_id) or existing.get(farmer_id)
+            if instance is not None:
+                serializer = FarmerSerializer(instance, data=item, partial=True)  # partial=True for updates
+            else:
+                serializer = FarmerSerializer(data=item)
+
+            if not serializer.is_valid():
+                self.errors.append({"id": farmer_id, "errors": serializer.errors})
+                continue
+
+            data = serializer.validated_data
+            if any(isinstance(farmer_field(name), FileField) for name in data):
+                file_items.append((farmer_id, serializer))
+                continue
+
+            if instance is None:
+                instance = Farmer(id=farmer_id)
+                created_ids.add(farmer_id)
+            for attr, value in data.items():
+                setattr(instance, attr, value)
+            if farmer_id not in created_ids:
+                update_fields.update(data.keys())
+            pending[farmer_id] = instance
+
+        with transaction.atomic():
+            self._write(pending, created_ids, update_fields)
+            self._write_files(file_items)
+            # Bulk writes send no post_save signals
+            index_farmers(self.saved)
+            apply_farmer_deltas(farmer_deltas(self.saved))
+            # Most syncs only touch survey answers the rollups never read
+            changed = [summary_changed(farmer) for farmer in self.saved]
+            if any(changed) or created_ids:
+                transaction.on_commit(invalidate_summary_cache)
+
+        # Report saved farmers in the order they were sent
+        position = {farmer_id: index for index, farmer_id in reversed(list(enumerate(ids)))}
+        self.saved.sort(key=lambda farmer: position.get(farmer.id, len(ids)))
+        return self
+
+    def _write(self, pending, created_ids, update_fields):
+        to_create = [farmer for farmer_id, farmer in pending.items() if farmer_id in created_ids]
+        to_update = [farmer for farmer_id, farmer in pending.items() if farmer_id not in created_ids]
+        # Bulk writes bypass Farmer.save(), so derived columns are filled here
+        for farmer in pending.values():
+            farmer.refresh_emissions()
+        now = timezone.now()
+        for farmer in to_update:
+            # bulk_update() does not run auto_now, so stamp the row ourselves
+            farmer.updated_at = now
+        fields = sorted(update_fields | {'updated_at'} | set(EMISSION_FIELDS))
+
+        for start in range(0, len(to_create), self.batch_size):
+            self._write_chunk(to_create[start:start + self.batch_size], created=True)
+        for start in range(0, len(to_update), self.batch_size):
+            self._write_chunk(to_update[start:start + self.batch_size], created=False, fields=fields)
+
+    def _write_chunk(self, farmers, created, fields=None):
+        try:
+            with transaction.atomic():
+                if created:
+                    Farmer.objects.bulk_create(farmers)
+                else:
+                    Farmer.objects.bulk_update(farmers, fields)
+            self.saved.extend(farmers)
+        except Exception:
+            # Fall back to row-by-row writes so the failing items can be
+            # reported individually instead of failing the whole chunk.
+            for farmer in farmers:
+                try:
+                    with transaction.atomic():
+                        if created:
+                            farmer.save(force_insert=True)
+                        else:
+                            farmer.save(update_fields=fields)
+                    self.saved.append(farmer)
+                except Exception as e_save:
+                    self.errors.append({"id": farmer.id, "errors": str(e_save)})
+
+    def _write_files(self, file_items):
+        for farmer_id, serializer in file_items:
+            try:
+                with transaction.atomic():
+                    self.saved.append(serializer.save(id=farmer_id))
+            except Exception as e_save:
+                self.errors.append({"id": farmer_id, "errors": str(e_save)})
+
+    @property
+    def saved_data(self):
+        prefetch_related_objects(self.saved, 'renditions')
+        return FarmerSerializer(self.saved, many=True).data
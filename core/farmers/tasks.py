@@ -0,0 +1,22 @@
+"""Background job handlers of the farmers app; see jobs.queue"""
+from jobs.queue import task
+from .images import submit_renditions
+from .sync import FarmerBulkUpsert
+
+
+@task('farmers.sync')
+def sync_farmers(farmers_data):
+    """Upsert a batch sent to /api/farmers/sync/?async=true"""
+    upsert = FarmerBulkUpsert(farmers_data).run()
+    return {
+        "message": f"{len(upsert.saved)} farmers synced successfully, {len(upsert.errors)} failed.",
+        "saved_farmers": [str(farmer.pk) for farmer in upsert.saved],
+        "errors": upsert.errors if upsert.errors else None,
+    }
+
+
+@task('farmers.renditions')
+def render_farmer_images(payload):
+    """Renditions of photos stored while FARMER_IMAGE_JOBS is on"""
+    images = [(field, source) for field, source in payload['images']]
+    submit_renditions(payload['farmer_id'], images, inline=True)
@@ -0,0 +1,328 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from importlib import import_module
+from io import StringIO
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from companies.models import Company
+from farmer_mappings.models import FarmerMapping
+from farmers.models import DeletedFarmer, Farmer, MediaBlob, farmer_pk
+from farmers.storage import media_storage, pin
+from farmers.sync import FarmerBulkUpsert
+
+
+class FarmerAPITestCase(TestCase):
+    """Requests made as an admin user"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_user(email='admin@example.com', password='pw', role='admin')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+
+class FarmerEmissionFilterTests(FarmerAPITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # 100 kg of organic fertilizer at 0.6 kg CO2e per kg
+        cls.high = Farmer.objects.create(farmer_name='High', fertilizer_type='organic', application_rate='100')
+        cls.low = Farmer.objects.create(farmer_name='Low')
+
+    def test_range_filters(self):
+        self.assertEqual(self.high.total_co2_emissions, Decimal('0.06'))
+        response = self.client.get('/api/farmers/', {'min_emissions': '0.01'})
+        self.assertEqual([row['farmer_name'] for row in response.data], ['High'])
+        response = self.client.get('/api/farmers/', {'max_emissions': '0.01'})
+        self.assertEqual([row['farmer_name'] for row in response.data], ['Low'])
+
+    def test_invalid_bounds_are_rejected(self):
+        for params in ({'min_emissions': 'abc'}, {'max_emissions': 'NaN'}):
+            response = self.client.get('/api/farmers/', params)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(next(iter(params)), response.data)
+
+
+class LegacyFarmerIdTests(FarmerAPITestCase):
+    """Ids that predate UUID keys resolve to the UUID migration 0015 gave them"""
+
+    def test_legacy_id_maps_like_the_migration(self):
+        migration = import_module('farmers.migrations.0015_canonical_farmer_ids')
+        self.assertEqual(str(farmer_pk('F-0042')), migration.canonical_id('F-0042'))
+        self.assertEqual(farmer_pk(' 0190B1E2-7A4C-7D3E-9F10-2B3C4D5E6F70 '),
+                         uuid.UUID('0190b1e2-7a4c-7d3e-9f10-2b3c4d5e6f70'))
+
+    def test_sync_and_lookup_by_legacy_id(self):
+        farmer = Farmer.objects.create(id=farmer_pk('F-0042'), farmer_name='Old')
+        response = self.client.post('/api/farmers/sync/', [{'id': 'F-0042', 'farmer_name': 'Renamed'}], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['saved_farmers'][0]['id'], str(farmer.id))
+        self.assertEqual(Farmer.objects.count(), 1)
+
+        response = self.client.get('/api/farmers/F-0042/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['farmer_name'], 'Renamed')
+        self.assertEqual(self.client.get('/api/farmers/F-0043/').status_code, 404)
+
+
+class EmissionsSummaryTests(FarmerAPITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # 0.06 kg CO2e each; only one farmer reports an acreage
+        for name, acreage in (('Asha', Decimal('2.00')), ('Ravi', None)):
+            Farmer.objects.create(farmer_name=name, state='Telangana', acreage=acreage,
+                                  fertilizer_type='organic', application_rate='100')
+
+    def test_per_acre_intensity_covers_farmers_with_acreage(self):
+        response = self.client.get('/api/farmers/emissions/summary/', {'group_by': 'state'})
+        self.assertEqual(response.status_code, 200)
+        [row] = response.data['results']
+        self.assertEqual(row['farmer_count'], 2)
+        self.assertEqual(row['total_co2_emissions'], '0.120000')
+        self.assertEqual(row['total_acreage'], '2.00')
+        self.assertEqual(row['emissions_per_acre'], '0.030000')
+
+    def test_company_rows_use_the_same_coverage(self):
+        company = Company.objects.create(name='Acme', email='acme@example.com')
+        for farmer in Farmer.objects.all():
+            FarmerMapping.objects.create(farmer=farmer, company=company, status='active')
+        response = self.client.get('/api/farmers/emissions/summary/', {'group_by': 'company'})
+        [row] = response.data['results']
+        self.assertEqual(row['emissions_per_acre'], '0.030000')
+
+
+class FarmerChangesTests(FarmerAPITestCase):
+    """Change feed paging, tombstones and the settle window"""
+
+    def setUp(self):
+        super().setUp()
+        self.now = timezone.now()
+
+    def make_farmer(self, name, seconds_ago):
+        farmer = Farmer.objects.create(farmer_name=name)
+        Farmer.objects.filter(pk=farmer.pk).update(updated_at=self.now - timedelta(seconds=seconds_ago))
+        return farmer
+
+    def pull(self, cursor=None, **params):
+        if cursor:
+            params['since'] = cursor
+        response = self.client.get('/api/farmers/changes/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_cursor_pages_through_ties_once(self):
+        # Same updated_at for all three: the id breaks the tie
+        farmers = [self.make_farmer(f'Farmer {index}', 120) for index in range(3)]
+        first = self.pull(limit=2)
+        self.assertTrue(first['has_more'])
+        second = self.pull(first['cursor'], limit=2)
+        self.assertFalse(second['has_more'])
+        seen = [row['id'] for row in first['changes'] + second['changes']]
+        self.assertEqual(seen, sorted(str(farmer.id) for farmer in farmers))
+        self.assertEqual(self.pull(second['cursor'])['changes'], [])
+
+    def test_tombstones_are_sent_once(self):
+        farmer = self.make_farmer('Gone', 120)
+        cursor = self.pull()['cursor']
+        farmer_id = farmer.id
+        farmer.delete()
+        DeletedFarmer.objects.update(deleted_at=self.now - timedelta(seconds=60))
+
+        page = self.pull(cursor)
+        self.assertEqual([uuid.UUID(str(row['id'])) for row in page['deleted']], [farmer_id])
+        self.assertEqual(self.pull(page['cursor'])['deleted'], [])
+
+    @override_settings(FARMER_CHANGES_SETTLE_SECONDS=30)
+    def test_recent_rows_wait_for_the_settle_window(self):
+        self.make_farmer('Settled', 120)
+        recent = self.make_farmer('Recent', 5)
+        page = self.pull()
+        self.assertEqual([row['farmer_name'] for row in page['changes']], ['Settled'])
+
+        # Once the window has passed the row is sent from the same cursor
+        Farmer.objects.filter(pk=recent.pk).update(updated_at=self.now - timedelta(seconds=40))
+        page = self.pull(page['cursor'])
+        self.assertEqual([row['farmer_name'] for row in page['changes']], ['Recent'])
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get('/api/farmers/changes/', {'since': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+
+class FarmerBulkUpsertTests(TestCase):
+    """One sync batch creates, updates and reports bad rows"""
+
+    def test_create_update_and_error_rows(self):
+        existing = Farmer.objects.create(farmer_name='Old name', village='Kondapur')
+        new_id = '0190b1e2-7a4c-7d3e-9f10-2b3c4d5e6f70'
+        upsert = FarmerBulkUpsert([
+            {'id': new_id, 'farmer_name': 'Asha', 'fertilizer_type': 'organic', 'application_rate': '100'},
+            {'id': str(existing.id).upper(), 'farmer_name': 'New name'},
+            {'farmer_name': 'No id'},
+            {'id': '0190b1e2-7a4c-7d3e-9f10-2b3c4d5e6f71', 'farmer_name': 'Bad', 'mobile': 'not-a-number'},
+            # A later item for the same farmer is merged into the first
+            {'id': new_id, 'village': 'Medak'},
+        ]).run()
+
+        self.assertEqual(len(upsert.errors), 2)
+        self.assertIn('detail', upsert.errors[0])
+        self.assertIn('mobile', upsert.errors[1]['errors'])
+        self.assertEqual(sorted(farmer.farmer_name for farmer in upsert.saved), ['Asha', 'New name'])
+
+        created = Farmer.objects.get(pk=new_id)
+        self.assertEqual((created.village, created.total_co2_emissions), ('Medak', Decimal('0.06')))
+        existing.refresh_from_db()
+        self.assertEqual((existing.farmer_name, existing.village), ('New name', 'Kondapur'))
+        self.assertEqual(Farmer.objects.count(), 2)
+
+    def test_sync_view_reports_partial_success(self):
+        user = get_user_model().objects.create_user(email='sync@example.com', password='pw', role='admin')
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.post('/api/farmers/sync/', [{'farmer_name': 'No id'},
+                                                       {'id': str(uuid.uuid4()), 'farmer_name': 'Asha'}], format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(len(response.data['saved_farmers']), 1)
+        self.assertEqual(len(response.data['errors']), 1)
+
+
+class FarmerSearchTests(FarmerAPITestCase):
+    """Every word of ?q= must prefix-match a token of some searchable field"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Farmer.objects.create(farmer_name='Ravi Kumar', village='Kondapur')
+        Farmer.objects.create(farmer_name='Ravindra Rao', village='Medak')
+        cls.sita = Farmer.objects.create(farmer_name='Sita Devi', village='Medak')
+
+    def names(self, query):
+        response = self.client.get('/api/farmers/search/', {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return sorted(row['farmer_name'] for row in response.data)
+
+    def test_prefix_hits(self):
+        self.assertEqual(self.names('RAVI'), ['Ravi Kumar', 'Ravindra Rao'])
+        self.assertEqual(self.names('ravi kum'), ['Ravi Kumar'])
+        self.assertEqual(self.names('medak ra'), ['Ravindra Rao'])
+        self.assertEqual(self.names('avi'), [])
+
+    def test_tokens_follow_edits(self):
+        self.sita.farmer_name = 'Ravi Teja'
+        self.sita.save()
+        self.assertEqual(self.names('ravi medak'), ['Ravi Teja', 'Ravindra Rao'])
+        self.assertEqual(self.names('sita'), [])
+        FarmerBulkUpsert([{'id': str(self.sita.id), 'village': 'Kondapur'}]).run()
+        self.assertEqual(self.names('ravi kondapur'), ['Ravi Kumar', 'Ravi Teja'])
+
+    def test_query_is_required(self):
+        self.assertEqual(self.client.get('/api/farmers/search/', {'q': ' '}).status_code, 400)
+
+
+class MediaStorageTestCase(FarmerAPITestCase):
+    """Media and upload parts go to a scratch directory"""
+
+    def setUp(self):
+        super().setUp()
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        self.enterContext(self.settings(MEDIA_ROOT=os.path.join(root, 'media'),
+                                        FARMER_UPLOAD_TEMP_DIR=os.path.join(root, 'parts')))
+
+
+class ResumableUploadTests(MediaStorageTestCase):
+
+    def put_chunk(self, session_id, start, data, total=10):
+        return self.client.generic('PUT', f'/api/farmers/media/uploads/{session_id}/', data,
+                                   content_type='application/octet-stream',
+                                   HTTP_CONTENT_RANGE=f'bytes {start}-{start + len(data) - 1}/{total}')
+
+    def test_resume_and_complete(self):
+        farmer = Farmer.objects.create(farmer_name='Asha')
+        response = self.client.post('/api/farmers/media/uploads/', {
+            'farmer': str(farmer.id), 'media_type': 'soil_characteristics', 'filename': 'soil.jpg', 'total_size': 10,
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        session_id = response.data['id']
+        complete_url = f'/api/farmers/media/uploads/{session_id}/complete/'
+
+        self.assertEqual(self.put_chunk(session_id, 0, b'0123').data['received'], 4)
+        self.assertEqual(self.client.post(complete_url).status_code, 409)
+        # A chunk past the stored offset is refused with the offset to resume from
+        response = self.put_chunk(session_id, 6, b'6789')
+        self.assertEqual((response.status_code, response.data['received']), (416, 4))
+        self.assertEqual(self.client.get(f'/api/farmers/media/uploads/{session_id}/').data['received'], 4)
+        # Resending an overlapping range after a dropped connection is fine
+        self.assertEqual(self.put_chunk(session_id, 2, b'23456789').data['received'], 10)
+
+        response = self.client.post(complete_url)
+        self.assertEqual(response.status_code, 200)
+        farmer = Farmer.objects.get(pk=farmer.pk)
+        with farmer.soil_characteristics.open('rb') as stored:
+            self.assertEqual(stored.read(), b'0123456789')
+        self.assertFalse(os.listdir(os.path.join(settings.FARMER_UPLOAD_TEMP_DIR)))
+        self.assertEqual(self.client.post(complete_url).status_code, 409)
+        self.assertEqual(self.put_chunk(session_id, 0, b'0123').status_code, 409)
+
+    def test_known_digest_skips_the_upload(self):
+        first = Farmer.objects.create(farmer_name='Asha')
+        first.soil_characteristics = media_storage.save('soil.jpg', ContentFile(b'0123456789'))
+        first.save()
+        second = Farmer.objects.create(farmer_name='Ravi')
+        response = self.client.post('/api/farmers/media/uploads/', {
+            'farmer': str(second.id), 'media_type': 'land_photo_1', 'filename': 'land.jpg', 'total_size': 10,
+            'sha256': hashlib.sha256(b'0123456789').hexdigest(),
+        }, format='json')
+        self.assertTrue(response.data['duplicate'])
+        self.assertEqual(Farmer.objects.get(pk=second.pk).land_photo_1.name, first.soil_characteristics.name)
+
+
+class MediaBlobRefcountTests(MediaStorageTestCase):
+    """Blobs count the farmer fields pointing at them and are collected at zero"""
+
+    def blob(self):
+        return MediaBlob.objects.get()
+
+    def test_refcount_follows_fields_and_deletes(self):
+        name = media_storage.save('soil.jpg', ContentFile(b'soil sample'))
+        first = Farmer.objects.create(farmer_name='Asha', soil_characteristics=name)
+        second = Farmer.objects.create(farmer_name='Ravi', land_photo_1=name, land_photo_2=name)
+        self.assertEqual(self.blob().refcount, 3)
+
+        second = Farmer.objects.get(pk=second.pk)
+        second.land_photo_2 = None
+        second.save()
+        self.assertEqual(self.blob().refcount, 2)
+
+        Farmer.objects.get(pk=second.pk).delete()
+        self.assertEqual(self.blob().refcount, 1)
+        # Still referenced: garbage collection keeps it
+        call_command('gc_media_blobs', grace_hours=0, stdout=StringIO())
+        self.assertTrue(media_storage.exists(name))
+
+        Farmer.objects.get(pk=first.pk).delete()
+        self.assertEqual(self.blob().refcount, 0)
+        call_command('gc_media_blobs', grace_hours=0, stdout=StringIO())
+        self.assertFalse(MediaBlob.objects.exists())
+        self.assertFalse(media_storage.exists(name))
+
+    def test_pinned_blob_is_kept(self):
+        name = media_storage.save('shared.jpg', ContentFile(b'handed out by url'))
+        pin(name)
+        call_command('gc_media_blobs', grace_hours=0, stdout=StringIO())
+        self.assertTrue(media_storage.exists(name))
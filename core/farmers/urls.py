@@ -2,8 +2,13 @@ from django.urls import path, include
 from .views import (
     FarmerViewSet,
     FarmerMediaUploadView,
+    FarmerUploadSessionView,
+    FarmerUploadChunkView,
+    FarmerUploadCompleteView,
     FarmerEmissionsView,
-    FarmerSyncView
+    FarmerSyncView,
+    FarmerChangesView,
+    FarmerEmissionsSummaryView
 )
 
 # Create a router and register our viewsets with it
@@ -17,7 +22,12 @@ urlpatterns = [
     # Specific paths should come before the general router inclusion
     # Paths are now relative to /api/farmers/
     path('sync/', FarmerSyncView.as_view(), name='farmer-sync'),
+    path('changes/', FarmerChangesView.as_view(), name='farmer-changes'),
+    path('emissions/summary/', FarmerEmissionsSummaryView.as_view(), name='farmer-emissions-summary'),
     path('media/upload/', FarmerMediaUploadView.as_view({'post': 'create'}), name='farmer-media-upload'),
+    path('media/uploads/', FarmerUploadSessionView.as_view(), name='farmer-upload-session'),
+    path('media/uploads/<uuid:session_id>/', FarmerUploadChunkView.as_view(), name='farmer-upload-chunk'),
+    path('media/uploads/<uuid:session_id>/complete/', FarmerUploadCompleteView.as_view(), name='farmer-upload-complete'),
     path('<str:farmer_id>/emissions/', FarmerEmissionsView.as_view({'get': 'retrieve'}), name='farmer-emissions'),
 
     # Include the router URLs (handles /api/farmers/ and /api/farmers/<id>/ for FarmerViewSet)
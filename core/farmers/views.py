@@ -1,26 +1,51 @@
 from django.shortcuts import render, get_object_or_404
 from django.http import JsonResponse
-from .models import Farmer
-from .serializer import FarmerSerializer
+from .models import Farmer, DeletedFarmer, FarmerUploadSession, MediaBlob, EMISSION_FIELDS, EMISSION_PRECISION, farmer_pk
+from .emissions import SUMMARY_CACHE_NAMESPACE
+from api.cache import make_cache_key
+from api.fields import parse_uuid
+from api.pagination import KeysetPagination
+from farmer_mappings.models import FarmerMapping
+from jobs.queue import enqueue
+from jobs.serializers import JobSerializer
+from .serializer import FarmerSerializer, FarmerUploadSessionSerializer
+from .media import attach_media, attach_stored, media_field, parse_content_range, write_chunk, finalize_upload
+from .storage import media_storage, pin
+from .sync import FarmerBulkUpsert
+from .search import search
+from .quantities import QUANTITY_FIELDS, parse_quantity
+from .sections import SECTION_OF, section_lookup, sections_for
 from rest_framework import generics, viewsets, status
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.decorators import api_view, parser_classes, action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
-import os
-from datetime import datetime
+import json
+import base64
+import binascii
+import uuid
+from decimal import Decimal, InvalidOperation
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q, F, Sum, Count
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework.views import APIView
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 # Generics
 class FarmerList(generics.ListCreateAPIView):
-    queryset = Farmer.objects.all()
+    queryset = Farmer.objects.with_sections()
     serializer_class = FarmerSerializer
 
 
 class FarmerDetail(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Farmer.objects.all()
+    queryset = Farmer.objects.with_sections()
     serializer_class = FarmerSerializer
     lookup_field = 'pk'
 
@@ -43,24 +68,21 @@ def upload_media(request):
         if not farmer_id:
             return Response({'error': 'No farmer ID provided'}, status=400)
 
-        # Create directory if it doesn't exist
-        directory = f'media/farmers/{farmer_id}'
-        os.makedirs(directory, exist_ok=True)
-
-        # Save the file
+        # Stored by content hash, so a retried upload reuses the first copy.
+        # Only the URL is handed out, so pin the blob against garbage collection.
         file_name = f"{media_type}_{file.name}" if media_type else file.name
-        path = f'{directory}/{file_name}'
-        default_storage.save(path, ContentFile(file.read()))
+        path = media_storage.save(f'farmers/{farmer_id}/{file_name}', file)
+        pin(path)
 
         # Return the file URL
-        file_url = f'/media/farmers/{farmer_id}/{file_name}'
+        file_url = media_storage.url(path)
 
         return Response({
             'success': True,
             'file_url': file_url,
         })
     except Exception as e:
-        print(f"Error uploading file: {str(e)}")
+        logger.exception('Error uploading file', extra={'event': 'farmer.media.upload_failed'})
         return Response({'error': str(e)}, status=500)
 
 
@@ -70,7 +92,7 @@ def farmer_emissions(request, pk):
     Get CO2 emissions data for a specific farmer
     """
     try:
-        farmer = get_object_or_404(Farmer, pk=pk)
+        farmer = get_object_or_404(Farmer, pk=farmer_pk(pk))
 
         emissions_data = {
             'fertilizer_co2_emissions': str(farmer.fertilizer_co2_emissions),
@@ -93,7 +115,67 @@ class FarmerViewSet(viewsets.ModelViewSet):
     """
     queryset = Farmer.objects.all()
     serializer_class = FarmerSerializer
+    pagination_class = KeysetPagination
     lookup_field = 'id'
+    # Sort orders accepted through ?ordering=
+    orderings = ('total_co2_emissions', '-total_co2_emissions')
+
+    # Compact default fieldset of the search endpoint
+    search_fields = ('id', 'farmer_name', 'spouse_name', 'mobile', 'village', 'mandal', 'district', 'state')
+
+    def get_sparse_fieldset(self):
+        """
+        Return the ``(fields, omit)`` lists requested through ``?fields=`` and
+        ``?omit=`` on read requests.
+        """
+        if self.request.method not in ('GET', 'HEAD'):
+            return None, None
+        fields = self.request.query_params.get('fields')
+        if not fields and self.action == 'search':
+            fields = ','.join(self.search_fields)
+        omit = self.request.query_params.get('omit')
+        fields = [name.strip() for name in fields.split(',') if name.strip()] if fields else None
+        omit = [name.strip() for name in omit.split(',') if name.strip()] if omit else None
+        return fields, omit
+
+    def get_serializer(self, *args, **kwargs):
+        fields, omit = self.get_sparse_fieldset()
+        if fields:
+            kwargs.setdefault('fields', fields)
+        if omit:
+            kwargs.setdefault('omit', omit)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_object(self):
+        # Legacy ids keep resolving to the farmer migration 0015 renamed
+        self.kwargs[self.lookup_field] = farmer_pk(self.kwargs[self.lookup_field])
+        return super().get_object()
+
+    def get_keyset_ordering(self):
+        ordering = self.request.query_params.get('ordering', None)
+        if ordering in self.orderings:
+            return (ordering, ordering.replace('total_co2_emissions', 'id'))
+        return ('-created_at', '-id')
+
+    def project(self, queryset):
+        """
+        Load only the columns, and join only the detail sections, the sparse
+        fieldset needs
+        """
+        fields, omit = self.get_sparse_fieldset()
+        if not fields and not omit:
+            return queryset.with_sections()
+        columns = {field.name for field in Farmer._meta.concrete_fields}
+        wanted = set(fields) if fields else (columns | set(SECTION_OF)) - set(omit)
+        sections = sections_for(wanted)
+        if sections:
+            queryset = queryset.with_sections(*sections)
+        keyset = {name.lstrip('-') for name in self.get_keyset_ordering()}
+        return queryset.only(*((wanted & columns) | keyset | {'id'}))
+
+    def wants_field(self, name):
+        fields, omit = self.get_sparse_fieldset()
+        return (not fields or name in fields) and name not in (omit or ())
 
     def get_queryset(self):
         """
@@ -101,29 +183,74 @@ class FarmerViewSet(viewsets.ModelViewSet):
         query parameters in the URL.
         """
         queryset = Farmer.objects.all()
+        query = self.request.query_params.get('q', None)
         name = self.request.query_params.get('name', None)
         village = self.request.query_params.get('village', None)
         district = self.request.query_params.get('district', None)
 
+        # Token prefix matching through the search index
+        if query is not None:
+            queryset = search(queryset, query)
         if name is not None:
-            queryset = queryset.filter(farmer_name__icontains=name)
+            queryset = search(queryset, name, field='farmer_name')
         if village is not None:
-            queryset = queryset.filter(village__icontains=village)
+            queryset = search(queryset, village, field='village')
         if district is not None:
-            queryset = queryset.filter(district__icontains=district)
+            queryset = search(queryset, district, field='district')
+
+        # Filter and sort on the persisted total emissions column
+        ordering = self.request.query_params.get('ordering', None)
+        for param, lookup in (('min_emissions', 'gte'), ('max_emissions', 'lte')):
+            if self.request.query_params.get(param):
+                try:
+                    value = Decimal(self.request.query_params[param])
+                except InvalidOperation:
+                    raise ValidationError({param: 'A number is required.'})
+                if not value.is_finite():
+                    raise ValidationError({param: 'A number is required.'})
+                queryset = queryset.filter(**{f'total_co2_emissions__{lookup}': value})
+
+        # Range filters on the typed survey quantities, e.g. ?min_crop_area=2
+        for field in QUANTITY_FIELDS:
+            for bound, lookup in (('min', 'gte'), ('max', 'lte')):
+                param = f'{bound}_{field}'
+                if self.request.query_params.get(param):
+                    try:
+                        value = parse_quantity(self.request.query_params[param])[0]
+                    except ValueError:
+                        raise ValidationError({param: 'A number is required.'})
+                    queryset = queryset.filter(**{f'{section_lookup(field)}__{lookup}': value})
+        if ordering in self.orderings:
+            queryset = queryset.order_by(ordering, 'id')
+
+        # One query for every thumbnail on the page
+        if self.wants_field('thumbnails'):
+            queryset = queryset.prefetch_related('renditions')
 
-        return queryset
+        return self.project(queryset)
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Search farmers by name, location, mobile or government id with
+        ``?q=``. Every word of the query must prefix-match an indexed token.
+        """
+        if not request.query_params.get('q', '').strip():
+            return Response({'error': "The 'q' parameter is required"}, status=status.HTTP_400_BAD_REQUEST)
+        return self.list(request)
 
     def create(self, request, *args, **kwargs):
-        print("Incoming data for create:", request.data)  # Log incoming data
+        logger.debug('Farmer create request: %s', request.data, extra={'event': 'farmer.create.request'})
         response = super().create(request, *args, **kwargs)
-        print("Response data for create:", response.data)  # Log response data
+        logger.debug('Farmer create response: %s', response.data,
+                     extra={'event': 'farmer.create.response', 'status': response.status_code})
         return response
 
     def update(self, request, *args, **kwargs):
         # Ensure 'id' is not part of the request data for updates
         if 'id' in request.data:
-            print(f"Warning: 'id' field found in update request data for ID {kwargs.get('id')}. Removing it.")
+            logger.warning("'id' field found in update request data for ID %s. Removing it.", kwargs.get('id'),
+                           extra={'event': 'farmer.update.id_in_body'})
             # Create a mutable copy if QueryDict
             if hasattr(request.data, '_mutable'):
                 request.data._mutable = True
@@ -132,15 +259,18 @@ class FarmerViewSet(viewsets.ModelViewSet):
             elif isinstance(request.data, dict):
                  request.data.pop('id', None)
 
-        print(f"Incoming data for update (ID: {kwargs.get('id')}):", request.data)
+        logger.debug('Farmer update request (ID: %s): %s', kwargs.get('id'), request.data,
+                     extra={'event': 'farmer.update.request'})
         response = super().update(request, *args, **kwargs)
-        print(f"Response data for update (ID: {kwargs.get('id')}):", response.data)
+        logger.debug('Farmer update response (ID: %s): %s', kwargs.get('id'), response.data,
+                     extra={'event': 'farmer.update.response', 'status': response.status_code})
         return response
 
     def partial_update(self, request, *args, **kwargs):
         # Ensure 'id' is not part of the request data for partial updates
         if 'id' in request.data:
-            print(f"Warning: 'id' field found in partial_update request data for ID {kwargs.get('id')}. Removing it.")
+            logger.warning("'id' field found in partial_update request data for ID %s. Removing it.", kwargs.get('id'),
+                           extra={'event': 'farmer.partial_update.id_in_body'})
             if hasattr(request.data, '_mutable'):
                 request.data._mutable = True
                 request.data.pop('id', None)
@@ -148,9 +278,11 @@ class FarmerViewSet(viewsets.ModelViewSet):
             elif isinstance(request.data, dict):
                 request.data.pop('id', None)
 
-        print(f"Incoming data for partial_update (ID: {kwargs.get('id')}):", request.data)
+        logger.debug('Farmer partial_update request (ID: %s): %s', kwargs.get('id'), request.data,
+                     extra={'event': 'farmer.partial_update.request'})
         response = super().partial_update(request, *args, **kwargs)
-        print(f"Response data for partial_update (ID: {kwargs.get('id')}):", response.data)
+        logger.debug('Farmer partial_update response (ID: %s): %s', kwargs.get('id'), response.data,
+                     extra={'event': 'farmer.partial_update.response', 'status': response.status_code})
         return response
 
 
@@ -175,35 +307,18 @@ class FarmerMediaUploadView(viewsets.ViewSet):
             )
 
         try:
-            farmer = Farmer.objects.get(id=farmer_id)
+            farmer = Farmer.objects.get(id=farmer_pk(farmer_id))
             
-            # Handle different media types
-            if media_type == 'photo':
-                farmer.farmer_photo = file
-            elif media_type == 'land_photo_1':
-                farmer.land_photo_1 = file
-            elif media_type == 'land_photo_2':
-                farmer.land_photo_2 = file
-            elif media_type == 'land_photo_3':
-                farmer.land_photo_3 = file
-            elif media_type == 'land_photo_4':
-                farmer.land_photo_4 = file
-            elif media_type == 'soil_characteristics':
-                farmer.soil_characteristics = file
-            elif media_type == 'fertilizer_photos':
-                farmer.fertilizer_photos = file
-            elif media_type == 'crop_protection_photos':
-                farmer.crop_protection_photos = file
-            else:
+            if media_field(media_type) is None:
                 return Response(
                     {'error': 'Invalid media type'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            farmer.save()
+            field_file = attach_media(farmer, media_type, file)
             return Response({
                 'success': True,
-                'file_url': getattr(farmer, f'{media_type}').url
+                'file_url': field_file.url
             })
 
         except Farmer.DoesNotExist:
@@ -213,6 +328,112 @@ class FarmerMediaUploadView(viewsets.ViewSet):
             )
 
 
+class FarmerUploadSessionView(APIView):
+    """
+    Start a resumable upload. The body carries ``farmer``, ``media_type``,
+    ``filename`` and ``total_size``; the returned ``id`` names the session.
+    When the optional ``sha256`` matches a stored file, that file is attached
+    straight away and no bytes need to be sent.
+    """
+
+    def post(self, request):
+        serializer = FarmerUploadSessionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        sha256 = serializer.validated_data.get('sha256')
+        blob = MediaBlob.objects.filter(digest=sha256.lower()).first() if sha256 else None
+        if blob is not None and media_storage.exists(blob.name):
+            data = serializer.validated_data
+            field_file = attach_stored(data['farmer'], data['media_type'], blob.name)
+            return Response({
+                'success': True,
+                'duplicate': True,
+                'file_url': field_file.url
+            })
+
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class FarmerUploadChunkView(APIView):
+    """
+    GET reports how many bytes of an upload session are stored, so a client
+    can resume after a dropped connection. PUT stores one byte range of the
+    file, sent as the raw body with a ``Content-Range: bytes start-end/total``
+    header. Ranges must start at or before the stored offset.
+    """
+    # The stored offset must not lag behind the last chunk
+    read_replica = False
+
+    def get(self, request, session_id):
+        session = get_object_or_404(FarmerUploadSession, pk=session_id)
+        return Response(FarmerUploadSessionSerializer(session).data)
+
+    def put(self, request, session_id):
+        content_range = parse_content_range(request.headers.get('Content-Range'))
+        if content_range is None:
+            return Response({'error': 'A valid Content-Range header is required'}, status=status.HTTP_400_BAD_REQUEST)
+        start, end, total = content_range
+        length = end - start + 1
+        if request.META.get('CONTENT_LENGTH') not in (None, '', str(length)):
+            return Response({'error': 'Content-Length does not match Content-Range'}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            # The row lock serialises concurrent chunks of the same session
+            session = get_object_or_404(FarmerUploadSession.objects.select_for_update(), pk=session_id)
+            if session.status != 'pending':
+                return Response({'error': 'Upload already completed'}, status=status.HTTP_409_CONFLICT)
+            if total != session.total_size:
+                return Response({'error': 'Content-Range total does not match the session size'}, status=status.HTTP_400_BAD_REQUEST)
+            if start > session.received:
+                return Response(
+                    {'error': 'Chunk starts past the stored offset', 'received': session.received},
+                    status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+                )
+
+            if end >= session.received:
+                # Read the raw body stream instead of request.data so the
+                # chunk is copied to disk without being held in memory
+                written = write_chunk(session, request, start, length)
+                session.received = max(session.received, start + written)
+                session.save(update_fields=['received', 'updated_at'])
+
+        data = FarmerUploadSessionSerializer(session).data
+        if end >= session.received:
+            data['error'] = 'Chunk was truncated'
+            return Response(data, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data)
+
+
+class FarmerUploadCompleteView(APIView):
+    """
+    Finalise an upload session once every byte has been received and attach
+    the file to the farmer field named by the session media type.
+    """
+
+    def post(self, request, session_id):
+        with transaction.atomic():
+            session = get_object_or_404(
+                FarmerUploadSession.objects.select_for_update().select_related('farmer'),
+                pk=session_id
+            )
+            if session.status != 'pending':
+                return Response({'error': 'Upload already completed'}, status=status.HTTP_409_CONFLICT)
+            if session.received < session.total_size:
+                return Response(
+                    {'error': 'Upload is incomplete', 'received': session.received, 'total_size': session.total_size},
+                    status=status.HTTP_409_CONFLICT
+                )
+            field_file = finalize_upload(session)
+            session.status = 'complete'
+            session.save(update_fields=['status', 'updated_at'])
+
+        return Response({
+            'success': True,
+            'file_url': field_file.url
+        })
+
+
 class FarmerEmissionsView(viewsets.ViewSet):
     """
     ViewSet for retrieving farmer emissions data.
@@ -221,7 +442,7 @@ class FarmerEmissionsView(viewsets.ViewSet):
         """
         Retrieve emissions data for a specific farmer.
         """
-        farmer = get_object_or_404(Farmer, id=farmer_id)
+        farmer = get_object_or_404(Farmer, id=farmer_pk(farmer_id))
 
         emissions_data = {
             'fertilizer_co2_emissions': str(farmer.fertilizer_co2_emissions),
@@ -241,53 +462,259 @@ class FarmerEmissionsView(viewsets.ViewSet):
 
 
 class FarmerSyncView(APIView):
+    """
+    Upserts a batch of farmers from the mobile app. With ``?async=true`` the
+    batch is queued as a background job instead: the response is a 202 with
+    the job, whose ``url`` reports the outcome once a worker has run it.
+    """
     def post(self, request):
         try:
             farmers_data = request.data
             if not isinstance(farmers_data, list):
                 return Response({"error": "Expected a list of farmer objects"}, status=status.HTTP_400_BAD_REQUEST)
 
-            saved_farmers_data = []
-            error_details = []
-            success_count = 0
-            failure_count = 0
+            if request.query_params.get('async', '').lower() in ('1', 'true'):
+                job = enqueue('farmers.sync', farmers_data, user=request.user)
+                data = JobSerializer(job, context={'request': request}).data
+                return Response(data, status=status.HTTP_202_ACCEPTED, headers={'Location': data['url']})
 
-            for farmer_item in farmers_data:
-                farmer_id = farmer_item.get('id')
-                if not farmer_id:
-                    error_details.append({"detail": "Missing 'id' in farmer data object.", "data": farmer_item})
-                    failure_count += 1
-                    continue
+            upsert = FarmerBulkUpsert(farmers_data).run()
+            error_details = upsert.errors
+            success_count = len(upsert.saved)
+            failure_count = len(error_details)
 
-                try:
-                    instance = Farmer.objects.get(id=farmer_id)
-                    serializer = FarmerSerializer(instance, data=farmer_item, partial=True) # partial=True for updates
-                except Farmer.DoesNotExist:
-                    serializer = FarmerSerializer(data=farmer_item)
-                
-                if serializer.is_valid():
-                    try:
-                        saved_farmer = serializer.save()
-                        saved_farmers_data.append(FarmerSerializer(saved_farmer).data) # Use fresh serializer for response data
-                        success_count += 1
-                    except Exception as e_save:
-                        error_details.append({"id": farmer_id, "errors": str(e_save)})
-                        failure_count += 1
-                else:
-                    error_details.append({"id": farmer_id, "errors": serializer.errors})
-                    failure_count += 1
-            
             response_status = status.HTTP_207_MULTI_STATUS if failure_count > 0 and success_count > 0 else \
                               status.HTTP_201_CREATED if success_count > 0 else \
                               status.HTTP_400_BAD_REQUEST
 
             return Response({
                 "message": f"{success_count} farmers synced successfully, {failure_count} failed.",
-                "saved_farmers": saved_farmers_data,
+                "saved_farmers": upsert.saved_data,
                 "errors": error_details if error_details else None
             }, status=response_status)
 
         except Exception as e:
-            import traceback
-            traceback.print_exc()
-            return Response({"error": str(e), "detail": "An unexpected error occurred during sync."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            logger.exception("Unexpected error during farmer sync")
+            return Response({"error": str(e), "detail": "An unexpected error occurred during sync."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# Sorts before every farmer id in the change feed's (updated_at, id) order
+FIRST_FARMER_ID = uuid.UUID(int=0)
+
+
+class FarmerChangesView(APIView):
+    """
+    Incremental change feed for mobile clients.
+
+    Returns the farmers changed since the client's last checkpoint, ordered
+    by ``(updated_at, id)``, together with tombstones for deleted farmers.
+    The returned ``cursor`` is opaque and should be sent back as ``since``
+    on the next call; ``has_more`` tells the client to keep paging.
+    """
+    default_limit = 500
+    max_limit = 1000
+    # Replica lag could exceed the settle window and skip rows for good
+    read_replica = False
+
+    @staticmethod
+    def settle_seconds():
+        """
+        Rows younger than this are held back until a later poll. updated_at
+        is stamped before commit, so a transaction that takes longer than the
+        window can commit rows behind a cursor already handed out; see
+        FARMER_CHANGES_SETTLE_SECONDS.
+        """
+        return getattr(settings, 'FARMER_CHANGES_SETTLE_SECONDS', 30)
+
+    def get(self, request):
+        position = self.decode_cursor(request.query_params.get('since'))
+        if position is None:
+            return Response({"error": "Invalid 'since' cursor"}, status=status.HTTP_400_BAD_REQUEST)
+        updated_at, last_id, last_tombstone = position
+
+        try:
+            limit = min(int(request.query_params.get('limit', self.default_limit)), self.max_limit)
+        except ValueError:
+            limit = self.default_limit
+        limit = max(limit, 1)
+
+        horizon = timezone.now() - timedelta(seconds=self.settle_seconds())
+        farmers = (
+            Farmer.objects.filter(updated_at__lte=horizon).order_by('updated_at', 'id')
+            .with_sections().prefetch_related('renditions')
+        )
+        if updated_at is not None:
+            farmers = farmers.filter(Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=last_id))
+        farmers = list(farmers[:limit + 1])
+
+        tombstones = DeletedFarmer.objects.filter(deleted_at__lte=horizon).order_by('id')
+        if last_tombstone is None:
+            # Timestamp checkpoints only need deletions from that point on
+            tombstones = tombstones.filter(deleted_at__gt=updated_at)
+        else:
+            tombstones = tombstones.filter(id__gt=last_tombstone)
+        tombstones = list(tombstones[:limit + 1])
+
+        has_more = len(farmers) > limit or len(tombstones) > limit
+        farmers = farmers[:limit]
+        tombstones = tombstones[:limit]
+
+        if farmers:
+            updated_at, last_id = farmers[-1].updated_at, farmers[-1].id
+        if tombstones:
+            last_tombstone = tombstones[-1].id
+        elif last_tombstone is None:
+            # Nothing was deleted after the timestamp; start the tombstone
+            # position at the newest tombstone already settled.
+            latest = DeletedFarmer.objects.filter(deleted_at__lte=horizon).order_by('-id').first()
+            last_tombstone = latest.id if latest else 0
+
+        return Response({
+            'changes': FarmerSerializer(farmers, many=True).data,
+            'deleted': [
+                {'id': tombstone.farmer_id, 'deleted_at': tombstone.deleted_at}
+                for tombstone in tombstones
+            ],
+            'cursor': self.encode_cursor(updated_at, last_id, last_tombstone),
+            'has_more': has_more,
+        })
+
+    @staticmethod
+    def encode_cursor(updated_at, last_id, last_tombstone):
+        payload = {
+            'u': updated_at.isoformat() if updated_at else None,
+            'i': str(last_id) if last_id else None,
+            'd': last_tombstone,
+        }
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    @staticmethod
+    def decode_cursor(value):
+        """
+        Return ``(updated_at, last_id, last_tombstone)`` for a cursor, or
+        ``None`` if it cannot be parsed. A plain ISO timestamp is accepted too
+        so clients can switch over from full pulls.
+        """
+        if not value:
+            return None, FIRST_FARMER_ID, 0
+
+        timestamp = parse_datetime(value)
+        if timestamp is not None:
+            if timezone.is_naive(timestamp):
+                timestamp = timezone.make_aware(timestamp)
+            return timestamp, FIRST_FARMER_ID, None
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(value.encode()))
+            updated_at = parse_datetime(payload['u']) if payload.get('u') else None
+            last_id = parse_uuid(payload['i']) if payload.get('i') else FIRST_FARMER_ID
+            if last_id is None:
+                return None
+            return updated_at, last_id, int(payload.get('d') or 0)
+        except (ValueError, TypeError, AttributeError, binascii.Error):
+            return None
+
+
+class FarmerEmissionsSummaryView(APIView):
+    """
+    Emission rollups grouped by location, crop or company.
+
+    Totals are aggregated in the database over the persisted emission columns
+    and cached per query. Any change to the location, crop, acreage or
+    emissions of a farmer, and any mapping change, drops every cached
+    rollup, so the cache mostly helps between bursts of such edits.
+
+    ``emissions_per_acre`` divides the emissions of the farmers that report
+    an acreage by that acreage; farmers without one count towards the
+    totals only.
+    """
+    group_fields = {
+        'state': 'state',
+        'district': 'district',
+        'mandal': 'mandal',
+        'village': 'village',
+        'crop_name': section_lookup('crop_name'),
+    }
+    filter_fields = ('state', 'district', 'mandal', 'village', 'crop_name')
+
+    def get(self, request):
+        group_by = request.query_params.get('group_by', 'state')
+        if group_by not in self.group_fields and group_by != 'company':
+            choices = ', '.join([*self.group_fields, 'company'])
+            return Response({"error": f"group_by must be one of: {choices}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        filters = {
+            name: request.query_params[name]
+            for name in (*self.filter_fields, 'company', 'status')
+            if request.query_params.get(name)
+        }
+        if 'company' in filters:
+            try:
+                filters['company'] = int(filters['company'])
+            except ValueError:
+                return Response({"error": "company must be a company id"}, status=status.HTTP_400_BAD_REQUEST)
+        cache_key = make_cache_key(SUMMARY_CACHE_NAMESPACE, group_by, filters)
+        data = cache.get(cache_key)
+        if data is None:
+            if group_by == 'company':
+                rows = self.company_rows(filters)
+            else:
+                rows = self.location_rows(self.group_fields[group_by], filters)
+            data = {
+                'group_by': group_by,
+                'filters': filters,
+                'results': [self.format_row(row) for row in rows],
+                'emissions_unit': 'kg CO2e',
+                'land_area_unit': 'acres',
+            }
+            cache.set(cache_key, data, getattr(settings, 'EMISSIONS_SUMMARY_CACHE_TIMEOUT', 300))
+        return Response(data)
+
+    def location_rows(self, field, filters):
+        lookups = {section_lookup(name): value for name, value in filters.items() if name in self.filter_fields}
+        # Restrict to the farmers mapped to one company, optionally by mapping status
+        if 'company' in filters:
+            lookups['company_mappings__company_id'] = filters['company']
+            if 'status' in filters:
+                lookups['company_mappings__status'] = filters['status']
+        queryset = Farmer.objects.filter(**lookups)
+        # Before the sums that take over the column names
+        aggregates = {'acreage_emissions': Sum('total_co2_emissions', filter=Q(acreage__gt=0))}
+        aggregates.update({column: Sum(column) for column in EMISSION_FIELDS})
+        return (
+            queryset.order_by()
+            .values(key=F(field))
+            .annotate(farmer_count=Count('id'), total_acreage=Sum('acreage'), **aggregates)
+            .order_by('key')
+        )
+
+    def company_rows(self, filters):
+        queryset = FarmerMapping.objects.filter(**{
+            section_lookup(name, prefix='farmer__') if name in self.filter_fields else f'{name}_id' if name == 'company' else name: value
+            for name, value in filters.items()
+        })
+        aggregates = {'acreage_emissions': Sum('farmer__total_co2_emissions', filter=Q(farmer__acreage__gt=0))}
+        aggregates.update({column: Sum(f'farmer__{column}') for column in EMISSION_FIELDS})
+        return (
+            queryset.order_by()
+            .values('company_id', 'company__name')
+            .annotate(farmer_count=Count('farmer_id', distinct=True),
+                      total_acreage=Sum('farmer__acreage'), **aggregates)
+            .order_by('company__name')
+        )
+
+    def format_row(self, row):
+        if 'company_id' in row:
+            result = {'key': row['company_id'], 'company_id': row['company_id'], 'company_name': row['company__name']}
+        else:
+            result = {'key': row['key']}
+        acreage = row['total_acreage']
+        emissions = {column: Decimal(row[column] or 0).quantize(EMISSION_PRECISION) for column in EMISSION_FIELDS}
+        acreage_emissions = Decimal(row['acreage_emissions'] or 0)
+        result.update({
+            'farmer_count': row['farmer_count'],
+            'total_acreage': str(Decimal(acreage).quantize(Decimal('0.01'))) if acreage is not None else None,
+            **{column: str(value) for column, value in emissions.items()},
+            'emissions_per_acre': str((acreage_emissions / acreage).quantize(EMISSION_PRECISION)) if acreage else None,
+        })
+        return result
\ No newline at end of file
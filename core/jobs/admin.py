@@ -0,0 +1,12 @@
+from django.contrib import admin
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'max_attempts', 'run_at', 'created_by', 'created_at', 'finished_at')
+    list_filter = ('status', 'name', 'created_at')
+    search_fields = ('name', 'error', 'locked_by')
+    readonly_fields = ('id', 'name', 'payload', 'attempts', 'locked_by', 'locked_at', 'result', 'error',
+                       'created_by', 'created_at', 'updated_at', 'finished_at')
+    list_select_related = ('created_by',)
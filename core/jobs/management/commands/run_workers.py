@@ -0,0 +1,55 @@
+import multiprocessing
+import signal
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from jobs.worker import Worker, housekeeping, housekeeping_seconds, run_process
+
+
+class Command(BaseCommand):
+    help = 'Run background jobs from the jobs table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=getattr(settings, 'JOB_WORKER_THREADS', 4),
+                            help='Jobs run at the same time by each process')
+        parser.add_argument('--processes', type=int, default=getattr(settings, 'JOB_WORKER_PROCESSES', 1),
+                            help='Worker processes to spawn; 1 runs the threads in this process')
+        parser.add_argument('--burst', action='store_true',
+                            help='Exit once no job is due instead of polling for new ones')
+
+    def handle(self, *args, **options):
+        threads = max(options['threads'], 1)
+        processes = max(options['processes'], 1)
+        self.stdout.write(f'Running jobs on {processes} process(es) x {threads} thread(s)')
+
+        if processes == 1:
+            Worker(threads, burst=options['burst']).run()
+        else:
+            self.run_pool(processes, threads, options['burst'])
+        self.stdout.write(self.style.SUCCESS('Workers stopped'))
+
+    def run_pool(self, processes, threads, burst):
+        # Spawn rather than fork a process holding DB connections and threads
+        context = multiprocessing.get_context('spawn')
+        children = [
+            context.Process(target=run_process, args=(threads, burst), name=f'job-worker-process-{index}')
+            for index in range(processes)
+        ]
+        for child in children:
+            child.start()
+
+        def stop(*args):
+            # Each child finishes its running jobs before it exits
+            for child in children:
+                if child.is_alive():
+                    child.terminate()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        housekeeping()
+        while any(child.is_alive() for child in children):
+            for child in children:
+                child.join(housekeeping_seconds() / processes)
+            housekeeping()
+        for child in children:
+            if child.exitcode:
+                self.stdout.write(self.style.WARNING(f'{child.name} exited with code {child.exitcode}'))
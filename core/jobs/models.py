@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from api.fields import BinaryUUIDField, uuid7
+
+
+class Job(models.Model):
+    """
+    Unit of background work, run by ``manage.py run_workers``.
+    ``name`` selects the handler registered in jobs.queue.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (SUCCEEDED, 'Succeeded'),
+        (FAILED, 'Failed'),
+    ]
+
+    # Time ordered, so ties on run_at are taken oldest first
+    id = BinaryUUIDField(primary_key=True, default=uuid7, editable=False)
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(encoder=DjangoJSONEncoder, default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    # Not picked up before this time; pushed back after a failed attempt
+    run_at = models.DateTimeField()
+    locked_by = models.CharField(max_length=100, blank=True, null=True)
+    locked_at = models.DateTimeField(blank=True, null=True)
+    result = models.JSONField(encoder=DjangoJSONEncoder, blank=True, null=True)
+    error = models.TextField(blank=True, null=True)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, blank=True, null=True,
+                                   related_name='jobs', db_index=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'jobs'
+        ordering = ['-created_at']
+        indexes = [
+            # Serves the workers' claim query and the stale lease scan
+            models.Index(fields=['status', 'run_at']),
+            # Serves the status API listing a user's jobs
+            models.Index(fields=['created_by', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
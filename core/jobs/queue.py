@@ -0,0 +1,175 @@
+"""
+Durable job queue kept in the ``jobs`` table.
+
+``enqueue`` writes a job row inside the caller's transaction, so the job
+exists exactly when the data it refers to does. Workers started with
+``manage.py run_workers`` claim due jobs one at a time with
+``SELECT ... FOR UPDATE SKIP LOCKED`` where the database supports it, so
+many workers can poll the table without waiting on each other's rows. The
+claim itself is a conditional UPDATE, which keeps two workers from taking
+the same job on databases without row locks (SQLite).
+
+A job whose handler raises is retried with exponential backoff until it
+has used ``max_attempts``. A worker that dies holding a job leaves it
+``running``; once its lease (JOB_LEASE_SECONDS) is up the job is queued
+again, so handlers must be safe to run more than once.
+"""
+import logging
+import random
+import traceback
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_handlers = {}
+
+
+def task(name):
+    """Register the decorated function as the handler of jobs called ``name``"""
+    def register(handler):
+        _handlers[name] = handler
+        return handler
+    return register
+
+
+def get_handler(name):
+    return _handlers.get(name)
+
+
+def max_attempts():
+    return getattr(settings, 'JOB_MAX_ATTEMPTS', 5)
+
+
+def lease_seconds():
+    """Seconds a running job may take before it is considered abandoned"""
+    return getattr(settings, 'JOB_LEASE_SECONDS', 600)
+
+
+def retry_delay(attempts):
+    """Seconds to wait before the next attempt: doubling, capped, with jitter"""
+    base = getattr(settings, 'JOB_RETRY_BASE_SECONDS', 10)
+    cap = getattr(settings, 'JOB_RETRY_MAX_SECONDS', 3600)
+    delay = min(cap, base * 2 ** max(attempts - 1, 0))
+    # Spread retries of jobs that failed together
+    return delay * random.uniform(0.5, 1.0)
+
+
+def enqueue(name, payload=None, user=None, delay=0, attempts=None):
+    """Create a job for the registered handler ``name``; returns the Job"""
+    if name not in _handlers:
+        raise ValueError(f"No job handler registered for '{name}'")
+    return Job.objects.create(
+        name=name,
+        payload=payload if payload is not None else {},
+        created_by_id=user.pk if user is not None and user.is_authenticated else None,
+        run_at=timezone.now() + timedelta(seconds=delay),
+        max_attempts=attempts or max_attempts(),
+    )
+
+
+def claim(worker):
+    """Take the next due job for ``worker`` and mark it running, or None"""
+    features = connection.features
+    while True:
+        now = timezone.now()
+        if features.has_select_for_update:
+            with transaction.atomic():
+                job = _next_due(now, Job.objects.select_for_update(
+                    skip_locked=features.has_select_for_update_skip_locked))
+                claimed = job is not None and _take(job, worker, now)
+        else:
+            # No row locks (SQLite): a read transaction would have to be
+            # upgraded to write, which fails while another worker writes
+            job = _next_due(now, Job.objects.all())
+            claimed = job is not None and _take(job, worker, now)
+        if job is None:
+            return None
+        if claimed:
+            return Job.objects.get(pk=job.pk)
+        # Another worker took it first; try the next one
+
+
+def _next_due(now, queryset):
+    return queryset.filter(status=Job.QUEUED, run_at__lte=now).order_by('run_at', 'id').only('id').first()
+
+
+def _take(job, worker, now):
+    return Job.objects.filter(pk=job.pk, status=Job.QUEUED).update(
+        status=Job.RUNNING,
+        attempts=F('attempts') + 1,
+        locked_by=worker,
+        locked_at=now,
+        updated_at=now,
+    ) == 1
+
+
+def run(job):
+    """Run a claimed job and record how it ended"""
+    handler = get_handler(job.name)
+    if handler is None:
+        finish(job, Job.FAILED, error=f"No job handler registered for '{job.name}'")
+        return
+    try:
+        result = handler(job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            logger.error('Job %s (%s) failed after %s attempts', job.pk, job.name, job.attempts,
+                         extra={'job': str(job.pk), 'error': error})
+            finish(job, Job.FAILED, error=error)
+            return
+        delay = retry_delay(job.attempts)
+        logger.warning('Job %s (%s) failed, retrying in %.0fs', job.pk, job.name, delay,
+                       extra={'job': str(job.pk), 'attempt': job.attempts, 'error': error})
+        Job.objects.filter(pk=job.pk, status=Job.RUNNING, locked_by=job.locked_by).update(
+            status=Job.QUEUED,
+            run_at=timezone.now() + timedelta(seconds=delay),
+            locked_by=None,
+            locked_at=None,
+            error=error,
+            updated_at=timezone.now(),
+        )
+        return
+    finish(job, Job.SUCCEEDED, result=result)
+
+
+def finish(job, status, result=None, error=None):
+    now = timezone.now()
+    # A worker that overran its lease no longer owns the job
+    Job.objects.filter(pk=job.pk, status=Job.RUNNING, locked_by=job.locked_by).update(
+        status=status,
+        result=result,
+        error=error,
+        locked_by=None,
+        locked_at=None,
+        finished_at=now,
+        updated_at=now,
+    )
+
+
+def requeue_stale():
+    """Queue again the running jobs whose worker has held them past the lease"""
+    now = timezone.now()
+    stale = Job.objects.filter(status=Job.RUNNING, locked_at__lt=now - timedelta(seconds=lease_seconds()))
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Job.FAILED, error='Worker lost the job', locked_by=None, locked_at=None,
+        finished_at=now, updated_at=now,
+    )
+    requeued = stale.update(
+        status=Job.QUEUED, run_at=now, locked_by=None, locked_at=None, updated_at=now,
+    )
+    if failed or requeued:
+        logger.warning('Requeued %s and failed %s abandoned jobs', requeued, failed)
+    return requeued, failed
+
+
+def purge_finished():
+    """Delete jobs that finished more than JOB_RETENTION_DAYS ago"""
+    cutoff = timezone.now() - timedelta(days=getattr(settings, 'JOB_RETENTION_DAYS', 7))
+    deleted, _ = Job.objects.filter(status__in=(Job.SUCCEEDED, Job.FAILED), finished_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,12 @@
+from rest_framework import serializers
+from .models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    url = serializers.HyperlinkedIdentityField(view_name='job-detail')
+
+    class Meta:
+        model = Job
+        fields = ('id', 'url', 'name', 'status', 'attempts', 'max_attempts', 'run_at', 'result', 'error',
+                  'created_at', 'updated_at', 'finished_at')
+        read_only_fields = fields
@@ -0,0 +1,159 @@
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from farmers.models import Farmer
+from .models import Job
+from .queue import claim, enqueue, purge_finished, requeue_stale, retry_delay, run, task, _take
+
+calls = []
+
+
+@task('tests.succeed')
+def succeed(payload):
+    calls.append(payload)
+    return {'doubled': payload['value'] * 2}
+
+
+@task('tests.fail')
+def fail(payload):
+    calls.append(payload)
+    raise RuntimeError('handler failed')
+
+
+@override_settings(JOB_MAX_ATTEMPTS=3, JOB_RETRY_BASE_SECONDS=10, JOB_RETRY_MAX_SECONDS=60, JOB_LEASE_SECONDS=600)
+class JobQueueTests(TestCase):
+    """claim/run/requeue_stale against the database with registered handlers"""
+
+    def setUp(self):
+        calls.clear()
+
+    def test_unknown_handler_is_rejected(self):
+        with self.assertRaises(ValueError):
+            enqueue('tests.missing')
+
+    def test_claim_takes_due_jobs_oldest_first(self):
+        later = enqueue('tests.succeed', {'value': 2}, delay=60)
+        first = enqueue('tests.succeed', {'value': 1})
+        second = enqueue('tests.succeed', {'value': 3})
+
+        job = claim('worker-1')
+        self.assertEqual(job.pk, first.pk)
+        self.assertEqual((job.status, job.attempts, job.locked_by), (Job.RUNNING, 1, 'worker-1'))
+        self.assertEqual(claim('worker-2').pk, second.pk)
+        # The delayed job is not due yet
+        self.assertIsNone(claim('worker-3'))
+        self.assertEqual(Job.objects.get(pk=later.pk).status, Job.QUEUED)
+
+    def test_only_one_worker_wins_a_race(self):
+        job = enqueue('tests.succeed', {'value': 1})
+        now = timezone.now()
+        # Both workers read the job as queued; only the first update applies
+        self.assertTrue(_take(job, 'worker-1', now))
+        self.assertFalse(_take(job, 'worker-2', now))
+        job.refresh_from_db()
+        self.assertEqual((job.locked_by, job.attempts), ('worker-1', 1))
+
+    def test_success_records_the_result(self):
+        enqueue('tests.succeed', {'value': 21})
+        job = claim('worker-1')
+        run(job)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.assertEqual(job.result, {'doubled': 42})
+        self.assertIsNotNone(job.finished_at)
+        self.assertIsNone(job.locked_by)
+
+    def test_failure_is_retried_with_backoff(self):
+        enqueue('tests.fail', {'value': 1})
+        job = claim('worker-1')
+        before = timezone.now()
+        run(job)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 1))
+        self.assertIn('handler failed', job.error)
+        self.assertIsNone(job.locked_by)
+        # First retry waits half to all of JOB_RETRY_BASE_SECONDS
+        self.assertGreaterEqual(job.run_at, before + timedelta(seconds=5))
+        self.assertLessEqual(job.run_at, timezone.now() + timedelta(seconds=10))
+        self.assertIsNone(claim('worker-1'))
+
+    def test_retry_delay_doubles_up_to_the_cap(self):
+        for attempts, low, high in ((1, 5, 10), (2, 10, 20), (3, 20, 40), (10, 30, 60)):
+            delay = retry_delay(attempts)
+            self.assertGreaterEqual(delay, low)
+            self.assertLessEqual(delay, high)
+
+    def test_failure_gives_up_after_max_attempts(self):
+        job = enqueue('tests.fail', {'value': 1})
+        for attempt in range(3):
+            Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+            run(claim('worker-1'))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 3))
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(len(calls), 3)
+
+    def test_requeue_stale_after_the_lease(self):
+        enqueue('tests.succeed', {'value': 1})
+        job = claim('worker-1')
+        self.assertEqual(requeue_stale(), (0, 0))
+
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(seconds=601))
+        self.assertEqual(requeue_stale(), (1, 0))
+        stale = Job.objects.get(pk=job.pk)
+        self.assertEqual((stale.status, stale.locked_by), (Job.QUEUED, None))
+
+        # The job runs again; the worker that lost it cannot record an outcome
+        retaken = claim('worker-2')
+        self.assertEqual((retaken.pk, retaken.attempts), (job.pk, 2))
+        run(job)
+        self.assertEqual(Job.objects.get(pk=job.pk).status, Job.RUNNING)
+        run(retaken)
+        self.assertEqual(Job.objects.get(pk=job.pk).status, Job.SUCCEEDED)
+
+    def test_requeue_stale_fails_jobs_out_of_attempts(self):
+        enqueue('tests.succeed', {'value': 1}, attempts=1)
+        job = claim('worker-1')
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(seconds=601))
+        self.assertEqual(requeue_stale(), (0, 1))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), (Job.FAILED, 'Worker lost the job'))
+
+    @override_settings(JOB_RETENTION_DAYS=7)
+    def test_purge_finished(self):
+        old = timezone.now() - timedelta(days=8)
+        expired = enqueue('tests.succeed', {'value': 1})
+        recent = enqueue('tests.succeed', {'value': 2})
+        queued = enqueue('tests.succeed', {'value': 3})
+        Job.objects.filter(pk=expired.pk).update(status=Job.FAILED, finished_at=old)
+        Job.objects.filter(pk=recent.pk).update(status=Job.SUCCEEDED, finished_at=timezone.now())
+        self.assertEqual(purge_finished(), 1)
+        self.assertEqual(set(Job.objects.values_list('pk', flat=True)), {recent.pk, queued.pk})
+
+
+class AsyncFarmerSyncTests(TestCase):
+    """POST /api/farmers/sync/?async=true runs the upsert as a job"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email='admin@example.com', password='pw', role='admin')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_sync_job_runs_the_upsert(self):
+        farmer_id = '0190b1e2-7a4c-7d3e-9f10-2b3c4d5e6f70'
+        response = self.client.post('/api/farmers/sync/?async=true', [{'id': farmer_id, 'farmer_name': 'Asha'}],
+                                    format='json')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response['Location'], response.data['url'])
+        self.assertFalse(Farmer.objects.exists())
+
+        job = claim('worker-1')
+        self.assertEqual((job.name, job.created_by_id), ('farmers.sync', self.user.pk))
+        run(job)
+
+        response = self.client.get(response['Location'])
+        self.assertEqual(response.data['status'], Job.SUCCEEDED)
+        self.assertEqual(response.data['result']['saved_farmers'], [farmer_id])
+        self.assertTrue(Farmer.objects.filter(farmer_name='Asha').exists())
@@ -0,0 +1,31 @@
+from rest_framework import viewsets
+from rest_framework.permissions import IsAuthenticated
+from api.pagination import KeysetPagination
+from .models import Job
+from .serializers import JobSerializer
+
+
+class JobPagination(KeysetPagination):
+    optional = False
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Status of background jobs, filtered with ``status=`` and ``name=``.
+    Users see the jobs they started; admins see every job.
+    """
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = JobPagination
+    # Clients poll right after enqueueing; a lagging replica would 404
+    read_replica = False
+
+    def get_queryset(self):
+        queryset = Job.objects.all()
+        if self.request.user.role != 'admin':
+            queryset = queryset.filter(created_by_id=self.request.user.pk)
+        for field in ('status', 'name'):
+            value = self.request.query_params.get(field)
+            if value:
+                queryset = queryset.filter(**{field: value})
+        return queryset
@@ -0,0 +1,109 @@
+"""
+Worker pool behind ``manage.py run_workers``.
+
+A ``Worker`` runs a number of threads in the current process, each claiming
+and running one job at a time. The command can also spawn several worker
+processes for CPU-bound handlers such as photo renditions; each child sets
+Django up again, so nothing here imports models at module level.
+"""
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+logger = logging.getLogger(__name__)
+
+
+def poll_seconds():
+    """Seconds an idle thread waits before looking for due jobs again"""
+    return getattr(settings, 'JOB_POLL_SECONDS', 1.0)
+
+
+def housekeeping_seconds():
+    return getattr(settings, 'JOB_HOUSEKEEPING_SECONDS', 60)
+
+
+def housekeeping():
+    """Recover abandoned jobs and drop old finished ones"""
+    from .queue import purge_finished, requeue_stale
+
+    try:
+        requeue_stale()
+        purge_finished()
+    except Exception:
+        logger.exception('Job housekeeping failed')
+    finally:
+        close_old_connections()
+
+
+class Worker:
+    def __init__(self, threads, burst=False, housekeeping=True):
+        self.threads = threads
+        # Exit once no job is due instead of polling forever
+        self.burst = burst
+        self.housekeeping = housekeeping
+        self.stopping = threading.Event()
+        self.name = f'{socket.gethostname()}:{os.getpid()}'
+
+    def stop(self, *args):
+        self.stopping.set()
+
+    def run(self):
+        """Run until stopped, or until the queue is drained in burst mode"""
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self.stop)
+            signal.signal(signal.SIGINT, self.stop)
+        if self.housekeeping:
+            housekeeping()
+        threads = [
+            threading.Thread(target=self.work, args=(f'{self.name}:{index}',), name=f'job-worker-{index}')
+            for index in range(self.threads)
+        ]
+        for thread in threads:
+            thread.start()
+        next_housekeeping = time.monotonic() + housekeeping_seconds()
+        while not self.stopping.is_set() and any(thread.is_alive() for thread in threads):
+            self.stopping.wait(poll_seconds())
+            if self.housekeeping and time.monotonic() >= next_housekeeping:
+                housekeeping()
+                next_housekeeping = time.monotonic() + housekeeping_seconds()
+        # Running jobs are finished, not abandoned
+        for thread in threads:
+            thread.join()
+
+    def work(self, worker):
+        from .queue import claim, run
+
+        try:
+            while not self.stopping.is_set():
+                # Threads outside the request cycle tidy their own connection
+                close_old_connections()
+                try:
+                    job = claim(worker)
+                except Exception:
+                    logger.exception('Could not claim a job')
+                    job = None
+                if job is not None:
+                    try:
+                        run(job)
+                    except Exception:
+                        logger.exception('Could not record the outcome of job %s', job.pk)
+                    continue
+                if self.burst:
+                    break
+                self.stopping.wait(poll_seconds())
+        finally:
+            connection.close()
+
+
+def run_process(threads, burst):
+    """Entry point of a spawned worker process"""
+    import django
+
+    django.setup()
+    # The parent recovers stale jobs for the whole pool
+    Worker(threads, burst=burst, housekeeping=False).run()
@@ -0,0 +1,191 @@
+"""
+Password login shared by the sync and async login endpoints.
+
+A login costs one user lookup by email and one password hash. The hash is
+run on a bounded thread pool (``hashlib`` releases the GIL while hashing),
+so a burst of logins cannot take every worker thread. Emails that match no
+user are remembered for a short while, so repeated attempts for them skip
+the database.
+
+Under ASGI, ``core/asgi.py`` turns on ``ASYNC_LOGIN`` and ``/api/auth/login/``
+is served by the ``login`` coroutine below. The event loop only waits on the
+pool, and the sync endpoints keep their threads.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, identify_hasher, make_password
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from companies.models import Company
+from .tokens import ClaimsRefreshToken
+
+logger = logging.getLogger('security')
+
+User = get_user_model()
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def hash_workers():
+    return getattr(settings, 'LOGIN_HASH_WORKERS', 4)
+
+
+def get_hash_executor():
+    """Thread pool for password hashing, created on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=hash_workers(), thread_name_prefix='login-hash')
+        return _executor
+
+
+def normalize_login_email(email):
+    """The spelling both the user lookup and the cached miss are keyed on"""
+    return email.strip().lower()
+
+
+def unknown_email_key(email):
+    return 'login-unknown:' + hashlib.md5(normalize_login_email(email).encode()).hexdigest()
+
+
+def forget_unknown_email(email):
+    """Drop the cached miss for an email that now belongs to a user"""
+    if email:
+        cache.delete(unknown_email_key(email))
+
+
+def find_login_user(email):
+    """
+    The user with this email, or None. Misses are cached for
+    ``LOGIN_UNKNOWN_EMAIL_CACHE_TIMEOUT`` seconds under the same normalized
+    email the lookup uses, so a differently spelled attempt can never cache
+    a miss for an existing account.
+    """
+    email = normalize_login_email(email)
+    key = unknown_email_key(email)
+    if cache.get(key):
+        return None
+    user = User.objects.filter(email__iexact=email).first()
+    if user is None:
+        cache.set(key, True, getattr(settings, 'LOGIN_UNKNOWN_EMAIL_CACHE_TIMEOUT', 60))
+    return user
+
+
+def password_matches(user, password):
+    """
+    Check ``password`` like ModelBackend does: inactive users never match,
+    and a missing user still costs one hash. Runs on the hash pool.
+    """
+    if user is None:
+        make_password(password)
+        return False
+    return user.is_active and check_password(password, user.password)
+
+
+def upgrade_password_hash(user, password):
+    """Re-hash with the current hasher, as authenticate() would"""
+    try:
+        outdated = identify_hasher(user.password).must_update(user.password)
+    except ValueError:
+        return
+    if outdated:
+        user.set_password(password)
+        user.save(update_fields=['password'])
+
+
+def check_login(email, password):
+    """
+    Authenticate synchronously. Returns the user, or None for an unknown
+    email, a wrong password or an inactive account.
+    """
+    user = find_login_user(email)
+    if not get_hash_executor().submit(password_matches, user, password).result():
+        return None
+    upgrade_password_hash(user, password)
+    return user
+
+
+def login_payload(user):
+    """Tokens and user details returned by a successful login"""
+    company = None
+    if user.role == 'company':
+        company = Company.objects.filter(user=user).values('id', 'name', 'email').first()
+        # Saves ClaimsRefreshToken a second company lookup
+        user.__dict__['company_id'] = company['id'] if company else None
+
+    refresh = ClaimsRefreshToken.for_user(user)
+    data = {
+        'access': str(refresh.access_token),
+        'refresh': str(refresh),
+        'user': {
+            'id': user.id,
+            'email': user.email,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'role': user.role,
+            'is_staff': user.is_staff,
+            'is_superuser': user.is_superuser
+        },
+        'dashboard_url': user.get_dashboard_url()
+    }
+
+    # If user is a company, add company information
+    if company:
+        data['user']['company'] = company
+    return {
+        'status': 'success',
+        'message': 'Login successful',
+        'data': data
+    }
+
+
+def _complete_login(user, password):
+    upgrade_password_hash(user, password)
+    return login_payload(user)
+
+
+@csrf_exempt
+@require_POST
+async def login(request):
+    """Async twin of UserLoginView, used when ASYNC_LOGIN is on"""
+    try:
+        credentials = json.loads(request.body) if request.content_type == 'application/json' else request.POST
+    except ValueError:
+        return JsonResponse({"detail": "Invalid JSON body."}, status=400)
+    email = credentials.get('email')
+    password = credentials.get('password')
+    requested_role = credentials.get('role')
+
+    if not email or not password:
+        return JsonResponse({"detail": "Email and password are required."}, status=400)
+
+    try:
+        user = await sync_to_async(find_login_user)(email)
+        matched = await asyncio.wrap_future(get_hash_executor().submit(password_matches, user, password))
+        if not matched:
+            logger.warning('Authentication failed for user: %s', email)
+            return JsonResponse({"detail": "Invalid credentials."}, status=401)
+
+        if requested_role and user.role != requested_role:
+            logger.warning('Role mismatch: requested=%s, actual=%s', requested_role, user.role)
+            return JsonResponse({"detail": f"Access denied. You do not have the {requested_role} role."}, status=403)
+
+        payload = await sync_to_async(_complete_login)(user, password)
+        logger.info('Successful login: %s (%s)', user.email, user.role)
+        return JsonResponse(payload)
+    except Exception:
+        logger.exception('Unexpected error during login')
+        return JsonResponse({
+            'status': 'error',
+            'message': 'An unexpected error occurred during login'
+        }, status=500)
@@ -1,5 +1,8 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
 
@@ -44,6 +47,8 @@ class User(AbstractUser):
     phone = models.CharField(max_length=15, blank=True, null=True)
     address = models.TextField(blank=True, null=True)
     profile_picture = models.ImageField(upload_to='profile_pictures/', blank=True, null=True)
+    # Embedded in issued JWTs; bumped to revoke them (see users.tokens)
+    token_version = models.PositiveIntegerField(default=0, editable=False)
 
     objects = UserManager()
 
@@ -62,6 +67,14 @@ class User(AbstractUser):
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
 
+    @cached_property
+    def company_id(self):
+        """Id of the company this user logs in for, or None."""
+        if self.role != 'company':
+            return None
+        from companies.models import Company
+        return Company.objects.filter(user=self).values_list('id', flat=True).first()
+
     def get_dashboard_url(self):
         """Return the appropriate dashboard URL based on user role."""
         if self.role == 'admin':
@@ -71,3 +84,39 @@ class User(AbstractUser):
         elif self.role == 'volunteer':
             return '/volunteer/dashboard/'
         return '/'
+
+
+# Attributes that are embedded in tokens or decide whether one is valid
+TOKEN_FIELDS = ('email', 'role', 'is_active', 'is_staff', 'is_superuser', 'password')
+
+
+@receiver(post_init, sender=User)
+def remember_token_fields(sender, instance, **kwargs):
+    """Signal to remember the token-relevant values a user had when loaded"""
+    instance._token_fields = {name: instance.__dict__[name] for name in TOKEN_FIELDS if name in instance.__dict__}
+
+
+@receiver(post_save, sender=User)
+def revoke_changed_user_tokens(sender, instance, created, **kwargs):
+    """Signal to revoke a user's tokens when their role, flags or password change"""
+    from .tokens import revoke_tokens
+
+    if not created and any(instance.__dict__.get(name) != value for name, value in instance._token_fields.items()):
+        revoke_tokens(instance.pk)
+    remember_token_fields(sender, instance)
+
+
+@receiver(post_save, sender=User)
+def forget_unknown_login_email(sender, instance, **kwargs):
+    """Signal to let a new or renamed account log in before the cached miss expires"""
+    from .login import forget_unknown_email
+
+    forget_unknown_email(instance.__dict__.get('email'))
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user_tokens(sender, instance, **kwargs):
+    """Signal to stop accepting tokens of a deleted user"""
+    from .tokens import revoke_tokens
+
+    revoke_tokens(instance.pk)
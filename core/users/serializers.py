@@ -3,6 +3,7 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth.models import User
+from .tokens import ClaimsRefreshToken
 
 User = get_user_model()
 
@@ -57,6 +58,7 @@ class UserLoginSerializer(serializers.Serializer):
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """Custom token serializer to include user data in the token response."""
+    token_class = ClaimsRefreshToken
 
     def validate(self, attrs):
         data = super().validate(attrs)
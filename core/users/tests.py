@@ -1,3 +1,48 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
+from .tokens import ClaimsRefreshToken, revoke_tokens
 
-# Create your tests here.
+
+class TokenRevocationTests(TestCase):
+    """Tokens stop working once the claims they carry are out of date"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(email='asha@example.com', password='old-pw', role='admin')
+        self.client = APIClient()
+
+    def get_profile(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+        return self.client.get('/api/auth/profile/')
+
+    def test_password_change_revokes_tokens(self):
+        token = ClaimsRefreshToken.for_user(self.user)
+        self.assertEqual(self.get_profile(token).status_code, 200)
+
+        user = get_user_model().objects.get(pk=self.user.pk)
+        user.set_password('new-pw')
+        user.save()
+        response = self.get_profile(token)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data['code'], 'token_revoked')
+        # A token issued after the change is accepted
+        self.assertEqual(self.get_profile(ClaimsRefreshToken.for_user(user)).status_code, 200)
+
+    def test_explicit_revocation_and_deactivation(self):
+        token = ClaimsRefreshToken.for_user(self.user)
+        revoke_tokens(self.user.pk)
+        self.assertEqual(self.get_profile(token).status_code, 401)
+
+        token = ClaimsRefreshToken.for_user(self.user)
+        get_user_model().objects.filter(pk=self.user.pk).update(is_active=False)
+        revoke_tokens(self.user.pk)
+        self.assertEqual(self.get_profile(token).status_code, 401)
+
+    def test_unrelated_change_keeps_tokens(self):
+        token = ClaimsRefreshToken.for_user(self.user)
+        user = get_user_model().objects.get(pk=self.user.pk)
+        user.first_name = 'Asha'
+        user.save()
+        self.assertEqual(self.get_profile(token).status_code, 200)
@@ -0,0 +1,86 @@
+"""
+JWTs that carry the user's role and company.
+
+Tokens issued by ``ClaimsRefreshToken`` embed ``role``, ``company_id`` and a
+few flags as signed claims, so ``api.authentication.ClaimsJWTAuthentication``
+can build ``request.user`` without reading the users table. Each token also
+carries the user's ``token_version``; changing a claimed attribute bumps the
+version, which revokes every token issued before the change.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import F
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# User attributes copied into the token
+USER_CLAIMS = ('email', 'role', 'is_staff', 'is_superuser')
+COMPANY_CLAIM = 'company_id'
+VERSION_CLAIM = 'ver'
+
+# Seconds a token version stays cached; changes delete the entry right away
+TOKEN_VERSION_CACHE_TIMEOUT = 3600
+
+# Cache backends private to each process. A revocation only deletes the entry
+# in the worker that handled it, so the others must re-read the version soon.
+LOCAL_CACHE_BACKENDS = ('django.core.cache.backends.locmem.LocMemCache',)
+
+
+def version_cache_timeout():
+    """TOKEN_VERSION_CACHE_TIMEOUT, or TOKEN_VERSION_LOCAL_CACHE_TIMEOUT on a per-process cache"""
+    if settings.CACHES['default']['BACKEND'] in LOCAL_CACHE_BACKENDS:
+        return getattr(settings, 'TOKEN_VERSION_LOCAL_CACHE_TIMEOUT', 5)
+    return TOKEN_VERSION_CACHE_TIMEOUT
+
+
+def version_cache_key(user_id):
+    return f'token-version:{user_id}'
+
+
+def token_version(user_id):
+    """
+    Current token version of a user, or None if the user is gone or
+    inactive. Served from the cache after the first lookup.
+    """
+    from .models import User
+
+    key = version_cache_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Always the primary: a lagging replica could bring back a revoked version
+        row = User.objects.using(DEFAULT_DB_ALIAS).filter(pk=user_id).values_list('token_version', 'is_active').first()
+        # -1 caches "no valid tokens" for deleted and disabled users
+        version = row[0] if row and row[1] else -1
+        cache.set(key, version, version_cache_timeout())
+    return None if version == -1 else version
+
+
+def revoke_tokens(user_id):
+    """Invalidate every token issued to a user so far"""
+    from .models import User
+
+    if user_id is None:
+        return
+    User.objects.filter(pk=user_id).update(token_version=F('token_version') + 1)
+    key = version_cache_key(user_id)
+    cache.delete(key)
+    # A request may cache the old version before this transaction commits
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """
+    Refresh token whose claims, and those of the access tokens derived from
+    it, describe the user well enough to authorize requests.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        token[COMPANY_CLAIM] = user.company_id
+        # Read back rather than trusting user.token_version, which a
+        # revocation earlier in this request does not update
+        token[VERSION_CLAIM] = token_version(user.pk)
+        return token
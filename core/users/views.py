@@ -2,10 +2,12 @@ from rest_framework import viewsets, permissions, status, views
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework_simplejwt.views import TokenObtainPairView
-from rest_framework_simplejwt.tokens import RefreshToken
-from django.contrib.auth import get_user_model, authenticate, login, logout
+from django.contrib.auth import get_user_model, login, logout
 from django.shortcuts import get_object_or_404
 from companies.models import Company
+from api.authentication import full_user
+from .tokens import ClaimsRefreshToken
+from .login import check_login, login_payload
 from .serializers import (
     UserSerializer,
     UserCreateSerializer,
@@ -46,7 +48,7 @@ class UserViewSet(viewsets.ModelViewSet):
     def login(self, request):
         try:
             # Log the incoming request data
-            logger.info(f"Login attempt with data: {request.data}")
+            logger.info(f"Login attempt for: {request.data.get('username')}")
             
             serializer = UserLoginSerializer(data=request.data)
             if not serializer.is_valid():
@@ -64,20 +66,9 @@ class UserViewSet(viewsets.ModelViewSet):
             # Log authentication attempt
             logger.info(f"Attempting to authenticate user: {username} with role: {requested_role}")
 
-            # Try to find the user by email
-            try:
-                user = User.objects.get(email=username)
-                logger.info(f"User found: {user.email} with role: {user.role}")
-            except User.DoesNotExist:
-                logger.warning(f"User not found: {username}")
-                return Response({
-                    'status': 'error',
-                    'message': 'Invalid email or password'
-                }, status=status.HTTP_401_UNAUTHORIZED)
+            # One lookup by email; the hash runs on the login pool
+            user = check_login(username, password)
 
-            # Authenticate user using email
-            user = authenticate(username=user.username, password=password)
-            
             if not user:
                 logger.warning(f"Authentication failed for user: {username}")
                 return Response({
@@ -104,7 +95,7 @@ class UserViewSet(viewsets.ModelViewSet):
                     }, status=status.HTTP_403_FORBIDDEN)
 
             # Generate tokens
-            refresh = RefreshToken.for_user(user)
+            refresh = ClaimsRefreshToken.for_user(user)
             
             # Get the appropriate dashboard URL based on user role
             dashboard_url = user.get_dashboard_url()
@@ -145,7 +136,7 @@ class UserViewSet(viewsets.ModelViewSet):
             return Response({
                 'status': 'success',
                 'data': {
-                    'user': UserSerializer(request.user).data,
+                    'user': UserSerializer(full_user(request.user)).data,
                     'dashboard_url': dashboard_url
                 }
             })
@@ -159,7 +150,7 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer = UserCreateSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.save()
-            refresh = RefreshToken.for_user(user)
+            refresh = ClaimsRefreshToken.for_user(user)
             dashboard_url = user.get_dashboard_url()
             return Response({
                 'status': 'success',
@@ -222,7 +213,7 @@ class UserLoginView(views.APIView):
     def post(self, request):
         try:
             # Log the incoming request data
-            logger.info(f"Login attempt with data: {request.data}")
+            logger.info(f"Login attempt for: {request.data.get('email')}")
             
             # Get credentials from request
             email = request.data.get('email')
@@ -235,90 +226,32 @@ class UserLoginView(views.APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            # Try to find and authenticate the user by email
-            try:
-                user = User.objects.get(email=email)
-                logger.info(f"User found: {user.email} with role: {user.role}")
-                
-                # Authenticate using email as username
-                authenticated_user = authenticate(request, username=email, password=password)
-                
-                if not authenticated_user:
-                    logger.warning(f"Authentication failed for user: {email}")
-                    return Response(
-                        {"detail": "Invalid credentials."},
-                        status=status.HTTP_401_UNAUTHORIZED
-                    )
+            # One lookup by email; the hash runs on the login pool
+            authenticated_user = check_login(email, password)
+
+            if not authenticated_user:
+                logger.warning(f"Authentication failed for user: {email}")
+                return Response(
+                    {"detail": "Invalid credentials."},
+                    status=status.HTTP_401_UNAUTHORIZED
+                )
 
-                # Check if user is active
-                if not authenticated_user.is_active:
-                    logger.warning(f"Login attempt for inactive user: {email}")
+            # Check role if specified
+            if requested_role:
+                logger.info(f"Checking role: requested={requested_role}, actual={authenticated_user.role}")
+                if authenticated_user.role != requested_role:
+                    logger.warning(f"Role mismatch: requested={requested_role}, actual={authenticated_user.role}")
                     return Response(
-                        {"detail": "User account is disabled."},
+                        {"detail": f"Access denied. You do not have the {requested_role} role."},
                         status=status.HTTP_403_FORBIDDEN
                     )
 
-                # Check role if specified
-                if requested_role:
-                    logger.info(f"Checking role: requested={requested_role}, actual={authenticated_user.role}")
-                    if authenticated_user.role != requested_role:
-                        logger.warning(f"Role mismatch: requested={requested_role}, actual={authenticated_user.role}")
-                        return Response(
-                            {"detail": f"Access denied. You do not have the {requested_role} role."},
-                            status=status.HTTP_403_FORBIDDEN
-                        )
-
-                # Generate tokens
-                refresh = RefreshToken.for_user(authenticated_user)
-                
-                # Get the appropriate dashboard URL based on user role
-                dashboard_url = authenticated_user.get_dashboard_url()
-                
-                # Log successful login
-                logger.info(f"Successful login: {authenticated_user.email} ({authenticated_user.role})")
-                
-                # Create response data
-                response_data = {
-                    'status': 'success',
-                    'message': 'Login successful',
-                    'data': {
-                        'access': str(refresh.access_token),
-                        'refresh': str(refresh),
-                        'user': {
-                            'id': authenticated_user.id,
-                            'email': authenticated_user.email,
-                            'first_name': authenticated_user.first_name,
-                            'last_name': authenticated_user.last_name,
-                            'role': authenticated_user.role,
-                            'is_staff': authenticated_user.is_staff,
-                            'is_superuser': authenticated_user.is_superuser
-                        },
-                        'dashboard_url': dashboard_url
-                    }
-                }
+            # Generate tokens and the user details
+            response_data = login_payload(authenticated_user)
 
-                # If user is a company, add company information
-                if authenticated_user.role == 'company':
-                    try:
-                        company = Company.objects.get(user=authenticated_user)
-                        response_data['data']['user']['company'] = {
-                            'id': company.id,
-                            'name': company.name,
-                            'email': company.email
-                        }
-                        logger.info(f"Added company data to response: {company.name} (ID: {company.id})")
-                    except Company.DoesNotExist:
-                        logger.warning(f"No company found for user: {authenticated_user.email}")
-                
-                logger.info(f"Sending response: {response_data}")
-                return Response(response_data)
-
-            except User.DoesNotExist:
-                logger.warning(f"User not found: {email}")
-                return Response(
-                    {"detail": "Invalid credentials."},
-                    status=status.HTTP_401_UNAUTHORIZED
-                )
+            # Log successful login
+            logger.info(f"Successful login: {authenticated_user.email} ({authenticated_user.role})")
+            return Response(response_data)
 
         except Exception as e:
             logger.error(f"Unexpected error during login: {str(e)}")
@@ -346,7 +279,7 @@ class UserRegistrationView(views.APIView):
             logger.info(f"User registered: {user.email} ({user.role}) by {request.user.email}")
 
             # Generate tokens for the new user
-            refresh = RefreshToken.for_user(user)
+            refresh = ClaimsRefreshToken.for_user(user)
 
             return Response({
                 'access': str(refresh.access_token),
@@ -363,12 +296,12 @@ class UserProfileView(views.APIView):
 
     def get(self, request):
         """Get the current user's profile."""
-        serializer = UserSerializer(request.user)
+        serializer = UserSerializer(full_user(request.user))
         return Response(serializer.data)
 
     def patch(self, request):
         """Update the current user's profile."""
-        serializer = UserSerializer(request.user, data=request.data, partial=True)
+        serializer = UserSerializer(full_user(request.user), data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
             return Response(serializer.data)
@@ -389,7 +322,7 @@ class CompanyProfileView(views.APIView):
             )
 
         try:
-            company = Company.objects.get(user=request.user)
+            company = Company.objects.select_related('user').get(pk=request.user.company_id)
             from companies.serializers import CompanySerializer
             serializer = CompanySerializer(company)
             return Response(serializer.data)
@@ -409,7 +342,7 @@ class CompanyProfileView(views.APIView):
             )
 
         try:
-            company = Company.objects.get(user=request.user)
+            company = Company.objects.select_related('user').get(pk=request.user.company_id)
             from companies.serializers import CompanySerializer
             serializer = CompanySerializer(company, data=request.data, partial=True)
             if serializer.is_valid():
@@ -4,6 +4,9 @@ from django.contrib import messages
 from django.utils.safestring import mark_safe
 from django import forms
 from .models import Volunteer
+import logging
+
+logger = logging.getLogger('security')
 
 
 class VolunteerAdminForm(forms.ModelForm):
@@ -132,7 +135,7 @@ class VolunteerAdmin(admin.ModelAdmin):
                 messages.success(request, credential_box)
 
                 # Log the credential generation (without the actual password)
-                print(f"SECURITY: User account created for volunteer: {obj.name} (ID: {obj.id})")
+                logger.info(f"User account created for volunteer: {obj.name} (ID: {obj.id})")
             else:
                 # Show a warning if user creation failed
                 messages.warning(
@@ -142,7 +145,7 @@ class VolunteerAdmin(admin.ModelAdmin):
                 )
 
                 # Log the failure
-                print(f"WARNING: Failed to create user account for volunteer: {obj.name} (ID: {obj.id})")
+                logger.warning(f"Failed to create user account for volunteer: {obj.name} (ID: {obj.id})")
 
     def delete_model(self, request, obj):
         """Override delete_model to handle user deletion.
@@ -156,11 +159,11 @@ class VolunteerAdmin(admin.ModelAdmin):
 
         try:
             # Log the deletion attempt
-            print(f"SECURITY: Admin initiated deletion of volunteer: {volunteer_name} (ID: {volunteer_id})")
+            logger.info(f"Admin initiated deletion of volunteer: {volunteer_name} (ID: {volunteer_id})")
 
             # Delete the associated user first
             if obj.user:
-                print(f"SECURITY: Deleting associated user: {user_email}")
+                logger.info(f"Deleting associated user: {user_email}")
                 obj.delete_user()
 
                 # Notify the admin about the user deletion
@@ -169,13 +172,13 @@ class VolunteerAdmin(admin.ModelAdmin):
                     f"The user account ({user_email}) associated with {volunteer_name} has been permanently deleted."
                 )
             else:
-                print(f"SECURITY: No user account associated with volunteer: {volunteer_name}")
+                logger.info(f"No user account associated with volunteer: {volunteer_name}")
 
             # Then delete the volunteer
             super().delete_model(request, obj)
 
             # Log the successful deletion
-            print(f"SECURITY: Volunteer {volunteer_name} (ID: {volunteer_id}) successfully deleted")
+            logger.info(f"Volunteer {volunteer_name} (ID: {volunteer_id}) successfully deleted")
 
             # Notify the admin about the successful deletion
             messages.success(
@@ -185,7 +188,7 @@ class VolunteerAdmin(admin.ModelAdmin):
 
         except Exception as e:
             # Log the error
-            print(f"ERROR: Failed to delete volunteer {volunteer_name} (ID: {volunteer_id}): {str(e)}")
+            logger.error(f"Failed to delete volunteer {volunteer_name} (ID: {volunteer_id}): {str(e)}")
 
             # Notify the admin about the error
             messages.error(
@@ -208,23 +211,23 @@ class VolunteerAdmin(admin.ModelAdmin):
 
         try:
             # Log the bulk deletion attempt
-            print(f"SECURITY: Admin initiated bulk deletion of {volunteer_count} volunteers")
+            logger.info(f"Admin initiated bulk deletion of {volunteer_count} volunteers")
 
             # Delete the associated users first
             for obj in queryset:
                 if obj.user:
                     user_email = obj.user.email
-                    print(f"SECURITY: Deleting associated user for volunteer: {obj.name} (Email: {user_email})")
+                    logger.info(f"Deleting associated user for volunteer: {obj.name} (Email: {user_email})")
                     obj.delete_user()
                     deleted_users.append(user_email)
                 else:
-                    print(f"SECURITY: No user account for volunteer: {obj.name}")
+                    logger.info(f"No user account for volunteer: {obj.name}")
 
             # Then delete the volunteers
             super().delete_queryset(request, queryset)
 
             # Log the successful deletion
-            print(f"SECURITY: Successfully deleted {volunteer_count} volunteers and {len(deleted_users)} user accounts")
+            logger.info(f"Successfully deleted {volunteer_count} volunteers and {len(deleted_users)} user accounts")
 
             # Notify the admin about the successful deletion
             if deleted_users:
@@ -244,7 +247,7 @@ class VolunteerAdmin(admin.ModelAdmin):
 
         except Exception as e:
             # Log the error
-            print(f"ERROR: Failed to delete volunteers in bulk: {str(e)}")
+            logger.error(f"Failed to delete volunteers in bulk: {str(e)}")
 
             # Notify the admin about the error
             messages.error(
@@ -1,5 +1,8 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+import logging
+
+logger = logging.getLogger('security')
 
 User = get_user_model()
 
@@ -60,12 +63,12 @@ class Volunteer(models.Model):
         and linked to this volunteer.
         """
         if not self.email:
-            print(f"Cannot create user for volunteer {self.name}: No email provided")
+            logger.warning(f"Cannot create user for volunteer {self.name}: No email provided")
             return None
 
         # Check if a user with this email already exists
         if User.objects.filter(email=self.email).exists():
-            print(f"Cannot create user for volunteer {self.name}: User with email {self.email} already exists")
+            logger.warning(f"Cannot create user for volunteer {self.name}: User with email {self.email} already exists")
             return None
 
         try:
@@ -91,14 +94,14 @@ class Volunteer(models.Model):
             self.save(update_fields=['user'])
 
             # Log the user creation
-            print(f"SECURITY: Created user account for volunteer: {self.name}")
-            print(f"SECURITY: User email: {self.email}")
-            print(f"SECURITY: User role: {user.role}")
+            logger.info(f"Created user account for volunteer: {self.name}")
+            logger.info(f"User email: {self.email}")
+            logger.info(f"User role: {user.role}")
 
             return user
 
         except Exception as e:
-            print(f"ERROR: Failed to create user for volunteer {self.name}: {str(e)}")
+            logger.error(f"Failed to create user for volunteer {self.name}: {str(e)}")
             return None
 
     def delete_user(self):
@@ -113,7 +116,7 @@ class Volunteer(models.Model):
             bool: True if the user was successfully deleted, False otherwise
         """
         if not self.user:
-            print(f"SECURITY: No user account associated with volunteer: {self.name}")
+            logger.info(f"No user account associated with volunteer: {self.name}")
             return False
 
         try:
@@ -123,8 +126,8 @@ class Volunteer(models.Model):
             user_email = user.email
 
             # Log the deletion attempt
-            print(f"SECURITY: Attempting to delete user account (ID: {user_id}, Email: {user_email}) "
-                  f"for volunteer: {self.name} (ID: {self.id})")
+            logger.info(f"Attempting to delete user account (ID: {user_id}, Email: {user_email}) "
+                        f"for volunteer: {self.name} (ID: {self.id})")
 
             # Temporarily set the user to None to avoid recursion
             self.user = None
@@ -134,17 +137,17 @@ class Volunteer(models.Model):
             user.delete()
 
             # Log the successful deletion
-            print(f"SECURITY: Successfully deleted user account (ID: {user_id}, Email: {user_email}) "
-                  f"for volunteer: {self.name} (ID: {self.id})")
+            logger.info(f"Successfully deleted user account (ID: {user_id}, Email: {user_email}) "
+                        f"for volunteer: {self.name} (ID: {self.id})")
 
             return True
 
         except Exception as e:
-            print(f"ERROR: Failed to delete user account for volunteer {self.name}: {str(e)}")
+            logger.error(f"Failed to delete user account for volunteer {self.name}: {str(e)}")
 
             # If there was an error, try to restore the relationship
             if 'user' in locals() and 'user_id' in locals() and User.objects.filter(id=user_id).exists():
-                print(f"SECURITY: Restoring user relationship after failed deletion attempt")
+                logger.info(f"Restoring user relationship after failed deletion attempt")
                 self.user = user
                 self.save(update_fields=['user'])
 